@@ -7,12 +7,9 @@ from database import get_db
 from models import User
 from services.age_based_speech_trainer import get_sentence_for_age_group, get_sentence_with_retry_if_needed
 from services.word_based_speech_trainer import get_sentence_for_word_and_age
-from services.amazon_polly import AmazonPollyService
-from services.stuttering_tts_service import StutteringTTSService
+from services.registry import get_stuttering_tts_service
 
 router = APIRouter()
-polly_service = AmazonPollyService()
-stuttering_tts_service = StutteringTTSService()  # ✅ 초기화
 sentences_cache: Dict[str, str] = {}
 stuttering_sentences_cache: Dict[str, str] = {}  # 말더듬증 전용 캐시
 
@@ -59,7 +56,8 @@ async def generate_sentence_with_word(data: WordSentenceRequest, db: Session = D
 
 ''' 말더듬증 tts 코드'''
 @router.post("/generate/word/tts", tags=["sentence"])
-async def generate_word_sentence_tts(data: WordSentenceRequest, db: Session = Depends(get_db)):
+async def generate_word_sentence_tts(data: WordSentenceRequest, db: Session = Depends(get_db),
+                                     stuttering_tts_service=Depends(get_stuttering_tts_service)):
     user = db.query(User).filter(User.user_id == data.user_id).first()
     if not user:
         return {"error": "사용자를 찾을 수 없습니다."}
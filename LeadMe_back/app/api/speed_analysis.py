@@ -1,26 +1,39 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, BackgroundTasks
+from fastapi import (
+    APIRouter, Depends, HTTPException, status, File, UploadFile, Query, WebSocket, WebSocketDisconnect, BackgroundTasks
+)
 from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 import os
-import tempfile
-import shutil
-import librosa
+import json
+import asyncio
 import uuid
+import numpy as np
 from pydub import AudioSegment
 from datetime import datetime, date
 import logging
-import subprocess
 
 # 내부 모듈 임포트
-from database import get_db
+from database import get_db, SessionLocal
 import models
-from schemas.speech import SpeedAnalysisCreate, SpeedAnalysisResponse
+from schemas.speech import SpeedAnalysisCreate, SpeedAnalysisResponse, AnalysisJobResponse, VocalFatigueAnalysisResponse
 from schemas.user import UserSettingsCreate, UserSettingsResponse
 from app.api.auth import get_current_user
-from services.openai_stt import OpenAISTTService
-from services.vocal_fatigue_service import VocalFatigueAnalysisService
+from services.registry import registry, get_stt_service
+from services.vocal_fatigue_service import FATIGUE_MIN_DURATION_SECONDS, FIT_CACHE_SIZE, FIT_CACHE_TTL_SECONDS
+from services.analysis_executor import AnalysisExecutor, ChartRenderExecutor, ExecutorQueueFullError
+from services import analysis_tasks, analysis_jobs, fatigue_history, transcript_cache
+from services.speech_features import StreamingSpmMeter
+from services.fatigue_model import OnlineHyperbolicEstimator
+from services.fatigue_chart import CHART_FORMATS, DEFAULT_CHART_FORMAT, DEFAULT_CHART_DPI, GRAPH_DIR
+from services.audio_decoder import (
+    AudioDecoderService,
+    encode_wav_bytes,
+    AudioDecodeError,
+    MIN_DURATION_SECONDS,
+    TARGET_SAMPLE_RATE
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -33,81 +46,127 @@ logger = logging.getLogger("speed_analysis")
 UPLOAD_DIR = "uploads/audio"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# openai whisper 서비스 초기화
-OpenAI_Whisper = OpenAISTTService()
-vocal_fatigue_service = VocalFatigueAnalysisService()
-
-def convert_m4a_to_wav(input_path: str, output_path: str):
-    command = [
-        "ffmpeg",
-        "-y",
-        "-i", input_path,
-        "-ac", "1",            # mono
-        "-ar", "16000",        # 16kHz
-        "-sample_fmt", "s16",  # 16-bit PCM
-        output_path,
-    ]
-    subprocess.run(command, check=True)
-
-def inspect_audio_file(path: str):
-    command = ["ffmpeg", "-v", "error", "-i", path, "-f", "null", "-"]
-    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-    if result.returncode == 0:
-        print("오디오 파일은 문제 없습니다.")
-    else:
-        print("오디오 파일에 문제가 있습니다.")
-        print(result.stderr.decode("utf-8", errors="ignore"))
+# 일괄 분석 설정
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))
+BATCH_STT_CONCURRENCY = int(os.getenv("BATCH_STT_CONCURRENCY", "4"))
+
+SPEED_AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.ogg')
+
+# Whisper STT 서비스는 services.registry에서 첫 사용 시 생성 (라우터는 Depends(get_stt_service)로 주입)
+audio_decoder = AudioDecoderService()
+analysis_executor = AnalysisExecutor()
+render_executor = ChartRenderExecutor()
+
+# 분석 워커별 피팅 캐시(services.vocal_fatigue_service.fit_cache)의 적중/미스 합계
+# 캐시는 워커 프로세스마다 있으므로 결과의 model_quality.cache_hit을 여기서 집계합니다.
+fatigue_fit_cache_counts = {"hits": 0, "misses": 0}
+
+def _stt_payload(file_bytes: bytes, filename: str, y, sr: int):
+    """STT 전송용 바이트 선택 (wav는 원본 그대로, 그 외는 디코딩된 PCM을 메모리에서 wav로 인코딩)"""
+    if filename.lower().endswith(".wav"):
+        return file_bytes, filename
+    return encode_wav_bytes(y, sr), "audio.wav"
+
+
+def classify_speed_category(spm: int, age_group: str) -> str:
+    """연령대별 기준으로 발화 속도 카테고리(느림/정상/빠름) 판단"""
+    if age_group == "5~12세":
+        if spm <= 110:
+            return "느림"
+        elif spm >= 161:
+            return "빠름"
+        return "정상"
+    elif age_group == "13~19세":
+        if spm <= 140:
+            return "느림"
+        elif spm >= 251:
+            return "빠름"
+        return "정상"
+    elif age_group == "20세 이상":
+        if spm <= 180:
+            return "느림"
+        elif spm >= 281:
+            return "빠름"
+        return "정상"
+
+    # 기본 fallback
+    logger.warning(f"알 수 없는 연령대: {age_group}, 기본 속도 분류 사용")
+    if spm < 180:
+        return "느림"
+    elif spm > 300:
+        return "빠름"
+    return "정상"
+
+
+def classify_speed_by_rates(spm: int, age_rate: Optional[models.AgeGroupSpeechRate], age_group: str) -> str:
+    """AgeGroupSpeechRate의 느림/빠름 기준으로 카테고리 판단 (기준이 없으면 기본 연령대 기준 사용)"""
+    if age_rate is None or age_rate.slow_rate is None or age_rate.fast_rate is None:
+        return classify_speed_category(spm, age_group)
+    if spm <= age_rate.slow_rate:
+        return "느림"
+    elif spm >= age_rate.fast_rate:
+        return "빠름"
+    return "정상"
+
+
+def _store_upload(user_id: str, file_bytes: bytes, original_ext: str, suffix: str = "") -> str:
+    """업로드 파일을 영구 저장하고 파일 이름을 반환"""
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    permanent_filename = f"speech_{user_id}_{timestamp}{suffix}{original_ext}"
+    with open(os.path.join(UPLOAD_DIR, permanent_filename), "wb") as permanent_file:
+        permanent_file.write(file_bytes)
+    return permanent_filename
+
+
+async def decode_upload(file_bytes: bytes, min_duration: float = MIN_DURATION_SECONDS):
+    """
+    업로드 바이트를 한 번 디코딩하면서 검증하고, 잘못된 파일은 400으로 조기 거부합니다.
+    디코딩은 디코더 서비스의 스레드 풀에서 실행되어 이벤트 루프를 막지 않습니다.
+
+    Returns:
+        (PCM 배열, 샘플링 레이트, 검증 리포트)
+    """
+    try:
+        y, sr, report = await audio_decoder.decode(file_bytes, min_duration=min_duration)
+    except AudioDecodeError as e:
+        logger.warning(f"오디오 디코딩 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="오디오 파일을 읽을 수 없습니다. 손상되었거나 지원되지 않는 파일입니다."
+        )
+
+    logger.info(f"오디오 검증 리포트: {report}")
+    if not report["is_valid"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=report["error"])
+    return y, sr, report
 
 
 @router.post("/analyze-audio-file/", status_code=status.HTTP_201_CREATED)
 async def analyze_audio_file(
         file: UploadFile = File(...),
-        background_tasks: BackgroundTasks = None,
         db: Session = Depends(get_db),
-        current_user: models.User = Depends(get_current_user)
+        current_user: models.User = Depends(get_current_user),
+        stt_service=Depends(get_stt_service)
 ):
     logger.info(f"[START] analyze_audio_file called - filename: {file.filename}, user_id: {current_user.user_id}")
     logger.info(f"[ROUTER CALLED] POST /analyze-audio-file/ - {file.filename}")
     
     # 파일 확장자 검증
-    if not file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.ogg')):
+    if not file.filename.lower().endswith(SPEED_AUDIO_EXTENSIONS):
         logger.warning(f"지원되지 않는 파일 형식: {file.filename}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="지원되지 않는 파일 형식입니다. .wav, .mp3, .m4a, .ogg 형식만 허용됩니다."
         )
 
-    try:
-        original_ext = os.path.splitext(file.filename)[1].lower()
-        is_convert_needed = original_ext != ".wav"
-        logger.info(f"파일 확장자: {original_ext}, 변환 필요: {is_convert_needed}")
-
-        # 1. 원본 임시 파일 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=original_ext) as temp_file:
-            temp_file_path = temp_file.name
-            shutil.copyfileobj(file.file, temp_file)
-        logger.info(f"임시 파일 저장 완료: {temp_file_path}")
-
-        # 2. wav 변환 필요하면 변환
-        if is_convert_needed:
-            wav_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-            wav_temp_path = wav_temp_file.name
-            wav_temp_file.close()
-
-            logger.info(f"wav 변환 시작: {temp_file_path} -> {wav_temp_path}")
-            try:
-                convert_m4a_to_wav(temp_file_path, wav_temp_path)
-                logger.info("wav 변환 완료")
-                inspect_audio_file(wav_temp_path)
-                used_audio_path = wav_temp_path
-            except Exception as e:
-                logger.error(f"wav 변환 실패: {e}")
-                raise RuntimeError("m4a 파일을 wav로 변환하는 중 오류가 발생했습니다.")
-        else:
-            used_audio_path = temp_file_path
-            logger.info("wav 변환 불필요, 원본 사용")
+    original_ext = os.path.splitext(file.filename)[1].lower()
 
+    # 1. 업로드 바이트를 메모리로 읽고 한 번의 디코딩으로 검증 (임시 파일 없음)
+    file_bytes = await file.read()
+    logger.info(f"업로드 파일 읽기 완료: {len(file_bytes)} bytes, 확장자: {original_ext}")
+    y, sr, validation = await decode_upload(file_bytes)
+
+    try:
         # 사용자 및 기준값 가져오기
         user_id = current_user.user_id
         logger.info(f"사용자 ID: {user_id}, 연령대: {current_user.age_group}")
@@ -117,29 +176,27 @@ async def analyze_audio_file(
         ).first()
         logger.info(f"연령대 속도 기준 조회 완료: {db_age_group_speed}")
 
-        # 음성 로드 및 분석
-        logger.info(f"librosa 음성 로드 시작: {used_audio_path}")
-        y, sr = librosa.load(used_audio_path, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
-        logger.info(f"음성 로드 완료 - duration: {duration:.2f}초, sr: {sr}")
-
-        frames = librosa.effects.split(y, top_db=20)
-        voiced_duration = sum(f[1] - f[0] for f in frames) / sr
-        voiced_percentage = voiced_duration / duration * 100
+        # 음성 분석 (분석 프로세스 풀에서 실행)
+        features = await analysis_executor.run(analysis_tasks.analyze_speech_rate, y, sr)
+        duration = features["duration"]
+        voiced_duration = features["voiced_duration"]
+        voiced_percentage = features["voiced_percentage"]
         logger.info(f"음성 프레임 분석 완료 - voiced_duration: {voiced_duration:.2f}초, voiced_percentage: {voiced_percentage:.1f}%")
 
         # STT 호출
         logger.info("OpenAI Whisper STT 호출 시작")
-        stt_result = OpenAI_Whisper.speech_to_text(used_audio_path)
+        stt_audio, stt_filename = _stt_payload(file_bytes, file.filename, y, sr)
+        stt_result = await stt_service.aspeech_to_text_bytes(stt_audio, stt_filename, pcm=y)
         logger.info(f"STT 결과: {stt_result}")
 
         if stt_result["status"] == "success":
             text = stt_result["text"]
-            syllables_count = OpenAI_Whisper.count_korean_syllables(text)
+            syllables_count = stt_service.count_korean_syllables(text)
             logger.info(f"STT 성공 - 텍스트: '{text}', 음절 수: {syllables_count}")
         else:
-            syllables_count = int(voiced_duration * 4.5)
-            logger.warning(f"STT 실패 - 추정 음절 수: {syllables_count}")
+            # STT 실패 시 음절 핵 검출기로 센 음절 수 사용
+            syllables_count = features["syllables_estimate"]
+            logger.warning(f"STT 실패 - 음절 핵 기반 음절 수: {syllables_count}")
 
         spm = int(syllables_count / duration * 60)
         logger.info(f"SPM 계산 완료: {spm}")
@@ -148,36 +205,7 @@ async def analyze_audio_file(
         age_group = current_user.age_group
         logger.info(f"사용자 연령대: {age_group}")
 
-        if age_group == "5~12세":
-            if spm <= 110:
-                speed_category = "느림"
-            elif spm >= 161:
-                speed_category = "빠름"
-            else:
-                speed_category = "정상"
-        elif age_group == "13~19세":
-            if spm <= 140:
-                speed_category = "느림"
-            elif spm >= 251:
-                speed_category = "빠름"
-            else:
-                speed_category = "정상"
-        elif age_group == "20세 이상상":
-            if spm <= 180:
-                speed_category = "느림"
-            elif spm >= 281:
-                speed_category = "빠름"
-            else:
-                speed_category = "정상"
-        else:
-            # 기본 fallback (정상으로 설정)
-            logger.warning(f"알 수 없는 연령대: {age_group}, 기본 속도 분류 사용")
-            if spm < 180:
-                speed_category = "느림"
-            elif spm > 300:
-                speed_category = "빠름"
-            else:
-                speed_category = "정상"
+        speed_category = classify_speed_category(spm, age_group)
 
         logger.info(f"속도 카테고리 결정: {speed_category}")
 
@@ -203,7 +231,8 @@ async def analyze_audio_file(
             "spm": spm,
             "speed_category": speed_category,
             "db_analysis_id": db_analysis.analysis_id,
-            "user_id": user_id
+            "user_id": user_id,
+            "validation": validation
         }
 
         if stt_result["status"] == "success":
@@ -211,25 +240,10 @@ async def analyze_audio_file(
             analysis_result["stt_confidence"] = stt_result.get("confidence", 0)
 
         # 업로드 파일 영구 저장
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        permanent_filename = f"speech_{user_id}_{timestamp}{original_ext}"
+        permanent_filename = _store_upload(user_id, file_bytes, original_ext)
         permanent_path = os.path.join(UPLOAD_DIR, permanent_filename)
-
-        shutil.copy2(temp_file_path, permanent_path)
         logger.info(f"영구 저장 완료: {permanent_path}")
 
-        # 임시파일 삭제 예약
-        if background_tasks:
-            background_tasks.add_task(os.remove, temp_file_path)
-            if is_convert_needed:
-                background_tasks.add_task(os.remove, wav_temp_path)
-            logger.info("임시 파일 삭제 작업 백그라운드 예약 완료")
-        else:
-            os.remove(temp_file_path)
-            if is_convert_needed:
-                os.remove(wav_temp_path)
-            logger.info("임시 파일 즉시 삭제 완료")
-
         analysis_result["file_path"] = permanent_path
         analysis_result["file_url"] = f"/uploads/audio/{permanent_filename}"
 
@@ -239,12 +253,6 @@ async def analyze_audio_file(
 
     except Exception as e:
         logger.error(f"[ERROR] 음성 분석 중 예외 발생: {str(e)}", exc_info=True)
-        # 임시파일 존재하면 삭제
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'wav_temp_path' in locals() and os.path.exists(wav_temp_path):
-            os.remove(wav_temp_path)
-
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"음성 분석 중 오류가 발생했습니다: {str(e)}"
@@ -253,8 +261,8 @@ async def analyze_audio_file(
 
 @router.post("/analyze-audio/", status_code=status.HTTP_201_CREATED)
 async def analyze_uploaded_audio(
-        file: UploadFile = File(...)
-
+        file: UploadFile = File(...),
+        stt_service=Depends(get_stt_service)
 ):
     """
     업로드된 음성 파일을 분석하여 SPM 반환합니다. (로그인 불필요)
@@ -266,65 +274,46 @@ async def analyze_uploaded_audio(
         SPM 분석 결과
     """
     # 파일 확장자 검증
-    if not file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.ogg')):
+    if not file.filename.lower().endswith(SPEED_AUDIO_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="지원되지 않는 파일 형식입니다. .wav, .mp3, .m4a, .ogg 형식만 허용됩니다."
         )
 
-    temp_file_path = None
-    wav_temp_path = None
+    # 1. 업로드 바이트를 메모리에서 바로 디코딩 및 검증
+    file_bytes = await file.read()
+    y, sr, validation = await decode_upload(file_bytes)
 
     try:
-        original_ext = os.path.splitext(file.filename)[1].lower()
-        is_convert_needed = original_ext != ".wav"
-
-        # 1. 원본 임시 파일 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=original_ext) as temp_file:
-            temp_file_path = temp_file.name
-            shutil.copyfileobj(file.file, temp_file)
-
-        # 2. wav 변환 필요하면 변환
-        if is_convert_needed:
-            wav_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-            wav_temp_path = wav_temp_file.name
-            wav_temp_file.close()
-
-            convert_m4a_to_wav(temp_file_path, wav_temp_path)
-            used_audio_path = wav_temp_path
-        else:
-            used_audio_path = temp_file_path
-
-        # 3. 음성 로드 및 분석
-        y, sr = librosa.load(used_audio_path, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
+        # 음성 활성화 검출 (분석 프로세스 풀에서 실행)
+        features = await analysis_executor.run(analysis_tasks.analyze_speech_rate, y, sr)
+        duration = features["duration"]
+        voiced_duration = features["voiced_duration"]
+        voiced_percentage = features["voiced_percentage"]
 
-        # 음성 활성화 검출
-        frames = librosa.effects.split(y, top_db=20)
-        voiced_duration = sum(f[1] - f[0] for f in frames) / sr
-        voiced_percentage = voiced_duration / duration * 100
-
-        # 4. STT 호출하여 음절 수 계산
-        stt_result = OpenAI_Whisper.speech_to_text(used_audio_path)
+        # 2. STT 호출하여 음절 수 계산
+        stt_audio, stt_filename = _stt_payload(file_bytes, file.filename, y, sr)
+        stt_result = await stt_service.aspeech_to_text_bytes(stt_audio, stt_filename, pcm=y)
 
         if stt_result["status"] == "success":
             text = stt_result["text"]
-            syllables_count = OpenAI_Whisper.count_korean_syllables(text)
+            syllables_count = stt_service.count_korean_syllables(text)
         else:
-            # STT 실패 시 추정치 사용 (한국어 평균 발화 속도로 추정)
-            syllables_count = int(voiced_duration * 4.5)
+            # STT 실패 시 음절 핵 검출기로 센 음절 수 사용
+            syllables_count = features["syllables_estimate"]
 
-        # 5. SPM 계산
+        # 3. SPM 계산
         spm = int(syllables_count / duration * 60) if duration > 0 else 0
 
-        # 6. 결과 반환 (SPM과 기본 정보만)
+        # 4. 결과 반환 (SPM과 기본 정보만)
         analysis_result = {
             "status": "success",
             "duration": round(duration, 2),
             "voiced_duration": round(voiced_duration, 2),
             "voiced_percentage": round(voiced_percentage, 1),
             "syllables_estimate": syllables_count,
-            "spm": spm
+            "spm": spm,
+            "validation": validation
         }
 
         # STT 결과 추가 (성공한 경우)
@@ -340,32 +329,371 @@ async def analyze_uploaded_audio(
             detail=f"음성 분석 중 오류가 발생했습니다: {str(e)}"
         )
 
+
+async def _analyze_batch_item(index: int, filename: str, file_bytes: bytes,
+                              stt_semaphore: asyncio.Semaphore, stt_service) -> dict:
+    """
+    일괄 분석의 파일 한 개 처리 (디코딩 → 분석 프로세스 풀 → STT)
+    실패해도 예외 대신 오류 결과를 반환하여 다른 파일 처리에 영향을 주지 않습니다.
+    """
+    item = {"index": index, "filename": filename}
+
+    if not filename.lower().endswith(SPEED_AUDIO_EXTENSIONS):
+        return {**item, "status": "error", "error": "지원되지 않는 파일 형식입니다."}
+
+    try:
+        y, sr, validation = await audio_decoder.decode(file_bytes)
+    except AudioDecodeError:
+        return {**item, "status": "error", "error": "오디오 파일을 읽을 수 없습니다. 손상되었거나 지원되지 않는 파일입니다."}
+    if not validation["is_valid"]:
+        return {**item, "status": "error", "error": validation["error"], "validation": validation}
+
+    features = await analysis_executor.run(analysis_tasks.analyze_speech_rate, y, sr)
+
+    # STT는 외부 API 호출이므로 배치 안에서도 동시 요청 수를 제한 (전체 제한은 STT 클라이언트가 담당)
+    stt_audio, stt_filename = _stt_payload(file_bytes, filename, y, sr)
+    async with stt_semaphore:
+        stt_result = await stt_service.aspeech_to_text_bytes(stt_audio, stt_filename, pcm=y)
+
+    if stt_result["status"] == "success":
+        syllables_count = stt_service.count_korean_syllables(stt_result["text"])
+    else:
+        syllables_count = features["syllables_estimate"]
+
+    duration = features["duration"]
+    result = {
+        **item,
+        "status": "success",
+        "duration": round(duration, 2),
+        "voiced_duration": round(features["voiced_duration"], 2),
+        "voiced_percentage": round(features["voiced_percentage"], 1),
+        "syllables_estimate": syllables_count,
+        "spm": int(syllables_count / duration * 60) if duration > 0 else 0,
+        "validation": validation
+    }
+    if stt_result["status"] == "success":
+        result["stt_text"] = stt_result["text"]
+        result["stt_confidence"] = stt_result.get("confidence", 0)
+    return result
+
+
+@router.post("/analyze-audio-files/batch/")
+async def analyze_audio_files_batch(
+        files: List[UploadFile] = File(...),
+        current_user: models.User = Depends(get_current_user),
+        stt_service=Depends(get_stt_service)
+):
+    """
+    여러 음성 파일 일괄 분석 API
+    파일들은 동시에 디코딩/분석되며 STT 호출 수는 BATCH_STT_CONCURRENCY로 제한됩니다.
+    결과는 완료되는 순서대로 NDJSON(한 줄에 JSON 하나)으로 스트리밍되고,
+    SpeedAnalysis 행은 하나의 트랜잭션으로 저장되어 마지막 요약 줄에서 커밋 여부와 analysis_id 목록을 알려줍니다.
+    """
+    logger.info(f"[START] analyze_audio_files_batch called - files: {len(files)}, user_id: {current_user.user_id}")
+
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {BATCH_MAX_FILES}개 파일까지 분석할 수 있습니다."
+        )
+
+    # 스트리밍 중 업로드 파일이 닫히지 않도록 먼저 모두 읽어둠
+    uploads = [(file.filename, await file.read()) for file in files]
+    user_id = current_user.user_id
+    age_group = current_user.age_group
+
+    async def stream_results():
+        stt_semaphore = asyncio.Semaphore(BATCH_STT_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(_analyze_batch_item(index, filename, file_bytes, stt_semaphore, stt_service))
+            for index, (filename, file_bytes) in enumerate(uploads)
+        ]
+
+        # 스트리밍 응답은 요청 세션과 수명이 다르므로 자체 세션 사용
+        db = SessionLocal()
+        saved_files = []
+        analysis_ids = []
+        succeeded = failed = 0
+        committed = False
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    logger.error(f"[ERROR] 일괄 분석 항목 처리 중 예외 발생: {e}", exc_info=True)
+                    result = {"status": "error", "error": str(e)}
+
+                if result["status"] == "success":
+                    result["speed_category"] = classify_speed_category(result["spm"], age_group)
+
+                    filename, file_bytes = uploads[result["index"]]
+                    original_ext = os.path.splitext(filename)[1].lower()
+                    permanent_filename = _store_upload(user_id, file_bytes, original_ext, f"_{result['index']}")
+                    saved_files.append(os.path.join(UPLOAD_DIR, permanent_filename))
+                    result["file_url"] = f"/uploads/audio/{permanent_filename}"
+
+                    # 커밋은 마지막에 한 번만 하고, flush로 analysis_id만 먼저 발급
+                    db_analysis = models.SpeedAnalysis(
+                        user_id=user_id,
+                        spm=result["spm"],
+                        speed_category=result["speed_category"],
+                        analysis_date=datetime.utcnow().date()
+                    )
+                    db.add(db_analysis)
+                    db.flush()
+                    result["db_analysis_id"] = db_analysis.analysis_id
+                    analysis_ids.append(db_analysis.analysis_id)
+                    succeeded += 1
+                else:
+                    failed += 1
+
+                yield json.dumps({"type": "result", **result}, ensure_ascii=False) + "\n"
+
+            db.commit()
+            committed = True
+        except Exception as e:
+            logger.error(f"[ERROR] 일괄 분석 저장 실패, 롤백: {e}", exc_info=True)
+        finally:
+            # 저장 실패 또는 클라이언트 연결 종료 시 남은 작업 취소, 트랜잭션 롤백, 저장한 파일 삭제
+            if not committed:
+                for task in tasks:
+                    task.cancel()
+                db.rollback()
+                for path in saved_files:
+                    if os.path.exists(path):
+                        os.remove(path)
+            db.close()
+
+        logger.info(f"[END] analyze_audio_files_batch - 성공: {succeeded}, 실패: {failed}, 커밋: {committed}")
+        yield json.dumps({
+            "type": "summary",
+            "status": "success" if committed else "error",
+            "committed": committed,
+            "total": len(uploads),
+            "succeeded": succeeded,
+            "failed": failed,
+            "analysis_ids": analysis_ids if committed else []
+        }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.websocket("/ws/spm-meter")
+async def spm_meter_websocket(
+        websocket: WebSocket,
+        token: str = Query(..., description="로그인 액세스 토큰"),
+        window_seconds: float = Query(10.0, ge=1.0, le=60.0, description="SPM 계산에 사용하는 최근 구간 길이 (초)"),
+        fatigue_segment_seconds: float = Query(30.0, ge=5.0, le=300.0, description="피로 모델 갱신 구간 길이 (초)")
+):
+    """
+    실시간 발화 속도 측정 WebSocket
+    클라이언트는 16kHz 모노 16bit PCM(little endian) 바이너리 청크를 전송하고,
+    서버는 음성 1초마다 최근 구간의 SPM, 음성 비율, 연령대 속도 카테고리를 전송합니다.
+    fatigue_segment_seconds마다 구간 SPM으로 하이퍼볼릭 피로 모델을 온라인 갱신하여
+    "fatigue" 필드(모델 파라미터, 예측 감소율, 조기 경고)를 함께 전송합니다.
+    {"type": "stop"} 텍스트 메시지를 보내면 최종 결과를 전송하고 연결을 종료합니다.
+    """
+    # 인증 및 연령대 기준 조회 (소켓마다 DB 연결을 점유하지 않도록 조회 후 바로 닫음)
+    db = SessionLocal()
+    try:
+        current_user = await get_current_user(token=token, db=db)
+        age_group = current_user.age_group
+        age_rate = db.query(models.AgeGroupSpeechRate).filter(
+            models.AgeGroupSpeechRate.age_group == age_group
+        ).first()
+        if age_rate is not None:
+            db.expunge(age_rate)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        db.close()
+
+    await websocket.accept()
+    logger.info(f"[START] spm_meter_websocket 연결 - user_id: {current_user.user_id}")
+
+    meter = StreamingSpmMeter(sr=TARGET_SAMPLE_RATE, window_seconds=window_seconds,
+                              segment_seconds=fatigue_segment_seconds)
+    fatigue_estimator = OnlineHyperbolicEstimator()
+    fatigue_state = None
+    segments_seen = 0
+    leftover = b""
+
+    def build_message(message_type: str) -> dict:
+        nonlocal fatigue_state, segments_seen
+        # 새로 완성된 구간 SPM으로 피로 모델 갱신 (직전 해에서 이어서 최적화)
+        for segment in meter.completed_segments[segments_seen:]:
+            fatigue_state = {**fatigue_estimator.update(segment["start_minutes"], segment["spm"]),
+                             "segment_num": segment["segment_num"], "segment_spm": segment["spm"]}
+        segments_seen = len(meter.completed_segments)
+
+        snapshot = meter.snapshot()
+        has_voice = snapshot["voiced_ratio"] > 0
+        return {
+            "type": message_type,
+            **snapshot,
+            "speed_category": classify_speed_by_rates(snapshot["spm"], age_rate, age_group) if has_voice else None,
+            "fatigue": fatigue_state
+        }
+
+    await websocket.send_json({
+        "type": "ready",
+        "sample_rate": TARGET_SAMPLE_RATE,
+        "format": "s16le",
+        "age_group": age_group
+    })
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                # 16bit 샘플 경계에 맞지 않는 마지막 바이트는 다음 청크와 합쳐서 처리
+                data = leftover + message["bytes"]
+                usable = len(data) - len(data) % 2
+                leftover = data[usable:]
+                samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+                # 필터링/프레임 분석은 스레드에서 실행하여 많은 소켓이 동시에 전송해도 이벤트 루프를 막지 않음
+                # (소켓마다 이전 청크 처리가 끝난 뒤 다음 청크를 받으므로 측정기 상태는 순서대로 갱신됨)
+                if await asyncio.to_thread(meter.feed, samples) > 0:
+                    await websocket.send_json(build_message("update"))
+
+            elif message.get("text") is not None:
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    command = {}
+                if command.get("type") == "stop":
+                    await websocket.send_json(build_message("final"))
+                    await websocket.close()
+                    break
+
+    except WebSocketDisconnect:
+        pass
     finally:
-        # 임시 파일 정리
+        logger.info(f"[END] spm_meter_websocket 종료 - user_id: {current_user.user_id}, "
+                    f"경과: {meter.elapsed_seconds:.1f}초, 음절: {meter.total_syllables}")
+
+
+def _fatigue_graph_target(user_id: str, graph_id: str, fmt: str):
+    """
+    피로도 그래프의 저장 경로와 URL
+    기록마다 자신의 그래프를 보여 주도록 분석 기록 ID(또는 작업 ID)를 파일 이름에 포함합니다.
+    """
+    os.makedirs(GRAPH_DIR, exist_ok=True)
+    graph_filename = f"vocal_fatigue_analysis_{user_id}_{graph_id}.{fmt}"
+    return os.path.join(GRAPH_DIR, graph_filename), f"/static/graphs/{graph_filename}"
+
+
+async def _render_fatigue_graph(chart_data: dict, graph_path: str, fmt: str, dpi: int,
+                                analysis_id: Optional[int] = None) -> bool:
+    """
+    렌더링 전용 프로세스 풀에서 그래프를 파일로 렌더링 (실패는 로그만 남김)
+    analysis_id를 주면 결과(ready/failed)를 분석 기록에 반영하며, 실패 시 기록의 graph_url을 비웁니다.
+    """
+    rendered = False
+    try:
+        await render_executor.run(analysis_tasks.render_fatigue_chart, chart_data, graph_path, fmt, dpi)
+        logger.info(f"그래프 이미지 저장 완료: {graph_path}")
+        rendered = True
+    except ExecutorQueueFullError as e:
+        logger.warning(f"[WARN] 그래프 렌더링 생략: {graph_path}, {e}")
+    except asyncio.TimeoutError:
+        logger.error(f"[ERROR] 그래프 렌더링 시간 초과: {graph_path} ({render_executor.timeout_seconds}초)")
+    except Exception as e:
+        logger.error(f"[ERROR] 그래프 렌더링 실패: {graph_path}, 오류: {e}", exc_info=True)
+
+    if analysis_id is not None:
         try:
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-                logger.info("원본 임시 파일 삭제 완료")
-            if wav_temp_path and os.path.exists(wav_temp_path):
-                os.remove(wav_temp_path)
-                logger.info("변환된 임시 파일 삭제 완료")
-        except Exception as cleanup_error:
-            logger.warning(f"임시 파일 정리 중 오류: {cleanup_error}")
+            await asyncio.to_thread(fatigue_history.finish_graph_render, analysis_id, rendered)
+        except Exception as e:
+            logger.error(f"[ERROR] 그래프 렌더링 상태 저장 실패 (analysis_id: {analysis_id}): {e}")
+    return rendered
+
+
+async def _run_fatigue_analysis(y, sr: int, options: dict) -> dict:
+    """프로세스 풀에서 피로도 분석을 실행하고 피팅 캐시 적중 여부를 집계"""
+    analysis_result = await analysis_executor.run(analysis_tasks.analyze_vocal_fatigue, y, sr, **options)
+    cache_hit = (analysis_result.get("model_quality") or {}).get("cache_hit")
+    if cache_hit is not None:
+        fatigue_fit_cache_counts["hits" if cache_hit else "misses"] += 1
+    return analysis_result
+
+
+def _save_fatigue_history(db: Session, user_id: str, analysis_result: dict, filename: str,
+                          graph_url: Optional[str], job_id: Optional[str] = None,
+                          graph_status: Optional[str] = None) -> Optional[int]:
+    """피로도 분석 기록 저장 (실패해도 분석 응답은 반환하도록 None 반환)"""
+    try:
+        record = fatigue_history.save_fatigue_analysis(
+            db, user_id, analysis_result, filename=filename, graph_url=graph_url, job_id=job_id,
+            graph_status=graph_status
+        )
+        logger.info(f"피로도 분석 기록 저장 완료 (analysis_id: {record.analysis_id})")
+        return record.analysis_id
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[ERROR] 피로도 분석 기록 저장 실패: {e}", exc_info=True)
+        return None
+
+
+def _build_fatigue_response(filename: str, analysis_result: dict, validation: dict,
+                            graph_path: Optional[str], graph_url: Optional[str], graph_status: str) -> dict:
+    """
+    피로도 분석 API 응답 구성
+    graph_status: rendering(응답 후 렌더링 중), ready, failed, disabled(render_graph=false), unavailable(유효 구간 없음)
+    """
+    result = {
+        "status": "success",
+        "filename": filename,
+        "spm_analysis": analysis_result.get("spm_analysis"),
+        "audio_info": analysis_result.get("audio_info"),
+        "validation": validation,
+        "graph_path": graph_path,
+        "graph_url": graph_url,
+        "graph_available": analysis_result.get("graph_available", False),
+        "graph_status": graph_status,
+        "chart_data": analysis_result.get("chart_data")
+    }
+
+    if "parameters" in analysis_result:
+        result["model_parameters"] = analysis_result["parameters"]
+    if "model_quality" in analysis_result:
+        result["model_quality"] = analysis_result["model_quality"]
+    if "parameter_intervals" in analysis_result:
+        result["parameter_intervals"] = analysis_result["parameter_intervals"]
+    if "model_selection" in analysis_result:
+        result["model_selection"] = analysis_result["model_selection"]
+    return result
 
 
 @router.post("/analyze-vocal-fatigue/", status_code=status.HTTP_201_CREATED)
 async def analyze_vocal_fatigue(
         file: UploadFile = File(...),
+        async_mode: bool = Query(False, description="true면 작업 ID를 즉시 반환하고 백그라운드에서 분석"),
+        segment_count: int = Query(12, ge=3, le=120, description="분할 구간 수 (기본 12구간)"),
+        segment_stt: bool = Query(False, description="true면 구간별 음절 수를 STT로 계산 (기본: 음절 핵 검출기)"),
+        confidence_intervals: bool = Query(False, description="true면 잔차 부트스트랩으로 모델 파라미터 신뢰구간 계산"),
+        bootstrap_resamples: int = Query(1000, ge=100, le=5000, description="부트스트랩 반복 수"),
+        render_graph: bool = Query(True, description="false면 서버 그래프 렌더링을 생략 (chart_data로 직접 그리기)"),
+        graph_format: str = Query(DEFAULT_CHART_FORMAT, regex="^(png|webp|svg)$", description="그래프 이미지 형식"),
+        graph_dpi: int = Query(DEFAULT_CHART_DPI, ge=50, le=300, description="그래프 해상도(dpi)"),
+        background_tasks: BackgroundTasks = None,
+        db: Session = Depends(get_db),
         current_user: models.User = Depends(get_current_user)
 ):
     """
-    음성 피로도 분석 API (12구간 하이퍼볼릭 모델)
+    음성 피로도 분석 API (구간별 하이퍼볼릭 모델, 기본 12구간)
     최소 1분 이상의 음성 파일이 필요합니다.
-    그래프 이미지 파일을 생성하고 파일 경로를 반환합니다.
+    응답에는 그래프 데이터 계열(chart_data)이 포함되며, 그래프 이미지는 응답을 보낸 뒤 백그라운드에서
+    graph_url 경로에 렌더링됩니다 (graph_status: rendering).
+    async_mode=true 이면 작업 ID를 바로 반환하며, 결과는 GET /api/speed/jobs/{job_id} 로 조회합니다.
     """
     logger.info(f"[START] analyze_vocal_fatigue called - filename: {file.filename}, user_id: {current_user.user_id}")
 
-    file_ext = os.path.splitext(file.filename)[-1].lower()
     if not file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.ogg', "mp4")):
         logger.warning(f"지원되지 않는 파일 형식: {file.filename}")
         raise HTTPException(
@@ -373,7 +701,7 @@ async def analyze_vocal_fatigue(
             detail="지원되지 않는 파일 형식입니다. .wav, .mp3, .m4a, .ogg, .mp4 형식만 허용됩니다."
         )
 
-    # 1. 파일 내용을 한 번만 읽고 변수에 저장
+    # 1. 파일 내용을 한 번만 읽고, 한 번의 디코딩으로 PCM과 검증 리포트 생성
     file_bytes = await file.read()
 
     if len(file_bytes) == 0:
@@ -383,42 +711,39 @@ async def analyze_vocal_fatigue(
             detail="업로드된 오디오 파일이 비어 있습니다."
         )
 
-    # 2. 임시 파일로 저장
-    temp_input_path = f"temp_input_{uuid.uuid4()}{file_ext}"
-    with open(temp_input_path, "wb") as f:
-        f.write(file_bytes)
-
-    # 3. 확장자에 따라 처리
-    if file_ext in (".mp4", ".m4a"):
-        converted_wav_path = f"temp_converted_{uuid.uuid4()}.wav"
-        try:
-            convert_m4a_to_wav(temp_input_path, converted_wav_path)
-            inspect_audio_file(converted_wav_path)
-
-            with open(converted_wav_path, "rb") as f:
-                audio_data = f.read()
-
-            os.remove(temp_input_path)
-            os.remove(converted_wav_path)
+    fatigue_options = {
+        "segment_count": segment_count,
+        "use_stt": segment_stt,
+        "bootstrap_resamples": bootstrap_resamples if confidence_intervals else 0
+    }
+    render_options = {"enabled": render_graph, "format": graph_format, "dpi": graph_dpi}
+
+    # 작업 모드: 입력을 보관하고 작업 ID를 즉시 반환
+    if async_mode:
+        job = analysis_jobs.create_job(
+            db, current_user.user_id, analysis_jobs.JOB_TYPE_VOCAL_FATIGUE, file.filename, file_bytes,
+            options={**fatigue_options, "render": render_options}
+        )
+        start_fatigue_job(job.job_id)
+        logger.info(f"[QUEUED] analyze_vocal_fatigue 작업 등록 - job_id: {job.job_id}")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "status": job.status,
+                "job_id": job.job_id,
+                "status_url": f"/api/speed/jobs/{job.job_id}"
+            }
+        )
 
-        except Exception as e:
-            logger.error(f"변환 실패: {str(e)}")
-            raise HTTPException(status_code=500, detail="파일 변환 중 오류가 발생했습니다.")
-    else:
-        audio_data = file_bytes
-        os.remove(temp_input_path)
+    y, sr, validation = await decode_upload(file_bytes, min_duration=FATIGUE_MIN_DURATION_SECONDS)
 
     try:
         user_id = current_user.user_id
 
-        logger.info(f"음성 파일 크기: {len(audio_data)} bytes")
+        logger.info(f"음성 길이: {validation['duration']}초, 샘플링 레이트: {sr}")
         logger.info("음성 피로도 분석 시작")
 
-        analysis_result = vocal_fatigue_service.analyze_audio_file_12segments(
-            audio_data=audio_data,
-            user_id=None,
-            save_to_db=False
-        )
+        analysis_result = await _run_fatigue_analysis(y, sr, fatigue_options)
 
         if analysis_result["status"] != "success":
             raise HTTPException(
@@ -426,52 +751,31 @@ async def analyze_vocal_fatigue(
                 detail=analysis_result.get("error", "분석 중 오류가 발생했습니다.")
             )
 
-        # 그래프 이미지 저장 처리
-        if analysis_result.get("graph_available"):
-            graph_dir = "static/graphs"
-            os.makedirs(graph_dir, exist_ok=True)
-
-            import glob
-            existing_files = glob.glob(os.path.join(graph_dir, f"vocal_fatigue_analysis_{user_id}_*.png"))
-            for old_file in existing_files:
-                try:
-                    os.remove(old_file)
-                    logger.info(f"기존 그래프 파일 삭제: {old_file}")
-                except Exception as e:
-                    logger.warning(f"기존 파일 삭제 실패: {old_file}, 오류: {e}")
-
-            graph_filename = f"vocal_fatigue_analysis_{user_id}.png"
-            graph_path = os.path.join(graph_dir, graph_filename)
-
-            import base64
-            if analysis_result.get("graph_image"):
-                image_data = base64.b64decode(analysis_result["graph_image"])
-                with open(graph_path, "wb") as f:
-                    f.write(image_data)
-                graph_url = f"/static/graphs/{graph_filename}"
-                logger.info(f"그래프 이미지 저장 완료: {graph_path}")
-            else:
-                graph_path = None
-                graph_url = None
-        else:
-            graph_path = None
-            graph_url = None
+        # 기록을 먼저 저장하여 그래프 파일 이름에 분석 기록 ID 사용 (저장 실패 시 임의 ID)
+        analysis_id = _save_fatigue_history(db, user_id, analysis_result, file.filename, None)
+
+        # 그래프 이미지는 응답을 보낸 뒤 백그라운드에서 렌더링
+        graph_path, graph_url = None, None
+        graph_status = "unavailable" if render_graph else "disabled"
+        if render_graph and analysis_result.get("graph_available"):
+            graph_path, graph_url = _fatigue_graph_target(user_id, analysis_id or uuid.uuid4().hex, graph_format)
+            background_tasks.add_task(
+                _render_fatigue_graph, analysis_result["chart_data"], graph_path, graph_format, graph_dpi,
+                analysis_id
+            )
+            graph_status = "rendering"
+        # 렌더링이 끝나면 _render_fatigue_graph가 기록의 상태를 ready/failed로 갱신
+        if analysis_id is not None:
+            try:
+                fatigue_history.set_graph(db, analysis_id, graph_url, graph_status)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"[ERROR] 그래프 정보 저장 실패 (analysis_id: {analysis_id}): {e}")
 
         # 최종 결과 반환
-        result = {
-            "status": "success",
-            "filename": file.filename,
-            "spm_analysis": analysis_result.get("spm_analysis"),
-            "audio_info": analysis_result.get("audio_info"),
-            "graph_path": graph_path,
-            "graph_url": graph_url,
-            "graph_available": analysis_result.get("graph_available", False)
-        }
-
-        if "parameters" in analysis_result:
-            result["model_parameters"] = analysis_result["parameters"]
-        if "model_quality" in analysis_result:
-            result["model_quality"] = analysis_result["model_quality"]
+        result = _build_fatigue_response(file.filename, analysis_result, validation, graph_path, graph_url,
+                                         graph_status)
+        result["db_analysis_id"] = analysis_id
 
         logger.info("[END] analyze_vocal_fatigue 성공적으로 종료")
         return JSONResponse(status_code=201, content=result)
@@ -486,6 +790,212 @@ async def analyze_vocal_fatigue(
         )
 
 
+@router.post("/fatigue-timeline/")
+async def analyze_fatigue_timeline(
+        file: UploadFile = File(...),
+        window_seconds: float = Query(30.0, gt=0, le=600, description="SPM 계산 창 길이 (초)"),
+        step_seconds: float = Query(5.0, gt=0, le=600, description="창 이동 간격 (초)"),
+        current_user: models.User = Depends(get_current_user)
+):
+    """
+    음성 피로도 타임라인 API
+    window_seconds 길이의 창을 step_seconds 간격으로 이동하며 SPM을 계산합니다.
+    음절 수는 음절 핵 검출기로 계산하며(STT 미사용), 12구간 분석보다 촘촘한 곡선을 제공합니다.
+    """
+    logger.info(f"[START] analyze_fatigue_timeline called - filename: {file.filename}, user_id: {current_user.user_id}")
+
+    if not file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.ogg', "mp4")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지원되지 않는 파일 형식입니다. .wav, .mp3, .m4a, .ogg, .mp4 형식만 허용됩니다."
+        )
+
+    file_bytes = await file.read()
+    if len(file_bytes) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="업로드된 오디오 파일이 비어 있습니다."
+        )
+
+    # 최소 한 개의 창이 만들어지도록 창 길이 이상의 음성 필요
+    y, sr, validation = await decode_upload(file_bytes, min_duration=window_seconds)
+
+    try:
+        timeline = await analysis_executor.run(
+            analysis_tasks.analyze_spm_timeline, y, sr, window_seconds, step_seconds
+        )
+        timeline["filename"] = file.filename
+        timeline["validation"] = validation
+
+        logger.info(f"[END] analyze_fatigue_timeline 완료 - {timeline['point_count']}개 구간")
+        return timeline
+
+    except Exception as e:
+        logger.error(f"[ERROR] 타임라인 분석 중 예외 발생: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"타임라인 분석 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+# 실행 중인 백그라운드 작업 참조 (가비지 컬렉션 방지)
+_running_jobs = set()
+
+
+def start_fatigue_job(job_id: str):
+    """피로도 분석 작업을 현재 이벤트 루프의 백그라운드 태스크로 실행 (작업을 가져온 경우에만 실행)"""
+    task = asyncio.create_task(_run_fatigue_job(job_id))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+
+
+async def _send_job_heartbeats(job_id: str):
+    """작업이 끝날 때까지 주기적으로 생존 신호 갱신 (다른 워커가 작업을 다시 가져가지 않도록)"""
+    while True:
+        await asyncio.sleep(analysis_jobs.JOB_HEARTBEAT_SECONDS)
+        if not await asyncio.to_thread(analysis_jobs.heartbeat_job, job_id):
+            logger.warning(f"작업 소유권을 잃었습니다: {job_id}")
+            return
+
+
+def _save_fatigue_job_history(job: models.AnalysisJob, analysis_result: dict, graph_url: Optional[str],
+                              graph_status: str) -> Optional[int]:
+    """작업 결과를 자체 세션으로 피로도 분석 기록에 저장 (스레드에서 실행)"""
+    db = SessionLocal()
+    try:
+        return _save_fatigue_history(db, job.user_id, analysis_result, job.filename, graph_url,
+                                     job_id=job.job_id, graph_status=graph_status)
+    finally:
+        db.close()
+
+
+async def _run_fatigue_job(job_id: str):
+    """디코딩 → 구간 분석 → 그래프 저장 순서로 작업을 처리하고 진행률을 기록"""
+    # 여러 워커 중 대기 상태에서 실행 상태로 바꾼 워커 하나만 실행
+    if not await asyncio.to_thread(analysis_jobs.claim_job, job_id):
+        logger.info(f"다른 워커가 이미 가져간 작업입니다: {job_id}")
+        return
+
+    job = await asyncio.to_thread(analysis_jobs.load_job, job_id)
+    if job is None:
+        logger.warning(f"작업을 찾을 수 없습니다: {job_id}")
+        return
+
+    heartbeat_task = asyncio.create_task(_send_job_heartbeats(job_id))
+    owned = True
+    try:
+        await asyncio.to_thread(analysis_jobs.update_job, job_id, stage="decoding", progress=10)
+        with open(job.input_path, "rb") as f:
+            file_bytes = f.read()
+
+        try:
+            y, sr, validation = await audio_decoder.decode(file_bytes, min_duration=FATIGUE_MIN_DURATION_SECONDS)
+        except AudioDecodeError:
+            raise ValueError("오디오 파일을 읽을 수 없습니다. 손상되었거나 지원되지 않는 파일입니다.")
+        if not validation["is_valid"]:
+            raise ValueError(validation["error"])
+
+        await asyncio.to_thread(analysis_jobs.update_job, job_id, stage="analyzing", progress=30)
+        options = analysis_jobs.job_options(job)
+        render_options = options.pop("render", {"enabled": True, "format": DEFAULT_CHART_FORMAT,
+                                                "dpi": DEFAULT_CHART_DPI})
+        analysis_result = await _run_fatigue_analysis(y, sr, options)
+        if analysis_result["status"] != "success":
+            raise ValueError(analysis_result.get("error", "분석 중 오류가 발생했습니다."))
+
+        # 작업 모드는 이미 응답을 보냈으므로 완료 전에 그래프를 렌더링
+        await asyncio.to_thread(analysis_jobs.update_job, job_id, stage="rendering", progress=80)
+        graph_path, graph_url = None, None
+        graph_status = "unavailable" if render_options["enabled"] else "disabled"
+        if render_options["enabled"] and analysis_result.get("graph_available"):
+            graph_path, graph_url = _fatigue_graph_target(job.user_id, job_id, render_options["format"])
+            rendered = await _render_fatigue_graph(
+                analysis_result["chart_data"], graph_path, render_options["format"], render_options["dpi"]
+            )
+            graph_status = "ready" if rendered else "failed"
+            if not rendered:
+                graph_path, graph_url = None, None
+
+        # 생존 신호가 끊겨 다른 워커가 다시 가져간 작업은 기록을 중복 저장하지 않음
+        owned = await asyncio.to_thread(analysis_jobs.heartbeat_job, job_id)
+        if not owned:
+            logger.warning(f"[WARN] 작업 소유권을 잃어 결과 저장을 생략합니다 - job_id: {job_id}")
+            return
+
+        await asyncio.to_thread(analysis_jobs.update_job, job_id, stage="saving", progress=90)
+        result = _build_fatigue_response(job.filename, analysis_result, validation, graph_path, graph_url,
+                                         graph_status)
+        result["db_analysis_id"] = await asyncio.to_thread(
+            _save_fatigue_job_history, job, analysis_result, graph_url, graph_status
+        )
+
+        await asyncio.to_thread(analysis_jobs.update_job, job_id, status=analysis_jobs.JOB_COMPLETED,
+                                stage="completed", progress=100, result=result)
+        logger.info(f"[END] 피로도 분석 작업 완료 - job_id: {job_id}")
+
+    except Exception as e:
+        logger.error(f"[ERROR] 피로도 분석 작업 실패 - job_id: {job_id}, 오류: {e}", exc_info=True)
+        owned = await asyncio.to_thread(analysis_jobs.heartbeat_job, job_id)
+        if owned:
+            await asyncio.to_thread(analysis_jobs.update_job, job_id, status=analysis_jobs.JOB_FAILED,
+                                    stage="failed", error=str(e))
+
+    finally:
+        heartbeat_task.cancel()
+        # 다른 워커가 다시 가져간 작업의 입력 파일은 그 워커가 사용하므로 남겨 둠
+        if owned:
+            analysis_jobs.remove_job_input(job.input_path)
+
+
+async def resume_fatigue_jobs():
+    """
+    완료되지 않은 작업을 다시 실행 (입력 파일이 없으면 실패 처리)
+    생존 신호가 끊긴 실행 중 작업만 다시 대기 상태로 돌리고, 대기 작업은 claim_job에 성공한 워커 하나만 실행합니다.
+    서버 시작 시 한 번, 이후 watch_stale_fatigue_jobs()가 주기적으로 호출합니다.
+    """
+    await asyncio.to_thread(analysis_jobs.requeue_stale_jobs, analysis_jobs.JOB_TYPE_VOCAL_FATIGUE)
+    job_ids = await asyncio.to_thread(analysis_jobs.find_queued_job_ids, analysis_jobs.JOB_TYPE_VOCAL_FATIGUE)
+    for job_id in job_ids:
+        job = await asyncio.to_thread(analysis_jobs.load_job, job_id)
+        if job is None:
+            continue
+        if job.input_path and os.path.exists(job.input_path):
+            logger.info(f"미완료 작업 재실행: {job_id}")
+            start_fatigue_job(job_id)
+        else:
+            await asyncio.to_thread(analysis_jobs.update_job, job_id, status=analysis_jobs.JOB_FAILED,
+                                    stage="failed", error="서버 재시작으로 작업 입력 파일을 찾을 수 없습니다.")
+
+
+async def watch_stale_fatigue_jobs():
+    """
+    다른 워커 프로세스가 종료되어 생존 신호가 끊긴 작업을 주기적으로 다시 가져와 실행
+    (서버 시작 시 백그라운드 태스크로 실행, 간격은 analysis_jobs.JOB_REQUEUE_INTERVAL_SECONDS)
+    """
+    while True:
+        await asyncio.sleep(analysis_jobs.JOB_REQUEUE_INTERVAL_SECONDS)
+        try:
+            await resume_fatigue_jobs()
+        except Exception as e:
+            logger.error(f"[ERROR] 중단된 작업 재실행 실패: {e}", exc_info=True)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+def read_analysis_job(
+        job_id: str,
+        db: Session = Depends(get_db),
+        current_user: models.User = Depends(get_current_user)
+):
+    """비동기 분석 작업의 진행률과 결과를 조회합니다."""
+    job = analysis_jobs.get_user_job(db, job_id, current_user.user_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 작업을 찾을 수 없습니다."
+        )
+    return analysis_jobs.serialize_job(job)
+
+
 @router.get("/analysis/", response_model=List[SpeedAnalysisResponse])
 def read_speech_analyses(
         user_id: Optional[str] = None,
@@ -501,3 +1011,61 @@ def read_speech_analyses(
 
     analyses = query.order_by(models.SpeedAnalysis.analysis_date.desc()).offset(skip).limit(limit).all()
     return analyses
+
+
+@router.get("/fatigue-history/", response_model=List[VocalFatigueAnalysisResponse])
+def read_fatigue_history(
+        skip: int = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=500),
+        since: Optional[datetime] = Query(None, description="이 시각 이후의 기록만 조회"),
+        include_segments: bool = Query(True, description="false면 구간별 SPM 배열 생략"),
+        db: Session = Depends(get_db),
+        current_user: models.User = Depends(get_current_user)
+):
+    """
+    로그인한 사용자의 음성 피로도 분석 기록을 최신순으로 조회합니다.
+    저장된 모델 파라미터와 구간별 SPM을 반환하므로 재업로드 없이 피로도 추이를 그릴 수 있습니다.
+    """
+    records = fatigue_history.list_user_analyses(db, current_user.user_id, skip=skip, limit=limit, since=since)
+    return [fatigue_history.serialize_analysis(record, include_segments) for record in records]
+
+
+@router.get("/fatigue-history/{analysis_id}/chart-data/")
+def read_fatigue_chart_data(
+        analysis_id: int,
+        db: Session = Depends(get_db),
+        current_user: models.User = Depends(get_current_user)
+):
+    """
+    저장된 피로도 분석의 그래프 데이터 계열만 반환합니다.
+    클라이언트가 직접 그래프를 그리도록 하여 서버 렌더링을 생략할 수 있습니다.
+    """
+    record = fatigue_history.get_user_analysis(db, analysis_id, current_user.user_id)
+    if record is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="분석 기록을 찾을 수 없습니다.")
+    return fatigue_history.chart_data_for(record)
+
+
+@router.get("/metrics/")
+def read_analysis_metrics(current_user: models.User = Depends(get_current_user)):
+    """
+    디코더, 분석/렌더링 프로세스 풀의 큐 깊이와 처리 통계, 피로도 모델 피팅 캐시 적중률, 생성된 서비스 목록,
+    STT 지연 시간 히스토그램과 변환 결과 캐시 적중률을 반환합니다. (로그인 필요)
+    STT 서비스가 아직 생성되지 않았으면 stt는 null입니다. (통계 조회만으로 서비스를 생성하지 않음)
+    """
+    lookups = fatigue_fit_cache_counts["hits"] + fatigue_fit_cache_counts["misses"]
+    stt_service = registry.peek("stt")
+    return {
+        "decoder": audio_decoder.stats(),
+        "analysis_executor": analysis_executor.stats(),
+        "render_executor": render_executor.stats(),
+        "services": registry.stats(),
+        "stt": stt_service.async_client.stats() if stt_service is not None else None,
+        "transcript_cache": transcript_cache.stats(),
+        "fatigue_fit_cache": {
+            **fatigue_fit_cache_counts,
+            "hit_ratio": round(fatigue_fit_cache_counts["hits"] / lookups, 3) if lookups else 0.0,
+            "maxsize_per_worker": FIT_CACHE_SIZE,
+            "ttl_seconds": FIT_CACHE_TTL_SECONDS
+        }
+    }
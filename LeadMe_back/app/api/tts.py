@@ -5,7 +5,7 @@ import asyncio
 import json
 
 # 내부 모듈 임포트
-from services.amazon_polly import AmazonPollyService
+from services.registry import get_polly_service
 from models import User
 from database import get_db
 from sqlalchemy.orm import Session
@@ -13,7 +13,6 @@ from fastapi import Depends
 
 
 router = APIRouter()
-polly_service = AmazonPollyService()
 
 # 임시 문장 저장소 (실제 프로덕션에서는 Redis나 데이터베이스 사용 권장)
 # 키: 세션ID 또는 사용자ID, 값: 생성된 문장
@@ -25,7 +24,8 @@ async def generate_sentence(
         age_group: str = Query(..., description="사용자 연령대 ('5~12세', '13~19세', '20세 이상')"),
         custom_text: Optional[str] = Query(None, description="사용자 지정 텍스트 (선택 사항)"),
         user_id: Optional[str] = Query(None, description="사용자 ID (세션 관리용)"),
-        request: Request = None
+        request: Request = None,
+        polly_service=Depends(get_polly_service)
 ):
     """
     연령대에 맞는 문장을 생성하는 API 엔드포인트
@@ -70,7 +70,8 @@ async def text_to_speech(
         speed: str = Query("중간", description="읽기 속도 ('천천히', '중간', '빠르게')"),
         age_group: str = Query("20세 이상", description="사용자 연령대 ('5~12세', '13~19세', '20세 이상')"),
         request: Request = None,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_db),
+        polly_service=Depends(get_polly_service)
 ):
     """
     텍스트를 음성으로 변환하는 API 엔드포인트
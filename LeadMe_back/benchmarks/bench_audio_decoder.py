@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+음성 디코딩 벤치마크
+기존 서브프로세스 경로(임시 파일 → ffmpeg wav 변환 → librosa.load)와
+ffmpeg 파이프 디코더, PyAV 프로세스 내부 디코더의 파일당 지연 시간과 처리량을 비교합니다.
+
+실행: LeadMe_back 디렉토리에서 `python -m benchmarks.bench_audio_decoder`
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import subprocess
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.audio_decoder import (
+    AudioDecoderService,
+    decode_and_validate,
+    decode_with_pyav,
+    av,
+)
+
+CLIP_SECONDS = 30
+ITERATIONS = 20
+CONCURRENT_FILES = 32
+
+
+def make_test_clip(seconds: int = CLIP_SECONDS, faststart: bool = False) -> bytes:
+    """
+    ffmpeg로 음성과 유사한 AM 변조 톤을 m4a(AAC)로 인코딩하여 바이트로 반환
+    faststart=False 이면 휴대폰 녹음 파일처럼 moov atom이 파일 끝에 위치합니다.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".m4a", delete=False) as temp_file:
+        path = temp_file.name
+    try:
+        subprocess.run([
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=44100:duration={seconds}",
+            "-af", "volume='0.5+0.5*sin(2*PI*4*t)':eval=frame",
+            "-c:a", "aac", "-b:a", "64k",
+            *(["-movflags", "+faststart"] if faststart else []),
+            path,
+        ], check=True)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def legacy_subprocess_decode(audio_data: bytes) -> np.ndarray:
+    """기존 convert_m4a_to_wav + inspect_audio_file + librosa.load 경로 재현"""
+    import librosa
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".m4a") as temp_file:
+        input_path = temp_file.name
+        temp_file.write(audio_data)
+    wav_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+    wav_path = wav_file.name
+    wav_file.close()
+    try:
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-i", input_path, "-ac", "1", "-ar", "16000",
+                        "-sample_fmt", "s16", wav_path], check=True)
+        subprocess.run(["ffmpeg", "-v", "error", "-i", wav_path, "-f", "null", "-"],
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        y, _ = librosa.load(wav_path, sr=None)
+        return y
+    finally:
+        os.remove(input_path)
+        os.remove(wav_path)
+
+
+def measure_latency(name: str, decode, audio_data: bytes):
+    decode(audio_data)  # 워밍업
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        decode(audio_data)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{name:<28} p50 {statistics.median(timings):8.2f} ms   "
+          f"min {min(timings):8.2f} ms   max {max(timings):8.2f} ms")
+
+
+async def measure_throughput(service: AudioDecoderService, audio_data: bytes):
+    await service.decode(audio_data)  # 워밍업
+    started = time.perf_counter()
+    await asyncio.gather(*(service.decode(audio_data) for _ in range(CONCURRENT_FILES)))
+    elapsed = time.perf_counter() - started
+    print(f"AudioDecoderService[{service.backend:<6}] {CONCURRENT_FILES / elapsed:8.1f} files/s "
+          f"(동시성 {service.max_concurrency})")
+
+
+def main():
+    audio_data = make_test_clip()
+    print(f"테스트 클립: {CLIP_SECONDS}초 m4a, {len(audio_data)} bytes, 반복 {ITERATIONS}회, CPU {os.cpu_count()}개")
+
+    for layout, clip in (("moov 뒤", audio_data), ("faststart", make_test_clip(faststart=True))):
+        print(f"\n[파일당 디코딩 지연 시간 - {layout}]")
+        measure_latency("legacy subprocess + librosa", legacy_subprocess_decode, clip)
+        measure_latency("ffmpeg pipe", decode_and_validate, clip)
+        if av is not None:
+            measure_latency("pyav in-process", decode_with_pyav, clip)
+
+    print("\n[처리량 - moov 뒤]")
+    started = time.perf_counter()
+    for _ in range(CONCURRENT_FILES):
+        legacy_subprocess_decode(audio_data)
+    print(f"legacy subprocess (순차)     {CONCURRENT_FILES / (time.perf_counter() - started):8.1f} files/s")
+
+    backends = ["ffmpeg"] + (["pyav"] if av is not None else [])
+    for backend in backends:
+        service = AudioDecoderService(backend=backend)
+        asyncio.run(measure_throughput(service, audio_data))
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+피로도 그래프 렌더링 벤치마크
+기존 경로(요청마다 plt.figure 생성 → axvspan/plot/text/legend/tight_layout → savefig → plt.close)와
+미리 만들어 둔 Figure 템플릿을 set_data/set_text로 갱신하는 경로(services.fatigue_chart.render_chart)의
+초당 렌더링 수를 형식/해상도별로 비교합니다.
+
+실행: LeadMe_back 디렉토리에서 `python -m benchmarks.bench_fatigue_chart`
+"""
+
+import io
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from services.fatigue_model import fit_decline_models
+from services.fatigue_chart import build_chart_data, render_chart, korean_font, _summary_text, _model_text
+
+RENDER_COUNT = 20
+SEGMENT_COUNT = 12
+CASES = (("png", 300), ("png", 100), ("webp", 100), ("svg", 100))
+
+
+def make_chart_data(count: int = RENDER_COUNT, seed: int = 0):
+    """무작위 감소 곡선 12구간에 대한 build_chart_data 결과 생성"""
+    rng = np.random.default_rng(seed)
+    charts = []
+    for _ in range(count):
+        spms = np.linspace(rng.uniform(200, 280), rng.uniform(120, 200), SEGMENT_COUNT) + rng.normal(0, 6, SEGMENT_COUNT)
+        segments = [
+            {"segment_num": i + 1, "start_time": i * 60.0, "end_time": (i + 1) * 60.0, "spm": float(spm), "is_valid": True}
+            for i, spm in enumerate(spms)
+        ]
+        fit = fit_decline_models(np.arange(SEGMENT_COUNT, dtype=float), spms)
+        hyperbolic = fit["models"]["hyperbolic"]
+        model_result = {
+            "model_fitted": True,
+            "parameters": dict(zip(("spm0", "decline_index", "shape_parameter"), hyperbolic["params"])),
+            "model_quality": {"r_squared": hyperbolic["r_squared"]},
+        }
+        early, middle, late = (float(np.mean(part)) for part in np.array_split(spms, 3))
+        charts.append(build_chart_data(segments, model_result, early, middle, late, float(np.mean(spms))))
+    return charts
+
+
+def legacy_render(chart_data, fmt: str, dpi: int) -> bytes:
+    """기존 render_chart의 pyplot 경로 재현 (요청마다 Figure 생성/폐기)"""
+    segment_count = chart_data["segment_count"]
+    all_spms = chart_data["spm"]
+    font_prop = korean_font()
+    plt.figure(figsize=(14, 8))
+    try:
+        ax = plt.gca()
+        for phase in chart_data["phases"]:
+            ax.axvspan(phase["start"] - 0.5, phase["end"] + 0.5, alpha=0.15, color=phase["color"],
+                       label=f'{phase["label"]} 구간 ({phase["start"]}-{phase["end"]})')
+        ax.plot(chart_data["segment_numbers"], all_spms, 'bo-', markersize=8, linewidth=3,
+                label='관측된 SPM', markerfacecolor='lightblue', markeredgecolor='blue')
+        model_curve = chart_data.get("model_curve")
+        if model_curve:
+            ax.plot(model_curve["segment_numbers"], model_curve["spm"], 'r--', linewidth=2, alpha=0.7,
+                    label=model_curve["label"])
+        plt.title(f'{segment_count}구간별 SPM 변화 분석', fontsize=18, fontweight='bold', pad=20, fontproperties=font_prop)
+        plt.xlabel('구간 번호', fontsize=14, fontproperties=font_prop)
+        plt.ylabel('SPM (음절/분)', fontsize=14, fontproperties=font_prop)
+        plt.xlim(0.5, segment_count + 0.5)
+        plt.xticks(range(1, segment_count + 1))
+        plt.ylim(max(0, min(all_spms) - 10), max(all_spms) + 10)
+        plt.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+        plt.legend(loc='upper right', fontsize=10)
+        plt.text(0.02, 0.98, _summary_text(chart_data), transform=ax.transAxes, fontsize=11, verticalalignment='top',
+                 bbox=dict(boxstyle='round,pad=0.8', facecolor='wheat', alpha=0.9, edgecolor='gray'),
+                 fontproperties=font_prop)
+        if chart_data.get("model_info"):
+            plt.text(0.98, 0.02, _model_text(chart_data["model_info"]), transform=ax.transAxes, fontsize=9,
+                     verticalalignment='bottom', horizontalalignment='right',
+                     bbox=dict(boxstyle='round,pad=0.5', facecolor='lightblue', alpha=0.8), fontproperties=font_prop)
+        plt.tight_layout()
+        buffer = io.BytesIO()
+        plt.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight', facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+    finally:
+        plt.close()
+
+
+def run(label: str, render_fn, charts, fmt: str, dpi: int) -> float:
+    render_fn(charts[0], fmt, dpi)  # 폰트 캐시/템플릿 생성 비용 제외
+    sizes = []
+    started = time.perf_counter()
+    for chart_data in charts:
+        sizes.append(len(render_fn(chart_data, fmt, dpi)))
+    elapsed = time.perf_counter() - started
+    rate = len(charts) / elapsed
+    print(f"{label:<10} {fmt:<5} {dpi:>4} dpi {rate:8.2f} renders/s   "
+          f"평균 {elapsed / len(charts) * 1000:8.1f} ms   평균 크기 {np.mean(sizes) / 1024:7.1f} KB")
+    return rate
+
+
+def main():
+    # 벤치마크 환경에 한글 폰트가 없으면 글리프 경고가 대량으로 출력되므로 숨김
+    warnings.filterwarnings("ignore", category=UserWarning)
+    charts = make_chart_data()
+    print(f"그래프 {RENDER_COUNT}개, 구간 {SEGMENT_COUNT}개, matplotlib {matplotlib.__version__}\n")
+
+    for fmt, dpi in CASES:
+        legacy = run("legacy", legacy_render, charts, fmt, dpi)
+        template = run("template", lambda c, f, d: render_chart(c, f, d), charts, fmt, dpi)
+        print(f"{'':<10} 속도 향상 x{template / legacy:.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
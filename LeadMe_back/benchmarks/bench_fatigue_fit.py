@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+하이퍼볼릭 피로 모델 피팅 벤치마크
+기존 경로(calculate_initial_decline_rate 초기값 + scipy curve_fit, 수치 미분, maxfev=2000)와
+서비스가 사용하는 감소 모델 엔진(services.fatigue_model.fit_decline_models)의 하이퍼볼릭 단독 피팅
+(격자 초기화 + 해석적 야코비안 LM)과 4개 모델 동시 피팅, 배치 LM(fit_hyperbolic_batch)의
+초당 피팅 수와 피팅 품질(SSE)을 합성 12구간 곡선으로 비교합니다.
+
+실행: LeadMe_back 디렉토리에서 `python -m benchmarks.bench_fatigue_fit`
+"""
+
+import os
+import sys
+import time
+import statistics
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fatigue_model import (
+    hyperbolic_decline,
+    fit_hyperbolic_batch,
+    fit_decline_models,
+    DECLINE_MODELS,
+    PARAM_LOWER,
+    PARAM_UPPER,
+)
+
+CURVE_COUNT = 300
+BATCH_CURVE_COUNT = 100_000
+SEGMENT_COUNT = 12
+SESSION_MINUTES = 12.0
+NOISE_SPM = 6.0
+
+
+def make_curves(count: int = CURVE_COUNT, seed: int = 0):
+    """파라미터 범위 안에서 무작위 하이퍼볼릭 곡선 + 가우시안 잡음 생성"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SEGMENT_COUNT) * SESSION_MINUTES / SEGMENT_COUNT
+    params = np.column_stack((
+        rng.uniform(150, 300, count),
+        10 ** rng.uniform(-3, -0.5, count),
+        rng.uniform(0.1, 2.0, count),
+    ))
+    curves = np.array([hyperbolic_decline(t, *p) for p in params]) + rng.normal(0, NOISE_SPM, (count, SEGMENT_COUNT))
+    return t, curves
+
+
+def legacy_fit(t: np.ndarray, y: np.ndarray):
+    """기존 fit_hyperbolic_model의 초기값 계산과 curve_fit 호출 재현"""
+    spm0_init = y[0]
+    dt = t[1] - t[0]
+    di_init = abs(y[0] - y[1]) / (y[0] * dt) if y[0] != 0 and dt != 0 else 0.01
+    p0 = np.clip([spm0_init, di_init, 1.0], PARAM_LOWER, PARAM_UPPER)
+    popt, _ = curve_fit(hyperbolic_decline, t, y, p0=p0, bounds=(PARAM_LOWER, PARAM_UPPER), maxfev=2000)
+    return popt
+
+
+def fit_hyperbolic_only(t: np.ndarray, y: np.ndarray):
+    """서비스와 같은 엔진으로 하이퍼볼릭 모델만 피팅"""
+    return fit_decline_models(t, y, models=("hyperbolic",))["models"]["hyperbolic"]
+
+
+def run(label: str, fit_fn, t: np.ndarray, curves: np.ndarray):
+    sses = []
+    failures = 0
+    started = time.perf_counter()
+    for y in curves:
+        try:
+            params = fit_fn(t, y)
+            sses.append(float(np.sum((y - hyperbolic_decline(t, *params)) ** 2)))
+        except Exception:
+            failures += 1
+            sses.append(np.nan)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {len(curves) / elapsed:9.1f} fits/s   "
+          f"평균 {elapsed / len(curves) * 1000:7.3f} ms   실패 {failures}")
+    return np.array(sses)
+
+
+def main():
+    t, curves = make_curves()
+    print(f"합성 곡선 {CURVE_COUNT}개, 구간 {SEGMENT_COUNT}개, 잡음 σ={NOISE_SPM} SPM, CPU {os.cpu_count()}개\n")
+
+    legacy_sse = run("legacy curve_fit (수치 미분)", legacy_fit, t, curves)
+    new_sse = run("grid init + analytic LM", lambda t, y: fit_hyperbolic_only(t, y)["params"], t, curves)
+
+    fits = [fit_hyperbolic_only(t, y) for y in curves]
+    iterations = [fit["iterations"] for fit in fits]
+    print(f"\nLM 반복 횟수: 중앙값 {statistics.median(iterations)}, 최대 {max(iterations)}")
+
+    both = ~np.isnan(legacy_sse)
+    ratio = new_sse[both] / np.maximum(legacy_sse[both], 1e-9)
+    print(f"SSE 비율(new/legacy): 중앙값 {np.median(ratio):.4f}, "
+          f"new가 더 좋음 {np.sum(ratio < 0.999)}개, 더 나쁨 {np.sum(ratio > 1.001)}개")
+
+    # 통합 엔진: 하이퍼볼릭/지수/조화/선형을 한 번에 피팅 (하이퍼볼릭 결과는 단독 피팅과 동일해야 함)
+    engine_sse = run("4-model engine (BIC 선택)",
+                     lambda t, y: fit_decline_models(t, y)["models"]["hyperbolic"]["params"], t, curves)
+    selected = [fit_decline_models(t, y)["selected"] for y in curves]
+    print(f"엔진 하이퍼볼릭 SSE 비율(engine/single): 최대 {np.max(engine_sse / new_sse):.6f}")
+    print("선택된 모델: " + ", ".join(f"{name} {selected.count(name)}" for name in DECLINE_MODELS))
+
+    # 배치 피팅: 같은 곡선에 대해 단일 피터와 결과 비교 후, 대량 곡선 처리량 측정
+    batch = fit_hyperbolic_batch(t, curves)
+    batch_ratio = batch["sse"] / np.array([fit["sse"] for fit in fits])
+    print(f"\n배치 SSE 비율(batch/single): 최대 {np.max(batch_ratio):.6f}, 수렴 {batch['converged'].mean() * 100:.1f}%")
+
+    _, many_curves = make_curves(BATCH_CURVE_COUNT, seed=1)
+    batch = fit_hyperbolic_batch(t, many_curves)
+    print(f"{'batch LM (' + str(BATCH_CURVE_COUNT) + '개)':<32} "
+          f"{BATCH_CURVE_COUNT / (batch['wall_time_ms'] / 1000):9.1f} fits/s   "
+          f"전체 {batch['wall_time_ms'] / 1000:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,23 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.api import tts
+from fastapi.responses import JSONResponse
 import os
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import asyncio
-import openai
 
 # 내부 모듈 임포트
 from database import get_db, engine
 import models
+from services.lazy_imports import timed_import, import_report
+from services.warmup import warmup_state, run_warmup, default_steps
+from services.registry import registry
+
+# 라우터 모듈별 임포트 시간 기록 (GET /health/imports)
+# librosa, scipy, matplotlib 등 분석용 모듈은 첫 사용 시 로드되며 그 시간도 같은 보고서에 추가됩니다.
+for router_module in ("auth", "users", "speech_sessions", "word_list", "speed_analysis", "sentence_generation", "tts"):
+    timed_import(f"app.api.{router_module}")
 from app.api import users, speech_sessions, word_list, speed_analysis, auth, sentence_generation, tts
 
 # 기본 디렉토리 생성
@@ -50,6 +57,21 @@ def health_check():
     return {"status": "healthy"}
 
 
+# 준비 상태 체크 (워밍업이 끝나기 전이나 필수 워밍업 단계가 실패한 경우 503)
+@app.get("/health/ready")
+def readiness_check():
+    if not warmup_state.ready:
+        state = "not_ready" if warmup_state.finished else "warming_up"
+        return JSONResponse(status_code=503, content={"status": state, "warmup": warmup_state.stats()})
+    return {"status": "ready", "warmup": warmup_state.stats()}
+
+
+# 모듈 임포트 시간 보고서
+@app.get("/health/imports")
+def import_time_report():
+    return import_report()
+
+
 # API 라우터 설정
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -66,6 +88,10 @@ async def startup():
     # 서버 시작 시 필요한 초기화 작업
     # 데이터베이스 연결 확인 등
     print("서버가 시작되었습니다.")
+    report = import_report()
+    print(f"모듈 임포트 시간: 총 {report['total_ms']:.0f} ms")
+    for item in report["modules"]:
+        print(f"  - {item['module']}: {item['import_ms']:.0f} ms")
     print(f"데이터베이스 연결: {engine.url}")
 
     try:
@@ -82,20 +108,19 @@ async def startup():
     # 디렉토리 확인
     print(f"업로드 디렉토리 확인: {os.path.exists('uploads/audio')} (audio), {os.path.exists('uploads/images')} (images)")
 
-    # OpenAI 워밍업 비동기 태스크 실행
-    async def warmup_openai():
-        try:
-            await asyncio.to_thread(
-                openai.ChatCompletion.create,
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "안녕하세요"}],
-                timeout=5,
-            )
-            print("OpenAI API 워밍업 완료")
-        except Exception as e:
-            print(f"워밍업 중 오류: {e}")
+    # 서버 재시작 전에 완료되지 않은 피로도 분석 작업 재실행
+    try:
+        await speed_analysis.resume_fatigue_jobs()
+    except Exception as e:
+        print(f"미완료 작업 재실행 중 오류: {e}")
+    # 실행 중 다른 워커가 종료되어 멈춘 작업을 주기적으로 다시 대기시키고 실행
+    app.state.stale_job_watcher = asyncio.create_task(speed_analysis.watch_stale_fatigue_jobs())
 
-    asyncio.create_task(warmup_openai())
+    # 워밍업 (services.warmup): 합성 음성으로 디코딩/분석 경로 실행, 렌더링 워커, DB 풀, OpenAI/Polly 연결 준비
+    # 끝날 때까지 /health/ready는 503을 반환합니다.
+    asyncio.create_task(run_warmup(default_steps(
+        speed_analysis.analysis_executor, speed_analysis.render_executor, speed_analysis.audio_decoder, engine
+    )))
 
 
 # 서버 종료 이벤트
@@ -103,6 +128,13 @@ async def startup():
 async def shutdown():
     # 서버 종료 시 정리 작업
     print("서버가 종료됩니다.")
+    app.state.stale_job_watcher.cancel()
+    speed_analysis.analysis_executor.shutdown()
+    speed_analysis.render_executor.shutdown()
+    speed_analysis.audio_decoder.shutdown()
+    stt_service = registry.peek("stt")
+    if stt_service is not None:
+        await stt_service.async_client.aclose()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, CheckConstraint, func
+from sqlalchemy import (
+    Column, Integer, Float, String, Text, LargeBinary, ForeignKey, Date, DateTime, CheckConstraint, Index, func
+)
 from sqlalchemy.orm import relationship
 import datetime
 from database import Base
@@ -26,6 +28,8 @@ class User(Base):
     speech_sessions = relationship("SpeechSession", back_populates="user")
     word_favorites = relationship("WordFavorites", back_populates="user", cascade="all, delete-orphan")
     speed_analyses = relationship("SpeedAnalysis", back_populates="user", cascade="all, delete-orphan")
+    analysis_jobs = relationship("AnalysisJob", back_populates="user", cascade="all, delete-orphan")
+    vocal_fatigue_analyses = relationship("VocalFatigueAnalysis", back_populates="user", cascade="all, delete-orphan")
     user_sessions = relationship(
         "UserSession", 
         back_populates="user",
@@ -77,6 +81,47 @@ class SpeedAnalysis(Base):
     # 관계 설정
     user = relationship("User", back_populates="speed_analyses")
 
+# Vocal_Fatigue_Analysis (음성 피로도 분석 기록 테이블)
+class VocalFatigueAnalysis(Base):
+    __tablename__ = "vocal_fatigue_analysis"
+
+    analysis_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(String, ForeignKey("users.user_id"), nullable=False)
+    job_id = Column(String, nullable=True)  # 비동기 작업으로 분석한 경우 작업 ID
+    filename = Column(String, nullable=True)
+    total_duration = Column(Float, nullable=False)
+    segment_count = Column(Integer, nullable=False)
+    valid_segments = Column(Integer, nullable=False)
+
+    # 전기/중기/말기 SPM 및 감소율(%)
+    early_spm = Column(Float, nullable=False)
+    middle_spm = Column(Float, nullable=False)
+    late_spm = Column(Float, nullable=False)
+    overall_spm = Column(Float, nullable=False)
+    decline_percent = Column(Float, nullable=False)
+
+    # 하이퍼볼릭 모델 파라미터와 품질 (피팅하지 못한 경우 NULL)
+    spm0 = Column(Float, nullable=True)
+    decline_index = Column(Float, nullable=True)
+    shape_parameter = Column(Float, nullable=True)
+    r_squared = Column(Float, nullable=True)
+    selected_model = Column(String(20), nullable=True)  # AIC/BIC로 선택된 감소 모델
+    selected_parameters = Column(Text, nullable=True)  # 선택 모델 파라미터 (JSON 문자열)
+    selected_r_squared = Column(Float, nullable=True)  # 선택 모델 R²
+
+    # 구간별 SPM (float32 little-endian 배열, 유효하지 않은 구간은 NaN)
+    segment_spms = Column(LargeBinary, nullable=False)
+    graph_url = Column(Text, nullable=True)
+    graph_status = Column(String(20), nullable=True)  # rendering, ready, failed, disabled, unavailable
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_vocal_fatigue_analysis_user_created", "user_id", "created_at"),
+    )
+
+    # 관계 설정
+    user = relationship("User", back_populates="vocal_fatigue_analyses")
+
 # 5. Age_Group_Speech_Rate (연령대 별로 발화 속도 정의 테이블)
 class AgeGroupSpeechRate(Base):
     __tablename__ = "age_group_speech_rate"
@@ -111,4 +156,41 @@ class SpeechSession(Base):
     session_date = Column(DateTime, default=datetime.datetime.utcnow)
 
     # 관계 설정
-    user = relationship("User", back_populates="speech_sessions")
\ No newline at end of file
+    user = relationship("User", back_populates="speech_sessions")
+
+# AnalysisJob 클래스 추가 (비동기 분석 작업 테이블)
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    job_id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    progress = Column(Integer, nullable=False, default=0)
+    stage = Column(String(50), nullable=True)
+    filename = Column(String, nullable=True)
+    input_path = Column(Text, nullable=True)
+    options = Column(Text, nullable=True)  # JSON 문자열 (분석 옵션)
+    result = Column(Text, nullable=True)  # JSON 문자열
+    error = Column(Text, nullable=True)
+    worker_id = Column(String(100), nullable=True)  # 작업을 가져간 워커 (호스트:PID)
+    heartbeat_at = Column(DateTime, nullable=True)  # 실행 중인 워커의 마지막 생존 신호
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    # CHECK 제약 조건 추가
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name="check_analysis_job_status"),
+    )
+
+    # 관계 설정
+    user = relationship("User", back_populates="analysis_jobs")
+
+# TranscriptCache 클래스 추가 (Whisper 변환 결과 캐시, STT_CACHE_PERSIST=true일 때 사용)
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+
+    audio_hash = Column(String(32), primary_key=True)  # 디코딩된 PCM(또는 파일 바이트)의 BLAKE2b 해시
+    model = Column(String(20), nullable=False)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 
 
@@ -44,6 +44,40 @@ class SpeedAnalysisResponse(SpeedAnalysisBase):
         orm_mode = True
 
 
+# 비동기 분석 작업 응답 모델
+class AnalysisJobResponse(BaseModel):
+    job_id: str
+    job_type: str
+    status: str = Field(..., description="작업 상태(queued, running, completed, failed)")
+    progress: int = Field(..., ge=0, le=100, description="진행률(%)")
+    stage: Optional[str] = None
+    filename: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+# 음성 피로도 분석 기록 응답 모델
+class VocalFatigueAnalysisResponse(BaseModel):
+    analysis_id: int
+    job_id: Optional[str] = None
+    filename: Optional[str] = None
+    total_duration: float = Field(..., description="음성 길이(초)")
+    segment_count: int
+    valid_segments: int
+    spm_analysis: Dict[str, float] = Field(..., description="전기/중기/말기/전체 SPM 및 감소율(%)")
+    model_parameters: Optional[Dict[str, float]] = Field(None, description="하이퍼볼릭 모델 파라미터")
+    r_squared: Optional[float] = None
+    selected_model: Optional[str] = Field(None, description="AIC/BIC로 선택된 감소 모델")
+    selected_parameters: Optional[Dict[str, float]] = Field(None, description="선택 모델 파라미터")
+    selected_r_squared: Optional[float] = None
+    graph_url: Optional[str] = None
+    graph_status: Optional[str] = Field(None, description="그래프 렌더링 상태 (rendering, ready, failed, disabled, unavailable)")
+    created_at: datetime
+    segment_spms: Optional[List[Optional[float]]] = Field(None, description="구간별 SPM (유효하지 않은 구간은 null)")
+
+
 # 연령대별 발화 속도 기준 모델
 class AgeGroupSpeechRateBase(BaseModel):
     age_group: str = Field(..., description="사용자 연령대(7세 이하, 8~13세, 14세 이상)")
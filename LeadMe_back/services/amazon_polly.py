@@ -16,10 +16,15 @@ load_dotenv()
 class AmazonPollyService:
     """Amazon Polly를 사용한 TTS(Text-to-Speech) 서비스 클래스"""
 
-    def __init__(self):
-        """클래스 초기화"""
+    def __init__(self, polly_client=None):
+        """
+        클래스 초기화
+
+        Args:
+            polly_client: 공유할 boto3 Polly 클라이언트 (생략하면 새로 생성, 보통 services.registry에서 주입)
+        """
         # Amazon Polly 클라이언트 생성
-        self.polly_client = boto3.client(
+        self.polly_client = polly_client or boto3.client(
             'polly',
             region_name=os.getenv("AWS_REGION"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
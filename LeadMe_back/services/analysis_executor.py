@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 집약적인 음성 분석(librosa, scipy)과 그래프 렌더링(matplotlib)을 이벤트 루프 밖의 프로세스 풀에서 실행하는 모듈
+그래프 렌더링은 분석 작업과 워커를 나눠 쓰지 않도록 별도의 풀(ChartRenderExecutor)에서 실행합니다.
+"""
+
+import os
+import time
+import functools
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker():
+    """워커 프로세스 시작 시 무거운 과학 계산 모듈을 미리 임포트 (그래프 렌더링은 별도 풀이므로 matplotlib 제외)"""
+    import numpy  # noqa: F401
+    import scipy.optimize  # noqa: F401
+    import scipy.signal  # noqa: F401
+    import librosa  # noqa: F401
+
+
+def _warm_render_worker():
+    """렌더링 워커 시작 시 Agg 백엔드와 한글 폰트를 설정하고 그래프 템플릿을 미리 생성"""
+    import matplotlib
+    matplotlib.use("Agg")
+    from services.fatigue_chart import prepare_chart_template
+    prepare_chart_template()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ExecutorQueueFullError(RuntimeError):
+    """대기 중인 작업 수가 max_queue를 넘어 제출을 거부한 경우"""
+
+
+class AnalysisExecutor:
+    """
+    분석 작업용 프로세스 풀
+    엔드포인트는 run()으로 작업을 제출하고 결과를 await 합니다.
+    """
+
+    def __init__(self, max_workers: int = None, start_method: str = None, initializer: Callable = _warm_worker,
+                 max_queue: Optional[int] = None, timeout_seconds: Optional[float] = None, name: str = "분석"):
+        """
+        Args:
+            max_workers: 워커 프로세스 수 (기본값: ANALYSIS_WORKERS 환경변수, 없으면 CPU 수)
+            start_method: 프로세스 시작 방식 (기본값: ANALYSIS_START_METHOD 환경변수, 없으면 spawn)
+            initializer: 워커 프로세스 시작 시 실행할 함수
+            max_queue: 실행 중인 작업 외에 대기할 수 있는 작업 수 (None이면 제한 없음, 넘으면 ExecutorQueueFullError)
+            timeout_seconds: 작업 결과를 기다리는 최대 시간 (None이면 제한 없음, 넘으면 asyncio.TimeoutError)
+            name: 로그에 표시할 풀 이름
+        """
+        self.max_workers = max_workers or int(os.getenv("ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
+        # 디코더 스레드 풀 등 스레드가 있는 프로세스에서 fork 하지 않도록 기본값은 spawn
+        self.start_method = start_method or os.getenv("ANALYSIS_START_METHOD", "spawn")
+        self.initializer = initializer
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.name = name
+        self._pool = None
+
+        # 큐 깊이 및 처리 통계
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_run_seconds = 0.0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=self.initializer
+            )
+            logger.info(f"{self.name} 프로세스 풀 생성 (workers: {self.max_workers}, start_method: {self.start_method})")
+        return self._pool
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        함수를 프로세스 풀에서 실행하고 결과를 기다립니다.
+        fn과 인자는 피클 가능해야 합니다. (모듈 최상위 함수, NumPy 배열, 딕셔너리 등)
+
+        시간 초과 시 대기만 중단하며, 이미 실행 중인 작업은 워커에서 끝날 때까지 대기열 자리를 차지합니다.
+        """
+        if self.max_queue is not None and self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorQueueFullError(f"{self.name} 대기열이 가득 찼습니다. (대기 가능: {self.max_queue}개)")
+
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+
+        self.submitted += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        future = pool.submit(functools.partial(fn, *args, **kwargs))
+        future.add_done_callback(lambda done: self._call_in_loop(loop, self._finish, done, started))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.warning(f"{self.name} 작업 시간 초과 ({self.timeout_seconds}초): {getattr(fn, '__name__', fn)}")
+            raise
+
+    @staticmethod
+    def _call_in_loop(loop, callback, *args):
+        # 완료 콜백은 풀 관리 스레드에서 호출되므로 카운터 갱신은 이벤트 루프로 넘김
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # 종료 중 이벤트 루프가 닫힌 경우
+
+    def _finish(self, future, started: float):
+        """워커에서 작업이 끝났을 때(시간 초과로 대기를 중단한 작업 포함) 통계 갱신"""
+        self.in_flight -= 1
+        self.total_run_seconds += time.perf_counter() - started
+        if not future.cancelled() and future.exception() is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    async def warm_up(self):
+        """모든 워커 프로세스를 미리 띄워 첫 요청의 임포트 비용을 제거"""
+        pool = self._ensure_pool()
+        futures = [asyncio.wrap_future(pool.submit(_ping)) for _ in range(self.max_workers)]
+        worker_pids = set(await asyncio.gather(*futures))
+        logger.info(f"{self.name} 워커 워밍업 완료: {len(worker_pids)}개 프로세스")
+        return worker_pids
+
+    def stats(self) -> Dict:
+        """큐 깊이 메트릭"""
+        finished = self.completed + self.failed
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "running": min(self.in_flight, self.max_workers),
+            "queue_depth": max(0, self.in_flight - self.max_workers),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout_seconds,
+            "average_run_ms": round(self.total_run_seconds / finished * 1000, 2) if finished else 0.0,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class ChartRenderExecutor(AnalysisExecutor):
+    """
+    그래프 렌더링 전용 프로세스 풀
+    워커마다 Figure 템플릿을 하나씩 두고 객체지향 Figure/Agg API로 렌더링하므로
+    pyplot 전역 상태를 공유하지 않고 여러 코어에서 동시에 렌더링할 수 있습니다.
+    분석 풀과 분리하여 렌더링이 밀려도 분석 작업의 대기 시간에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, timeout_seconds: float = None):
+        """
+        Args:
+            max_workers: 워커 프로세스 수 (기본값: CHART_RENDER_WORKERS 환경변수, 없으면 min(2, CPU 수))
+            max_queue: 대기 가능한 렌더링 수 (기본값: CHART_RENDER_QUEUE_SIZE 환경변수, 없으면 16)
+            timeout_seconds: 렌더링 대기 시간 (기본값: CHART_RENDER_TIMEOUT_SECONDS 환경변수, 없으면 30초)
+        """
+        super().__init__(
+            max_workers=max_workers or int(os.getenv("CHART_RENDER_WORKERS", str(min(2, os.cpu_count() or 1)))),
+            initializer=_warm_render_worker,
+            max_queue=max_queue if max_queue is not None else int(os.getenv("CHART_RENDER_QUEUE_SIZE", "16")),
+            timeout_seconds=timeout_seconds or float(os.getenv("CHART_RENDER_TIMEOUT_SECONDS", "30")),
+            name="그래프 렌더링"
+        )
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 분석 작업 저장소
+작업 상태와 결과를 analysis_jobs 테이블에 저장하여 워커가 재시작되어도 결과가 유지되도록 합니다.
+
+여러 uvicorn 워커가 같은 테이블을 사용하므로, 작업은 claim_job()으로 대기(queued) 상태에서
+실행(running) 상태로 원자적으로 바꾼 워커만 실행합니다. 실행 중인 워커는 heartbeat_job()으로
+생존 신호를 남기며, 신호가 JOB_STALE_SECONDS 이상 끊긴 작업만 requeue_stale_jobs()로 다시 대기 상태가 됩니다.
+requeue_stale_jobs()는 서버 시작 시와 이후 JOB_REQUEUE_INTERVAL_SECONDS마다 실행되므로
+다른 워커가 계속 동작하는 중에 한 워커가 종료되어도 그 작업은 다른 워커가 이어서 처리합니다.
+
+환경 변수:
+    JOB_HEARTBEAT_SECONDS: 실행 중 생존 신호 간격 (기본값 30)
+    JOB_STALE_SECONDS: 생존 신호가 끊긴 작업을 다시 대기시키기까지의 시간 (기본값 120)
+    JOB_REQUEUE_INTERVAL_SECONDS: 생존 신호가 끊긴 작업을 확인하는 주기 (기본값 60)
+"""
+
+import os
+import json
+import uuid
+import socket
+import logging
+import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# 작업 종류
+JOB_TYPE_VOCAL_FATIGUE = "vocal_fatigue"
+
+# 작업 입력 파일 보관 디렉토리 (재시작 후 재처리용)
+JOB_INPUT_DIR = "uploads/audio/jobs"
+
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "120"))
+JOB_REQUEUE_INTERVAL_SECONDS = float(os.getenv("JOB_REQUEUE_INTERVAL_SECONDS", "60"))
+
+# 현재 워커 프로세스 식별자
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _json_default(value):
+    # NumPy 스칼라 등은 파이썬 기본 타입으로 변환
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def create_job(db: Session, user_id: str, job_type: str, filename: str, file_bytes: bytes,
+               options: Optional[Dict] = None) -> models.AnalysisJob:
+    """
+    작업을 생성하고 입력 파일을 디스크에 보관합니다.
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+        job_type: 작업 종류
+        filename: 업로드 파일 이름
+        file_bytes: 업로드 파일 바이트
+        options: 분석 옵션 (재시작 후 재처리 시 동일하게 적용)
+
+    Returns:
+        생성된 작업
+    """
+    os.makedirs(JOB_INPUT_DIR, exist_ok=True)
+
+    job_id = str(uuid.uuid4())
+    file_ext = os.path.splitext(filename)[1].lower()
+    input_path = os.path.join(JOB_INPUT_DIR, f"{job_id}{file_ext}")
+    with open(input_path, "wb") as f:
+        f.write(file_bytes)
+
+    job = models.AnalysisJob(
+        job_id=job_id,
+        user_id=user_id,
+        job_type=job_type,
+        status=JOB_QUEUED,
+        progress=0,
+        stage="queued",
+        filename=filename,
+        input_path=input_path,
+        options=json.dumps(options, ensure_ascii=False) if options else None
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def update_job(job_id: str, **fields) -> None:
+    """
+    작업 상태를 갱신합니다. 백그라운드 작업에서 호출되므로 자체 세션을 사용합니다.
+    result 필드는 딕셔너리로 전달하면 JSON 문자열로 저장됩니다.
+    """
+    if isinstance(fields.get("result"), dict):
+        fields["result"] = json.dumps(fields["result"], ensure_ascii=False, default=_json_default)
+
+    db = SessionLocal()
+    try:
+        db.query(models.AnalysisJob).filter(models.AnalysisJob.job_id == job_id).update(fields)
+        db.commit()
+    finally:
+        db.close()
+
+
+def claim_job(job_id: str) -> bool:
+    """
+    대기 중인 작업을 현재 워커의 실행 작업으로 가져옵니다.
+    UPDATE ... WHERE status='queued' 한 번으로 처리하므로 여러 워커가 동시에 시도해도 한 워커만 성공합니다.
+
+    Returns:
+        가져왔으면 True (다른 워커가 먼저 가져갔거나 대기 상태가 아니면 False)
+    """
+    db = SessionLocal()
+    try:
+        claimed = db.query(models.AnalysisJob).filter(
+            models.AnalysisJob.job_id == job_id,
+            models.AnalysisJob.status == JOB_QUEUED
+        ).update({
+            "status": JOB_RUNNING,
+            "worker_id": WORKER_ID,
+            "heartbeat_at": datetime.datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+    finally:
+        db.close()
+
+
+def heartbeat_job(job_id: str) -> bool:
+    """
+    실행 중인 작업의 생존 신호 갱신
+
+    Returns:
+        현재 워커가 아직 작업을 소유하고 있으면 True (다시 대기 상태가 되어 다른 워커가 가져갔으면 False)
+    """
+    db = SessionLocal()
+    try:
+        owned = db.query(models.AnalysisJob).filter(
+            models.AnalysisJob.job_id == job_id,
+            models.AnalysisJob.status == JOB_RUNNING,
+            models.AnalysisJob.worker_id == WORKER_ID
+        ).update({"heartbeat_at": datetime.datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+        return owned == 1
+    finally:
+        db.close()
+
+
+def requeue_stale_jobs(job_type: str) -> int:
+    """생존 신호가 JOB_STALE_SECONDS 이상 끊긴 실행 중 작업을 다시 대기 상태로 변경하고 개수 반환"""
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=JOB_STALE_SECONDS)
+    db = SessionLocal()
+    try:
+        requeued = db.query(models.AnalysisJob).filter(
+            models.AnalysisJob.job_type == job_type,
+            models.AnalysisJob.status == JOB_RUNNING,
+            (models.AnalysisJob.heartbeat_at.is_(None)) | (models.AnalysisJob.heartbeat_at < cutoff)
+        ).update({"status": JOB_QUEUED, "stage": "queued", "worker_id": None}, synchronize_session=False)
+        db.commit()
+        if requeued:
+            logger.info(f"생존 신호가 끊긴 작업 {requeued}개를 다시 대기 상태로 변경")
+        return requeued
+    finally:
+        db.close()
+
+
+def load_job(job_id: str) -> Optional[models.AnalysisJob]:
+    """백그라운드 작업용 작업 조회 (세션과 분리된 객체 반환)"""
+    db = SessionLocal()
+    try:
+        job = db.query(models.AnalysisJob).filter(models.AnalysisJob.job_id == job_id).first()
+        if job is not None:
+            db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+def get_user_job(db: Session, job_id: str, user_id: str) -> Optional[models.AnalysisJob]:
+    """사용자 소유의 작업 조회"""
+    return db.query(models.AnalysisJob).filter(
+        models.AnalysisJob.job_id == job_id,
+        models.AnalysisJob.user_id == user_id
+    ).first()
+
+
+def find_queued_job_ids(job_type: str) -> List[str]:
+    """대기 중인 작업 ID 목록 - 재시작/중단된 작업 재처리용 (실행은 claim_job에 성공한 워커만)"""
+    db = SessionLocal()
+    try:
+        jobs = db.query(models.AnalysisJob.job_id).filter(
+            models.AnalysisJob.job_type == job_type,
+            models.AnalysisJob.status == JOB_QUEUED
+        ).order_by(models.AnalysisJob.created_at).all()
+        return [job.job_id for job in jobs]
+    finally:
+        db.close()
+
+
+def job_options(job: models.AnalysisJob) -> Dict:
+    """작업 생성 시 저장한 분석 옵션"""
+    return json.loads(job.options) if job.options else {}
+
+
+def remove_job_input(input_path: Optional[str]) -> None:
+    """작업이 끝난 입력 파일 삭제"""
+    if input_path and os.path.exists(input_path):
+        try:
+            os.remove(input_path)
+        except OSError as e:
+            logger.warning(f"작업 입력 파일 삭제 실패: {input_path}, 오류: {e}")
+
+
+def serialize_job(job: models.AnalysisJob) -> Dict:
+    """작업 응답 딕셔너리 생성 (결과 JSON 파싱 포함)"""
+    return {
+        "job_id": job.job_id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": job.progress,
+        "stage": job.stage,
+        "filename": job.filename,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+분석 프로세스 풀에서 실행되는 작업 함수 모음
+프로세스 간 전달을 위해 모두 모듈 최상위 함수이며, NumPy 배열과 딕셔너리만 주고받습니다.
+"""
+
+import os
+import time
+from typing import Dict
+
+import numpy as np
+
+
+def _get_vocal_fatigue_service():
+    # 워커 프로세스마다 한 번만 생성 (services.registry)
+    from services.registry import get_vocal_fatigue_service
+    return get_vocal_fatigue_service()
+
+
+def analyze_speech_rate(y: np.ndarray, sr: int) -> Dict:
+    """전체 길이, 음성 구간(voiced) 길이, 음절 핵 기반 음절 수 계산"""
+    from services.speech_features import VoicedEnergyIndex, detect_syllable_nuclei
+
+    energy_index = VoicedEnergyIndex(y, sr)
+    duration = energy_index.total_duration
+    voiced_duration = energy_index.voiced_duration(0.0, duration)
+    voiced_percentage = voiced_duration / duration * 100 if duration > 0 else 0
+
+    return {
+        "duration": duration,
+        "voiced_duration": voiced_duration,
+        "voiced_percentage": voiced_percentage,
+        "syllables_estimate": int(len(detect_syllable_nuclei(y, sr, energy_index)))
+    }
+
+
+def analyze_spm_timeline(y: np.ndarray, sr: int, window_seconds: float, step_seconds: float) -> Dict:
+    """슬라이딩 윈도우 SPM 타임라인 (창별 시각, SPM, 음절 수, 음성 비율)"""
+    from services.speech_features import VoicedEnergyIndex, detect_syllable_nuclei, spm_timeline
+
+    energy_index = VoicedEnergyIndex(y, sr)
+    nucleus_times = detect_syllable_nuclei(y, sr, energy_index)
+    timeline = spm_timeline(energy_index, window_seconds, step_seconds, nucleus_times)
+    spm = timeline["spm"]
+
+    points = [
+        {
+            "start_time": round(float(start), 2),
+            "end_time": round(float(end), 2),
+            "spm": round(float(value), 1),
+            "syllables": int(syllables),
+            "voiced_percentage": round(float(voiced), 1)
+        }
+        for start, end, value, voiced, syllables in zip(
+            timeline["start_times"], timeline["end_times"], spm,
+            timeline["voiced_percentage"], timeline["syllables"]
+        )
+    ]
+
+    return {
+        "status": "success",
+        "duration": round(energy_index.total_duration, 2),
+        "window_seconds": window_seconds,
+        "step_seconds": step_seconds,
+        "point_count": len(points),
+        "total_syllables": int(len(nucleus_times)),
+        "summary": {
+            "mean_spm": round(float(spm.mean()), 1) if len(spm) else 0,
+            "min_spm": round(float(spm.min()), 1) if len(spm) else 0,
+            "max_spm": round(float(spm.max()), 1) if len(spm) else 0
+        },
+        "points": points
+    }
+
+
+def analyze_vocal_fatigue(y: np.ndarray, sr: int, segment_count: int = 12, use_stt: bool = False,
+                          bootstrap_resamples: int = 0) -> Dict:
+    """구간별 음성 피로도 분석 (구간 분석, 모델 피팅, 그래프 데이터 계열 생성)"""
+    return _get_vocal_fatigue_service().analyze_samples_12segments(
+        y, sr, user_id=None, save_to_db=False, segment_count=segment_count, use_stt=use_stt,
+        bootstrap_resamples=bootstrap_resamples
+    )
+
+
+def render_fatigue_chart(chart_data: Dict, path: str, fmt: str, dpi: int) -> str:
+    """피로도 그래프를 파일로 렌더링하고 경로 반환"""
+    from services.fatigue_chart import render_chart
+
+    render_chart(chart_data, fmt=fmt, dpi=dpi, path=path)
+    return path
+
+
+def warm_up_analysis(y: np.ndarray, sr: int) -> Dict:
+    """
+    워밍업용 합성 음성으로 음성 구간 검출/음절 핵 검출과 감소 모델 피팅을 한 번 실행
+    지연 임포트(scipy.signal 등)와 필터 설계, 피로도 분석 서비스 생성 비용을 첫 요청 전에 치릅니다.
+    피팅 캐시에 항목이 남지 않도록 피로도 서비스 대신 피팅 엔진을 직접 호출합니다.
+    """
+    from services.fatigue_model import fit_decline_models
+
+    started = time.perf_counter()
+    features = analyze_speech_rate(y, sr)
+    t = np.arange(12, dtype=float)
+    fit_decline_models(t, 240.0 / (1 + 0.5 * 0.05 * t) ** 2)
+    _get_vocal_fatigue_service()
+
+    return {
+        "pid": os.getpid(),
+        "syllables_estimate": features["syllables_estimate"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
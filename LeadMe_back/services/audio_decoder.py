@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+업로드 음성 디코딩 모듈
+업로드 바이트를 16kHz 모노 PCM NumPy 배열로 디코딩합니다.
+- pyav 백엔드: libav를 프로세스 내부에서 직접 사용 (서브프로세스 생성 없음)
+- ffmpeg 백엔드: 업로드 바이트를 ffmpeg 표준입력으로 전달하고 표준출력에서 PCM을 읽음
+디코딩과 동시에 오류/길이/샘플링 레이트/클리핑/무음 비율을 수집하여 검증 리포트를 만듭니다.
+"""
+
+import os
+import io
+import re
+import time
+import wave
+import asyncio
+import logging
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import av
+except ImportError:  # PyAV가 없으면 ffmpeg 서브프로세스 백엔드만 사용
+    av = None
+
+logger = logging.getLogger(__name__)
+
+# 분석 공통 샘플링 레이트 (16kHz 모노)
+TARGET_SAMPLE_RATE = 16000
+
+# 검증 기준
+MIN_DURATION_SECONDS = 0.5      # 최소 길이 (초)
+MAX_SILENCE_RATIO = 0.98        # 이 비율 이상이 무음이면 거부
+CLIPPING_THRESHOLD = 0.99       # 클리핑으로 간주할 진폭
+CLIPPING_WARNING_RATIO = 0.01   # 클리핑 경고 기준 비율
+SILENCE_TOP_DB = 20             # librosa.effects.split(top_db=20)과 동일한 무음 기준
+SILENCE_FRAME_LENGTH = 512      # 무음 판정 프레임 길이 (16kHz 기준 32ms)
+
+# ffmpeg 로그에서 원본 샘플링 레이트 추출 (예: "Audio: aac (LC), 44100 Hz, mono")
+_SOURCE_RATE_PATTERN = re.compile(r"Audio:.*?(\d+) Hz")
+
+
+class AudioDecodeError(Exception):
+    """ffmpeg 디코딩 실패 시 발생하는 예외"""
+
+
+def _build_ffmpeg_command(input_target: str, sample_rate: int) -> list:
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-loglevel", "level+info",  # 각 로그 줄에 [error]/[info] 레벨 접두어 출력
+        "-i", input_target,
+        "-ac", "1",             # mono
+        "-ar", str(sample_rate),
+        "-f", "s16le",          # 16-bit PCM (raw)
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ]
+
+
+def _error_lines(log: str) -> List[str]:
+    return [line.split("]", 1)[-1].strip() for line in log.splitlines()
+            if "[error]" in line or "[fatal]" in line]
+
+
+def _run_ffmpeg(command: list, input_bytes: bytes = None) -> Tuple[bytes, str]:
+    if input_bytes is None:
+        result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    else:
+        result = subprocess.run(command, input=input_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    log = result.stderr.decode("utf-8", errors="ignore")
+    if result.returncode != 0:
+        raise AudioDecodeError("\n".join(_error_lines(log)) or log.strip())
+    return result.stdout, log
+
+
+def decode_audio_bytes(audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE) -> Tuple[np.ndarray, int]:
+    """
+    업로드된 음성 바이트를 float32 모노 PCM 배열로 디코딩합니다.
+
+    Args:
+        audio_data: 업로드 파일 바이트 (wav, mp3, m4a, ogg, mp4)
+        sample_rate: 출력 샘플링 레이트
+
+    Returns:
+        (PCM 배열, 샘플링 레이트) - librosa.load 와 같은 형태
+
+    Raises:
+        AudioDecodeError: 디코딩 실패 시
+    """
+    samples, sample_rate, _ = decode_and_validate(audio_data, sample_rate)
+    return samples, sample_rate
+
+
+def decode_and_validate(audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE,
+                        min_duration: float = MIN_DURATION_SECONDS) -> Tuple[np.ndarray, int, Dict]:
+    """
+    한 번의 ffmpeg 디코딩으로 PCM 배열과 검증 리포트를 함께 생성합니다.
+
+    Args:
+        audio_data: 업로드 파일 바이트
+        sample_rate: 출력 샘플링 레이트
+        min_duration: 허용 최소 길이 (초)
+
+    Returns:
+        (PCM 배열, 샘플링 레이트, 검증 리포트)
+
+    Raises:
+        AudioDecodeError: ffmpeg가 파일을 전혀 읽지 못한 경우
+    """
+    if not audio_data:
+        raise AudioDecodeError("업로드된 오디오 데이터가 비어 있습니다.")
+
+    if _mp4_moov_after_mdat(audio_data):
+        # moov atom이 미디어 데이터 뒤에 있는 m4a/mp4를 파이프로 읽으면 ffmpeg가 "partial file" 오류만
+        # 남기고 빈 출력으로 정상 종료하므로, 이 경우에만 탐색 가능한 임시 파일을 거쳐 디코딩합니다.
+        logger.info("moov atom이 파일 끝에 있어 임시 파일로 디코딩합니다.")
+        pcm_bytes, log = _decode_via_seekable_file(audio_data, sample_rate)
+    else:
+        pcm_bytes, log = _run_ffmpeg(_build_ffmpeg_command("pipe:0", sample_rate), audio_data)
+
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+    report = build_validation_report(samples, sample_rate, _error_lines(log),
+                                      _parse_source_sample_rate(log), min_duration)
+    return samples, sample_rate, report
+
+
+def _mp4_moov_after_mdat(audio_data: bytes) -> bool:
+    """MP4 계열 컨테이너에서 최상위 mdat 박스가 moov 박스보다 먼저 나오는지 확인"""
+    if audio_data[4:8] != b"ftyp":
+        return False
+
+    offset = 0
+    total = len(audio_data)
+    while offset + 8 <= total:
+        size = int.from_bytes(audio_data[offset:offset + 4], "big")
+        box_type = audio_data[offset + 4:offset + 8]
+        if box_type == b"moov":
+            return False
+        if box_type == b"mdat":
+            return True
+        if size == 1:  # 64-bit 크기
+            if offset + 16 > total:
+                break
+            size = int.from_bytes(audio_data[offset + 8:offset + 16], "big")
+        if size < 8:  # size == 0 (파일 끝까지) 또는 손상된 박스
+            break
+        offset += size
+    return False
+
+
+def _parse_source_sample_rate(log: str) -> Optional[int]:
+    match = _SOURCE_RATE_PATTERN.search(log)
+    return int(match.group(1)) if match else None
+
+
+def _silence_ratio(samples: np.ndarray) -> float:
+    """고정 길이 프레임 RMS가 최대치 대비 SILENCE_TOP_DB 이상 낮은 프레임의 비율"""
+    frame_count = len(samples) // SILENCE_FRAME_LENGTH
+    if frame_count == 0:
+        return 1.0
+    frames = samples[:frame_count * SILENCE_FRAME_LENGTH].reshape(frame_count, SILENCE_FRAME_LENGTH)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    peak = rms.max()
+    if peak <= 0:
+        return 1.0
+    threshold = peak * 10 ** (-SILENCE_TOP_DB / 20)
+    return float(np.mean(rms < threshold))
+
+
+def build_validation_report(samples: np.ndarray, sample_rate: int, decode_errors: List[str],
+                            source_sample_rate: Optional[int] = None,
+                            min_duration: float = MIN_DURATION_SECONDS) -> Dict:
+    """
+    디코딩된 PCM으로부터 검증 리포트를 생성합니다.
+
+    Returns:
+        {"is_valid", "error", "warnings", "decode_errors", "duration", "sample_rate",
+         "source_sample_rate", "clipping_ratio", "silence_ratio"}
+    """
+    duration = len(samples) / sample_rate if sample_rate else 0.0
+    clipping_ratio = float(np.mean(np.abs(samples) >= CLIPPING_THRESHOLD)) if len(samples) else 0.0
+    silence_ratio = _silence_ratio(samples)
+
+    error = None
+    if len(samples) == 0:
+        error = "오디오 데이터를 디코딩할 수 없습니다."
+    elif duration < min_duration:
+        error = f"음성 길이가 너무 짧습니다. (최소 {min_duration:g}초, 현재 {duration:.2f}초)"
+    elif silence_ratio >= MAX_SILENCE_RATIO:
+        error = "음성이 감지되지 않습니다. 무음 파일인지 확인해주세요."
+
+    warnings = []
+    if decode_errors:
+        warnings.append(f"디코딩 중 {len(decode_errors)}개의 오류가 발생했습니다.")
+    if clipping_ratio >= CLIPPING_WARNING_RATIO:
+        warnings.append(f"클리핑 비율이 높습니다. ({clipping_ratio * 100:.1f}%)")
+
+    return {
+        "is_valid": error is None,
+        "error": error,
+        "warnings": warnings,
+        "decode_errors": decode_errors,
+        "duration": round(duration, 3),
+        "sample_rate": sample_rate,
+        "source_sample_rate": source_sample_rate,
+        "clipping_ratio": round(clipping_ratio, 4),
+        "silence_ratio": round(silence_ratio, 4),
+    }
+
+
+def _decode_via_seekable_file(audio_data: bytes, sample_rate: int) -> Tuple[bytes, str]:
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+            temp_path = temp_file.name
+            temp_file.write(audio_data)
+        return _run_ffmpeg(_build_ffmpeg_command(temp_path, sample_rate))
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def encode_wav_bytes(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    """
+    float32 PCM 배열을 16-bit WAV 바이트로 인코딩합니다. (STT 전송용, 디스크 사용 없음)
+    """
+    pcm = np.clip(samples, -1.0, 1.0)
+    pcm = (pcm * 32767).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def decode_with_pyav(audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE,
+                     min_duration: float = MIN_DURATION_SECONDS) -> Tuple[np.ndarray, int, Dict]:
+    """
+    PyAV(libav)로 프로세스 내부에서 디코딩합니다. decode_and_validate 와 같은 형태를 반환합니다.
+    BytesIO는 탐색이 가능하므로 moov atom이 파일 끝에 있는 m4a도 임시 파일 없이 처리됩니다.
+    """
+    if av is None:
+        raise AudioDecodeError("PyAV가 설치되어 있지 않습니다.")
+    if not audio_data:
+        raise AudioDecodeError("업로드된 오디오 데이터가 비어 있습니다.")
+
+    try:
+        container = av.open(io.BytesIO(audio_data))
+    except av.error.FFmpegError as e:
+        raise AudioDecodeError(str(e))
+
+    decode_errors = []
+    chunks = []
+    try:
+        audio_streams = [stream for stream in container.streams if stream.type == "audio"]
+        if not audio_streams:
+            raise AudioDecodeError("오디오 스트림을 찾을 수 없습니다.")
+        stream = audio_streams[0]
+        source_sample_rate = stream.codec_context.sample_rate
+
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+        try:
+            for packet in container.demux(stream):
+                try:
+                    for frame in packet.decode():
+                        for resampled in resampler.resample(frame):
+                            chunks.append(resampled.to_ndarray().reshape(-1))
+                except av.error.FFmpegError as e:
+                    # 손상된 패킷은 건너뛰고 오류만 기록 (ffmpeg CLI와 동일한 동작)
+                    decode_errors.append(str(e))
+            for resampled in resampler.resample(None):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        except av.error.FFmpegError as e:
+            # 컨테이너가 중간에 잘리거나 손상된 경우: 이미 디코딩한 구간이 있으면 오류만 기록하고 사용
+            if not chunks:
+                raise AudioDecodeError(str(e))
+            decode_errors.append(str(e))
+    finally:
+        container.close()
+
+    pcm = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+    samples = pcm.astype(np.float32) / 32768.0
+    report = build_validation_report(samples, sample_rate, decode_errors, source_sample_rate, min_duration)
+    return samples, sample_rate, report
+
+
+class AudioDecoderService:
+    """
+    동시 실행 수가 제한된 비동기 디코더 서비스
+    디코딩은 전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(self, backend: str = None, max_concurrency: int = None):
+        """
+        Args:
+            backend: "pyav", "ffmpeg" 또는 "auto" (기본값: AUDIO_DECODER_BACKEND 환경변수, 없으면 auto)
+            max_concurrency: 동시 디코딩 수 (기본값: AUDIO_DECODER_CONCURRENCY 환경변수, 없으면 CPU 수)
+        """
+        backend = backend or os.getenv("AUDIO_DECODER_BACKEND", "auto")
+        if backend == "auto":
+            backend = "pyav" if av is not None else "ffmpeg"
+        if backend == "pyav" and av is None:
+            logger.warning("PyAV가 설치되어 있지 않아 ffmpeg 백엔드를 사용합니다.")
+            backend = "ffmpeg"
+        self.backend = backend
+
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("AUDIO_DECODER_CONCURRENCY", str(os.cpu_count() or 2))
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="audio-decoder")
+        self._semaphore = None
+
+        # 통계
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_decode_seconds = 0.0
+
+    def decode_sync(self, audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE,
+                    min_duration: float = MIN_DURATION_SECONDS) -> Tuple[np.ndarray, int, Dict]:
+        """현재 스레드에서 디코딩 (동기 API)"""
+        if self.backend == "pyav":
+            return decode_with_pyav(audio_data, sample_rate, min_duration)
+        return decode_and_validate(audio_data, sample_rate, min_duration)
+
+    async def decode(self, audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE,
+                     min_duration: float = MIN_DURATION_SECONDS) -> Tuple[np.ndarray, int, Dict]:
+        """
+        업로드 바이트를 비동기로 디코딩합니다. 동시 디코딩 수는 max_concurrency로 제한됩니다.
+
+        Returns:
+            (PCM 배열, 샘플링 레이트, 검증 리포트)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._executor, self.decode_sync, audio_data, sample_rate, min_duration
+                )
+                self.completed += 1
+                return result
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self.total_decode_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict:
+        """디코더 통계"""
+        finished = self.completed + self.failed
+        return {
+            "backend": self.backend,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "average_decode_ms": round(self.total_decode_seconds / finished * 1000, 2) if finished else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+음성 피로도 분석 그래프
+분석 결과에서 그래프용 데이터 계열(chart_data)을 만들고, 이를 PNG/WebP/SVG 파일이나 바이트로 렌더링합니다.
+클라이언트가 직접 그릴 때는 chart_data만 사용하고 서버 렌더링은 생략할 수 있습니다.
+"""
+
+import io
+import os
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.fatigue_model import MODEL_PARAMETER_NAMES, predict_decline
+from services.lazy_imports import lazy_import
+
+logger = logging.getLogger(__name__)
+
+# matplotlib은 그래프를 실제로 렌더링할 때 로드 (chart_data만 만드는 프로세스는 불러오지 않음)
+matplotlib = lazy_import("matplotlib")
+font_manager = lazy_import("matplotlib.font_manager")
+mpl_figure = lazy_import("matplotlib.figure")
+mpl_patches = lazy_import("matplotlib.patches")
+backend_agg = lazy_import("matplotlib.backends.backend_agg")
+
+# 한글 폰트 경로 (첫 렌더링 시 등록)
+font_path = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+_font_prop = None
+
+# 지원 이미지 형식과 기본 해상도
+CHART_FORMATS = ("png", "webp", "svg")
+DEFAULT_CHART_FORMAT = "png"
+DEFAULT_CHART_DPI = 300
+
+# 그래프 저장 디렉토리
+GRAPH_DIR = "static/graphs"
+
+# 모델 곡선 샘플 수
+MODEL_CURVE_POINTS = 100
+
+# 그래프 범례용 감소 모델 이름
+MODEL_LABELS = {
+    "hyperbolic": "하이퍼볼릭",
+    "exponential": "지수",
+    "harmonic": "조화",
+    "linear": "선형"
+}
+
+# 모델 정보 텍스트 박스의 파라미터 이름과 표시 형식
+PARAMETER_LABELS = {
+    "spm0": ("초기 SPM", ".1f"),
+    "decline_index": ("감소 지수", ".4f"),
+    "shape_parameter": ("형태 매개변수", ".2f"),
+    "slope": ("기울기 (SPM/분)", ".2f"),
+    "intercept": ("절편 SPM", ".1f")
+}
+
+# 전기/중기/말기 배경색
+PHASES = (("early", "전기", "lightblue"), ("middle", "중기", "lightgreen"), ("late", "말기", "lightcoral"))
+
+
+def korean_font():
+    """한글 폰트 속성 (첫 호출 시 rcParams 기본 폰트로 등록)"""
+    global _font_prop
+    if _font_prop is None:
+        _font_prop = font_manager.FontProperties(fname=font_path)
+        matplotlib.rcParams['font.family'] = _font_prop.get_name()
+        matplotlib.rcParams['axes.unicode_minus'] = False
+    return _font_prop
+
+
+def build_chart_data(segments: List[Dict], model_result: Optional[Dict], early_spm: float, middle_spm: float,
+                     late_spm: float, overall_spm: float) -> Dict:
+    """
+    그래프 데이터 계열 생성 (JSON 직렬화 가능한 딕셔너리)
+
+    Returns:
+        segment_count, segment_numbers/spm (유효 구간), phases (구간 번호 범위),
+        model_curve (선택된 모델 곡선, 없으면 None), summary,
+        model_info (곡선으로 그린 모델의 selected_model, parameters, r_squared)
+    """
+    segment_count = len(segments)
+    valid_segments = [s for s in segments if s.get("is_valid", False)]
+
+    phase_numbers = np.array_split(np.arange(1, segment_count + 1), 3)
+    phases = [
+        {"key": key, "label": label, "color": color, "start": int(numbers[0]), "end": int(numbers[-1])}
+        for (key, label, color), numbers in zip(PHASES, phase_numbers) if len(numbers)
+    ]
+
+    decline_rate = ((early_spm - late_spm) / early_spm * 100) if early_spm > 0 else 0
+    chart_data = {
+        "segment_count": segment_count,
+        # 키 이름 호환성 확보 (segment_number 또는 segment_num)
+        "segment_numbers": [s.get("segment_number") or s.get("segment_num") for s in valid_segments],
+        "spm": [s["spm"] for s in valid_segments],
+        "phases": phases,
+        "model_curve": None,
+        "summary": {
+            "early_spm": early_spm,
+            "middle_spm": middle_spm,
+            "late_spm": late_spm,
+            "overall_spm": overall_spm,
+            "decline_percent": round(decline_rate, 1),
+            "valid_segments": len(valid_segments),
+            "fatigue_detected": bool(decline_rate > 5)
+        },
+        "model_info": None
+    }
+
+    if model_result and model_result.get("model_fitted") and valid_segments:
+        selection = model_result.get("model_selection", {})
+        model_name = selection.get("selected_model", "hyperbolic")
+        if model_name in selection.get("candidates", {}):
+            candidate = selection["candidates"][model_name]
+            model_parameters, model_r_squared = candidate["parameters"], candidate["r_squared"]
+        else:
+            model_name = "hyperbolic"
+            model_parameters = {key: model_result["parameters"][key] for key in MODEL_PARAMETER_NAMES[model_name]}
+            model_r_squared = model_result["model_quality"]["r_squared"]
+        params = [model_parameters[key] for key in MODEL_PARAMETER_NAMES[model_name]]
+
+        # 모델은 구간 시작 시각(분)으로 피팅되었으므로 구간 번호를 분 단위로 변환하여 계산
+        numbers = chart_data["segment_numbers"]
+        smooth_nums = np.linspace(min(numbers), max(numbers), MODEL_CURVE_POINTS)
+        segment_minutes = segments[-1]["end_time"] / segment_count / 60
+        model_spms = predict_decline(model_name, (smooth_nums - 1) * segment_minutes, params)
+
+        chart_data["model_curve"] = {
+            "model": model_name,
+            "label": f"{MODEL_LABELS.get(model_name, model_name)} 모델",
+            "segment_numbers": np.round(smooth_nums, 3).tolist(),
+            "spm": np.round(model_spms, 2).tolist()
+        }
+        # 곡선으로 그린 모델 자신의 파라미터와 R² (하이퍼볼릭 피팅 결과와 섞지 않음)
+        chart_data["model_info"] = {
+            "selected_model": model_name,
+            "parameters": dict(model_parameters),
+            "r_squared": model_r_squared
+        }
+
+    return chart_data
+
+
+def _summary_text(chart_data: Dict) -> str:
+    """분석 결과 텍스트 박스 내용"""
+    summary = chart_data["summary"]
+    return f'''분석 결과
+    - 전기 평균: {summary["early_spm"]:.1f} SPM
+    - 중기 평균: {summary["middle_spm"]:.1f} SPM
+    - 말기 평균: {summary["late_spm"]:.1f} SPM
+    - 전체 평균: {summary["overall_spm"]:.1f} SPM
+    - 변화율: {summary["decline_percent"]:.1f}%
+    - 유효 구간: {summary["valid_segments"]}/{chart_data["segment_count"]}개
+    - 결과: {"피로 감지됨" if summary["fatigue_detected"] else "안정적 발화"}'''
+
+
+def _model_text(model_info: Dict) -> str:
+    """모델 정보 텍스트 박스 내용 (선택 모델이 가진 파라미터만 표시)"""
+    lines = ["모델 정보"]
+    for key, value in model_info["parameters"].items():
+        label, fmt = PARAMETER_LABELS.get(key, (key, ".4f"))
+        lines.append(f"    - {label}: {value:{fmt}}")
+    lines.append(f'    - R² 값: {model_info["r_squared"]:.3f}')
+    lines.append(f'    - 선택 모델: {MODEL_LABELS.get(model_info["selected_model"], model_info["selected_model"])}')
+    return "\n".join(lines)
+
+
+class FatigueChartTemplate:
+    """
+    재사용 가능한 피로도 그래프 템플릿
+
+    Figure, 축, 구간 배경, 선, 텍스트 박스를 한 번만 만들어 두고 렌더링마다
+    set_data/set_text/set_visible로 값만 바꿉니다.
+    pyplot 상태 머신을 거치지 않는 객체 지향 Figure + Agg 캔버스를 사용하며 스레드 안전하지 않으므로
+    render_chart()가 잠금으로 보호합니다.
+    """
+
+    def __init__(self):
+        font_prop = korean_font()
+        self.figure = mpl_figure.Figure(figsize=(14, 8))
+        backend_agg.FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot()
+
+        # 전기/중기/말기 구간 배경 (x는 데이터 좌표, y는 축 좌표)
+        self.phase_patches = []
+        for _, _, color in PHASES:
+            patch = mpl_patches.Rectangle((0, 0), 0, 1, transform=ax.get_xaxis_transform(), alpha=0.15, color=color)
+            ax.add_patch(patch)
+            self.phase_patches.append(patch)
+
+        # SPM 데이터 선과 모델 곡선
+        self.observed_line, = ax.plot([], [], 'bo-', markersize=8, linewidth=3,
+                                      label='관측된 SPM', markerfacecolor='lightblue', markeredgecolor='blue')
+        self.model_line, = ax.plot([], [], 'r--', linewidth=2, alpha=0.7)
+
+        # 제목 및 라벨 (한글)
+        self.title = ax.set_title('', fontsize=18, fontweight='bold', pad=20, fontproperties=font_prop)
+        ax.set_xlabel('구간 번호', fontsize=14, fontproperties=font_prop)
+        ax.set_ylabel('SPM (음절/분)', fontsize=14, fontproperties=font_prop)
+        ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+
+        # 분석 결과 텍스트 박스 (좌상단)와 모델 정보 (우하단)
+        self.summary_text = ax.text(
+            0.02, 0.98, '', transform=ax.transAxes, fontsize=11, verticalalignment='top',
+            bbox=dict(boxstyle='round,pad=0.8', facecolor='wheat', alpha=0.9, edgecolor='gray'),
+            fontproperties=font_prop
+        )
+        self.model_text = ax.text(
+            0.98, 0.02, '', transform=ax.transAxes, fontsize=9, verticalalignment='bottom',
+            horizontalalignment='right', bbox=dict(boxstyle='round,pad=0.5', facecolor='lightblue', alpha=0.8),
+            fontproperties=font_prop
+        )
+
+        # 범례와 레이아웃은 구간 수나 범례 항목이 바뀔 때만 다시 계산
+        self._legend_key = None
+        self._layout_key = None
+
+    def update(self, chart_data: Dict) -> None:
+        """chart_data 값으로 그래프 요소 갱신"""
+        ax = self.ax
+        segment_count = chart_data["segment_count"]
+        all_spms = chart_data["spm"]
+
+        # 구간 배경
+        phase_labels = []
+        for patch, phase in zip(self.phase_patches, chart_data["phases"] + [None] * len(PHASES)):
+            patch.set_visible(phase is not None)
+            if phase is not None:
+                patch.set_x(phase["start"] - 0.5)
+                patch.set_width(phase["end"] - phase["start"] + 1)
+                patch.set_label(f'{phase["label"]} 구간 ({phase["start"]}-{phase["end"]})')
+                phase_labels.append(patch.get_label())
+
+        # SPM 데이터와 모델 곡선
+        self.observed_line.set_data(chart_data["segment_numbers"], all_spms)
+        model_curve = chart_data.get("model_curve")
+        self.model_line.set_visible(bool(model_curve))
+        if model_curve:
+            self.model_line.set_data(model_curve["segment_numbers"], model_curve["spm"])
+            self.model_line.set_label(model_curve["label"])
+
+        # 축 설정 (Y축 범위는 데이터에 맞게 조정)
+        self.title.set_text(f'{segment_count}구간별 SPM 변화 분석')
+        ax.set_ylim(max(0, min(all_spms) - 10), max(all_spms) + 10)
+
+        # 텍스트 박스
+        self.summary_text.set_text(_summary_text(chart_data))
+        model_info = chart_data.get("model_info")
+        self.model_text.set_visible(bool(model_info))
+        if model_info:
+            self.model_text.set_text(_model_text(model_info))
+
+        # 범례 (항목이 바뀐 경우에만 다시 생성)
+        legend_key = (tuple(phase_labels), model_curve["label"] if model_curve else None)
+        if legend_key != self._legend_key:
+            handles = [patch for patch in self.phase_patches if patch.get_visible()] + [self.observed_line]
+            if model_curve:
+                handles.append(self.model_line)
+            ax.legend(handles=handles, loc='upper right', fontsize=10)
+            self._legend_key = legend_key
+
+        # 구간 수가 바뀌면 눈금과 레이아웃 다시 계산
+        if segment_count != self._layout_key:
+            ax.set_xlim(0.5, segment_count + 0.5)
+            ax.set_xticks(range(1, segment_count + 1))
+            self.figure.tight_layout()
+            self._layout_key = segment_count
+
+    def save(self, target, fmt: str, dpi: int) -> None:
+        self.figure.savefig(target, format=fmt, dpi=dpi, bbox_inches='tight', facecolor='white', edgecolor='none')
+
+
+# 프로세스(렌더링 워커)마다 하나씩 생성되는 그래프 템플릿
+_chart_template: Optional[FatigueChartTemplate] = None
+_chart_template_lock = threading.Lock()
+
+
+def prepare_chart_template() -> FatigueChartTemplate:
+    """현재 프로세스의 그래프 템플릿 생성 (렌더링 워커 시작 시 미리 호출하여 첫 요청 비용 제거)"""
+    global _chart_template
+    with _chart_template_lock:
+        if _chart_template is None:
+            _chart_template = FatigueChartTemplate()
+        return _chart_template
+
+
+def render_chart(chart_data: Dict, fmt: str = DEFAULT_CHART_FORMAT, dpi: int = DEFAULT_CHART_DPI,
+                 path: Optional[str] = None) -> Optional[bytes]:
+    """
+    chart_data를 이미지로 렌더링 (프로세스별 FatigueChartTemplate 재사용)
+
+    Args:
+        chart_data: build_chart_data 결과
+        fmt: 이미지 형식 (png, webp, svg)
+        dpi: 해상도 (svg는 텍스트 크기 기준으로만 사용)
+        path: 저장 경로 (지정하면 임시 파일에 쓴 뒤 교체하고 None 반환, 생략하면 이미지 바이트 반환)
+    """
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"지원하지 않는 그래프 형식입니다: {fmt}")
+    if not chart_data["segment_numbers"]:
+        raise ValueError("유효한 구간이 없습니다.")
+
+    template = prepare_chart_template()
+    with _chart_template_lock:
+        template.update(chart_data)
+
+        if path is None:
+            buffer = io.BytesIO()
+            template.save(buffer, fmt, dpi)
+            return buffer.getvalue()
+
+        # 렌더링 도중 파일을 읽는 요청이 깨진 이미지를 받지 않도록 임시 파일에 쓴 뒤 교체
+        # (여러 렌더링 워커가 같은 경로에 동시에 쓸 수 있으므로 임시 파일은 프로세스별로 분리)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        template.save(temp_path, fmt, dpi)
+        os.replace(temp_path, path)
+        return None
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+음성 피로도 분석 기록 저장소
+분석 결과(모델 파라미터, 품질, 구간별 SPM)를 vocal_fatigue_analysis 테이블에 저장하여
+재업로드나 재분석 없이 피로도 추이를 조회할 수 있도록 합니다.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from services.fatigue_chart import build_chart_data
+
+logger = logging.getLogger(__name__)
+
+# 구간별 SPM 직렬화 형식 (구간당 4바이트)
+SEGMENT_SPM_DTYPE = np.dtype("<f4")
+
+
+def encode_segment_spms(segments: List[Dict]) -> bytes:
+    """구간별 SPM을 float32 바이트로 직렬화 (유효하지 않은 구간은 NaN)"""
+    values = [s["spm"] if s.get("is_valid") else np.nan for s in segments]
+    return np.asarray(values, dtype=SEGMENT_SPM_DTYPE).tobytes()
+
+
+def decode_segment_spms(blob: bytes) -> np.ndarray:
+    """encode_segment_spms로 저장한 바이트를 float32 배열로 복원"""
+    return np.frombuffer(blob, dtype=SEGMENT_SPM_DTYPE)
+
+
+def save_fatigue_analysis(db: Session, user_id: str, analysis_result: Dict, filename: Optional[str] = None,
+                          graph_url: Optional[str] = None, job_id: Optional[str] = None,
+                          graph_status: Optional[str] = None) -> models.VocalFatigueAnalysis:
+    """
+    피로도 분석 결과 저장
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+        analysis_result: VocalFatigueAnalysisService 분석 결과 (status == "success")
+        filename: 업로드 파일 이름
+        graph_url: 저장된 그래프 이미지 URL
+        job_id: 비동기 작업 ID
+        graph_status: 그래프 렌더링 상태
+
+    Returns:
+        저장된 기록
+    """
+    audio_info = analysis_result["audio_info"]
+    spm_analysis = analysis_result["spm_analysis"]
+    parameters = analysis_result.get("parameters") if analysis_result.get("model_fitted") else None
+    model_quality = analysis_result.get("model_quality") or {}
+    model_selection = analysis_result.get("model_selection") or {}
+    selected = model_selection.get("candidates", {}).get(model_selection.get("selected_model")) if parameters else None
+
+    record = models.VocalFatigueAnalysis(
+        user_id=user_id,
+        job_id=job_id,
+        filename=filename,
+        total_duration=float(audio_info["total_duration"]),
+        segment_count=int(audio_info["segment_count"]),
+        valid_segments=int(audio_info["valid_segments"]),
+        early_spm=float(spm_analysis["early_spm"]),
+        middle_spm=float(spm_analysis["middle_spm"]),
+        late_spm=float(spm_analysis["late_spm"]),
+        overall_spm=float(spm_analysis["overall_spm"]),
+        decline_percent=float(spm_analysis["decline_early_to_late"]),
+        spm0=parameters["spm0"] if parameters else None,
+        decline_index=parameters["decline_index"] if parameters else None,
+        shape_parameter=parameters["shape_parameter"] if parameters else None,
+        r_squared=model_quality.get("r_squared") if parameters else None,
+        selected_model=model_selection.get("selected_model"),
+        selected_parameters=json.dumps(selected["parameters"]) if selected else None,
+        selected_r_squared=selected["r_squared"] if selected else None,
+        segment_spms=encode_segment_spms(analysis_result["segments"]),
+        graph_url=graph_url,
+        graph_status=graph_status
+    )
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return record
+
+
+def set_graph(db: Session, analysis_id: int, graph_url: Optional[str], graph_status: str) -> None:
+    """저장된 기록의 그래프 이미지 URL과 렌더링 상태 갱신"""
+    db.query(models.VocalFatigueAnalysis).filter(
+        models.VocalFatigueAnalysis.analysis_id == analysis_id
+    ).update({"graph_url": graph_url, "graph_status": graph_status})
+    db.commit()
+
+
+def finish_graph_render(analysis_id: int, rendered: bool) -> None:
+    """
+    백그라운드 렌더링 결과 기록 (자체 세션 사용)
+    실패하면 존재하지 않는 이미지를 가리키지 않도록 graph_url을 비웁니다.
+    """
+    fields = {"graph_status": "ready"} if rendered else {"graph_status": "failed", "graph_url": None}
+    db = SessionLocal()
+    try:
+        db.query(models.VocalFatigueAnalysis).filter(
+            models.VocalFatigueAnalysis.analysis_id == analysis_id
+        ).update(fields)
+        db.commit()
+    finally:
+        db.close()
+
+
+def list_user_analyses(db: Session, user_id: str, skip: int = 0, limit: int = 50,
+                       since: Optional[datetime] = None) -> List[models.VocalFatigueAnalysis]:
+    """사용자의 피로도 분석 기록 (최신순, (user_id, created_at) 인덱스 사용)"""
+    query = db.query(models.VocalFatigueAnalysis).filter(models.VocalFatigueAnalysis.user_id == user_id)
+    if since is not None:
+        query = query.filter(models.VocalFatigueAnalysis.created_at >= since)
+    return query.order_by(models.VocalFatigueAnalysis.created_at.desc()).offset(skip).limit(limit).all()
+
+
+def get_user_analysis(db: Session, analysis_id: int, user_id: str) -> Optional[models.VocalFatigueAnalysis]:
+    """사용자 소유의 피로도 분석 기록 조회"""
+    return db.query(models.VocalFatigueAnalysis).filter(
+        models.VocalFatigueAnalysis.analysis_id == analysis_id,
+        models.VocalFatigueAnalysis.user_id == user_id
+    ).first()
+
+
+def chart_data_for(record: models.VocalFatigueAnalysis) -> Dict:
+    """
+    저장된 기록으로 그래프 데이터 계열 재구성 (services.fatigue_chart.build_chart_data)
+    선택 모델의 파라미터가 저장되어 있으면 그 모델의 곡선을, 없으면(이전 기록) 하이퍼볼릭 곡선을 그립니다.
+    """
+    segment_seconds = record.total_duration / record.segment_count
+    segments = [
+        {
+            "segment_number": index + 1,
+            "start_time": index * segment_seconds,
+            "end_time": (index + 1) * segment_seconds,
+            "spm": 0 if np.isnan(value) else float(value),
+            "is_valid": not np.isnan(value)
+        }
+        for index, value in enumerate(decode_segment_spms(record.segment_spms))
+    ]
+
+    model_result = None
+    if record.spm0 is not None:
+        model_result = {
+            "model_fitted": True,
+            "parameters": {
+                "spm0": record.spm0,
+                "decline_index": record.decline_index,
+                "shape_parameter": record.shape_parameter
+            },
+            "model_quality": {"r_squared": record.r_squared}
+        }
+        if record.selected_model and record.selected_parameters:
+            model_result["model_selection"] = {
+                "selected_model": record.selected_model,
+                "candidates": {
+                    record.selected_model: {
+                        "parameters": json.loads(record.selected_parameters),
+                        "r_squared": record.selected_r_squared
+                    }
+                }
+            }
+
+    chart_data = build_chart_data(segments, model_result, record.early_spm, record.middle_spm,
+                                  record.late_spm, record.overall_spm)
+    chart_data["analysis_id"] = record.analysis_id
+    return chart_data
+
+
+def serialize_analysis(record: models.VocalFatigueAnalysis, include_segments: bool = True) -> Dict:
+    """기록 응답 딕셔너리 생성 (구간별 SPM 복원 포함, NaN은 None)"""
+    result = {
+        "analysis_id": record.analysis_id,
+        "job_id": record.job_id,
+        "filename": record.filename,
+        "total_duration": record.total_duration,
+        "segment_count": record.segment_count,
+        "valid_segments": record.valid_segments,
+        "spm_analysis": {
+            "early_spm": record.early_spm,
+            "middle_spm": record.middle_spm,
+            "late_spm": record.late_spm,
+            "overall_spm": record.overall_spm,
+            "decline_early_to_late": record.decline_percent
+        },
+        "model_parameters": {
+            "spm0": record.spm0,
+            "decline_index": record.decline_index,
+            "shape_parameter": record.shape_parameter
+        } if record.spm0 is not None else None,
+        "r_squared": record.r_squared,
+        "selected_model": record.selected_model,
+        "selected_parameters": json.loads(record.selected_parameters) if record.selected_parameters else None,
+        "selected_r_squared": record.selected_r_squared,
+        "graph_url": record.graph_url,
+        "graph_status": record.graph_status,
+        "created_at": record.created_at
+    }
+    if include_segments:
+        result["segment_spms"] = [
+            None if np.isnan(value) else round(float(value), 1) for value in decode_segment_spms(record.segment_spms)
+        ]
+    return result
@@ -0,0 +1,641 @@
+# -*- coding: utf-8 -*-
+"""
+하이퍼볼릭 음성 피로 모델
+SPM(t) = SPM₀ / (1 + b·Di·t)^(1/b)  (t: 분 단위)
+
+모델 함수와 해석적 야코비안, 경계 제약 Levenberg-Marquardt 최적화, 격자 탐색 초기화,
+여러 곡선을 한 번에 피팅하는 배치 피터, 실시간 세션용 온라인 추정기를 제공합니다.
+하이퍼볼릭/지수/조화/선형 감소 모델을 한 번에 피팅하고 AIC/BIC로 선택하는 통합 엔진(fit_decline_models)도 포함합니다.
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 파라미터 순서: (spm0, di, b)
+PARAM_LOWER = np.array([50.0, 0.001, 0.1])
+PARAM_UPPER = np.array([500.0, 1.0, 5.0])
+
+# 모델 피팅에 필요한 최소 유효 구간 수
+MIN_FIT_POINTS = 4
+
+# 초기 대비 감소율이 이 값(%)을 넘으면 피로로 판단
+FATIGUE_DECLINE_THRESHOLD = 5.0
+
+# 초기값 격자 (b는 0.1~1.0, Di는 경계 전체를 로그 간격으로 탐색, SPM₀는 닫힌 형태로 계산)
+GRID_SHAPES = np.linspace(0.1, 1.0, 10)
+GRID_DECLINES = np.geomspace(PARAM_LOWER[1], PARAM_UPPER[1], 25)
+
+
+def hyperbolic_decline(t: np.ndarray, spm0: float, di: float, b: float) -> np.ndarray:
+    """하이퍼볼릭 감소 모델 값"""
+    denominator = np.maximum(1 + b * di * t, 1e-10)
+    return spm0 / (denominator ** (1 / b))
+
+
+def hyperbolic_jacobian(t: np.ndarray, spm0: float, di: float, b: float) -> np.ndarray:
+    """
+    모델의 해석적 야코비안 (t.shape + (3,))
+    파라미터를 (M, 1) 배열로 넘기면 M개 곡선의 야코비안을 한 번에 계산합니다.
+
+    u = 1 + b·Di·t 일 때
+        ∂f/∂SPM₀ = u^(-1/b)
+        ∂f/∂Di   = -SPM₀·t·u^(-1/b - 1)
+        ∂f/∂b    = SPM₀·u^(-1/b)·(ln(u)/b² - Di·t/(b·u))
+    """
+    u = np.maximum(1 + b * di * t, 1e-10)
+    base = u ** (-1 / b)
+    return np.stack(np.broadcast_arrays(
+        base,
+        -spm0 * t * base / u,
+        spm0 * base * (np.log(u) / b ** 2 - di * t / (b * u))
+    ), axis=-1)
+
+
+def clip_parameters(params) -> np.ndarray:
+    """파라미터를 경계 안으로 제한"""
+    return np.clip(np.asarray(params, dtype=np.float64), PARAM_LOWER, PARAM_UPPER)
+
+
+def levenberg_marquardt(t: np.ndarray, y: np.ndarray, p0, max_iterations: int = 50,
+                        tolerance: float = 1e-6, damping: float = 1e-3,
+                        model=hyperbolic_decline, jacobian=hyperbolic_jacobian,
+                        lower: np.ndarray = PARAM_LOWER, upper: np.ndarray = PARAM_UPPER) -> Dict:
+    """
+    경계 제약 Levenberg-Marquardt 최적화
+
+    경계에 닿은 파라미터 중 기울기가 경계 밖을 향하는 것은 해당 반복에서 고정하고(active set)
+    나머지 파라미터만으로 감쇠 정규방정식을 풉니다.
+    model/jacobian/lower/upper를 바꾸면 다른 감소 모델(지수, 조화)에도 같은 최적화기를 사용합니다.
+
+    Args:
+        t: 시간 배열 (분)
+        y: 관측 SPM 배열
+        p0: 초기 파라미터 (기본 모델은 spm0, di, b)
+        max_iterations: 최대 반복 횟수
+        tolerance: 상대 비용 감소량 또는 상대 이동량이 이보다 작으면 수렴으로 판단
+        damping: 초기 감쇠 계수 λ
+        model: 모델 함수 f(t, *params)
+        jacobian: 해석적 야코비안 J(t, *params) (t.shape + (파라미터 수,))
+        lower: 파라미터 하한
+        upper: 파라미터 상한
+
+    Returns:
+        params, sse, iterations, converged, damping (다음 호출 시 이어서 사용할 λ)
+    """
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    params = np.clip(np.asarray(p0, dtype=np.float64), lower, upper)
+    residual = y - model(t, *params)
+    cost = float(residual @ residual)
+
+    iterations = 0
+    converged = False
+    for iterations in range(1, max_iterations + 1):
+        jac = jacobian(t, *params)
+        normal = jac.T @ jac
+        gradient = jac.T @ residual
+
+        # 경계에서 바깥으로 나가려는 파라미터는 고정
+        blocked = ((params <= lower) & (gradient < 0)) | ((params >= upper) & (gradient > 0))
+        free = ~blocked
+        if not free.any():
+            converged = True
+            break
+        reduced_normal = normal[np.ix_(free, free)]
+        reduced_gradient = gradient[free]
+        scale = np.diag(np.diag(reduced_normal) + 1e-12)
+
+        # 비용이 줄어드는 λ를 찾을 때까지 감쇠 증가
+        improved = False
+        for _ in range(10):
+            try:
+                reduced_step = np.linalg.solve(reduced_normal + damping * scale, reduced_gradient)
+            except np.linalg.LinAlgError:
+                damping *= 10
+                continue
+            step = np.zeros(len(params))
+            step[free] = reduced_step
+            candidate = np.clip(params + step, lower, upper)
+            candidate_residual = y - model(t, *candidate)
+            candidate_cost = float(candidate_residual @ candidate_residual)
+            if candidate_cost < cost:
+                improved = True
+                damping = max(damping / 10, 1e-12)
+                break
+            damping *= 10
+
+        if not improved:
+            converged = True
+            break
+
+        relative_decrease = (cost - candidate_cost) / max(cost, 1e-12)
+        relative_move = np.max(np.abs(candidate - params) / (np.abs(params) + 1e-12))
+        params, residual, cost = candidate, candidate_residual, candidate_cost
+        if relative_decrease < tolerance or relative_move < tolerance:
+            converged = True
+            break
+
+    return {
+        "params": params,
+        "sse": cost,
+        "iterations": iterations,
+        "converged": converged,
+        "damping": damping
+    }
+
+
+def grid_initial_guess(t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    (b, Di) 격자 전체를 한 번에 평가하여 SSE가 가장 작은 초기 파라미터 선택
+
+    b와 Di가 정해지면 모델은 SPM₀에 대해 선형이므로
+    g = (1 + b·Di·t)^(-1/b) 일 때 SPM₀ = Σ g·y / Σ g² 로 바로 계산합니다.
+    """
+    spm0, sse = _grid_search(np.asarray(t, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    b_index, di_index = np.unravel_index(np.argmin(sse), sse.shape)
+    return np.array([spm0[b_index, di_index], GRID_DECLINES[di_index], GRID_SHAPES[b_index]])
+
+
+def _grid_search(t: np.ndarray, y: np.ndarray):
+    """(b, Di) 격자 각 점의 최적 SPM₀와 SSE ((B, D) 배열 두 개)"""
+    shapes = GRID_SHAPES[:, None, None]
+    declines = GRID_DECLINES[None, :, None]
+
+    basis = np.maximum(1 + shapes * declines * t, 1e-10) ** (-1 / shapes)      # (B, D, N)
+    spm0 = np.clip((basis @ y) / np.sum(basis ** 2, axis=-1), PARAM_LOWER[0], PARAM_UPPER[0])
+    sse = np.sum((y - spm0[..., None] * basis) ** 2, axis=-1)
+    return spm0, sse
+
+
+def _batch_grid_initial_guess(t: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """grid_initial_guess의 배치 버전 (곡선별 시간축과 유효 마스크 지원)"""
+    shapes = np.repeat(GRID_SHAPES, len(GRID_DECLINES))
+    declines = np.tile(GRID_DECLINES, len(GRID_SHAPES))
+    weights = mask.astype(np.float64)
+
+    basis = np.maximum(1 + shapes[None, :, None] * declines[None, :, None] * t[:, None, :], 1e-10) \
+        ** (-1 / shapes[None, :, None])                                               # (M, K, N)
+    cross = np.einsum("mkn,mn->mk", basis, weights * y)
+    energy = np.einsum("mkn,mn->mk", basis ** 2, weights)
+    spm0 = np.clip(cross / np.maximum(energy, 1e-12), PARAM_LOWER[0], PARAM_UPPER[0])
+    # SSE = Σy² - 2·SPM₀·Σgy + SPM₀²·Σg²  (유효 점만)
+    sse = np.sum(weights * y ** 2, axis=1)[:, None] - 2 * spm0 * cross + spm0 ** 2 * energy
+
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(len(best))
+    return np.column_stack((spm0[rows, best], declines[best], shapes[best]))
+
+
+def fit_hyperbolic_batch(t: np.ndarray, curves: np.ndarray, mask: Optional[np.ndarray] = None,
+                         max_iterations: int = 100, tolerance: float = 1e-6,
+                         chunk_size: int = 4096, initial_params: Optional[np.ndarray] = None) -> Dict:
+    """
+    여러 SPM 곡선을 한 번에 피팅하는 배치 Levenberg-Marquardt
+
+    단일 곡선 피팅(fit_decline_models의 하이퍼볼릭 모델)과 같은 모델/야코비안/경계/격자 초기화를 사용하되,
+    모든 곡선의 정규방정식을 (M, 3, 3) 배열로 만들어 한 번에 풉니다.
+    곡선마다 감쇠 계수와 수렴 여부를 따로 관리하며, 수렴한 곡선은 더 이상 갱신하지 않습니다.
+
+    Args:
+        t: 시간(분). 모든 곡선 공통이면 (N,), 곡선별이면 (M, N)
+        curves: SPM 배열 (M, N)
+        mask: 유효 점 마스크 (M, N). 없으면 NaN이 아닌 점 전체
+        max_iterations: 최대 반복 횟수 (거절된 시도 포함)
+        tolerance: 상대 비용 감소량 또는 상대 이동량 수렴 기준
+        chunk_size: 메모리 사용량 제한을 위한 곡선 묶음 크기
+        initial_params: 초기 파라미터 (3,) 또는 (M, 3). 주면 격자 초기화를 건너뜀 (warm start)
+
+    Returns:
+        params (M, 3), r_squared, rmse, sse, iterations, converged, n_points, fitted (M,), wall_time_ms
+    """
+    started = time.perf_counter()
+    curves = np.atleast_2d(np.asarray(curves, dtype=np.float64))
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), curves.shape)
+    valid = ~np.isnan(curves) if mask is None else (np.asarray(mask, dtype=bool) & ~np.isnan(curves))
+    if initial_params is not None:
+        initial_params = np.broadcast_to(np.asarray(initial_params, dtype=np.float64), (len(curves), 3))
+
+    results = [
+        _fit_batch_chunk(t[i:i + chunk_size], curves[i:i + chunk_size], valid[i:i + chunk_size],
+                         max_iterations, tolerance,
+                         None if initial_params is None else initial_params[i:i + chunk_size])
+        for i in range(0, len(curves), chunk_size)
+    ]
+    merged = {key: np.concatenate([r[key] for r in results]) for key in results[0]} if results else {}
+    merged["wall_time_ms"] = (time.perf_counter() - started) * 1000
+    return merged
+
+
+def _fit_batch_chunk(t: np.ndarray, curves: np.ndarray, valid: np.ndarray,
+                     max_iterations: int, tolerance: float, initial_params: Optional[np.ndarray]) -> Dict:
+    y = np.where(valid, curves, 0.0)
+    weights = valid.astype(np.float64)
+    n_points = valid.sum(axis=1)
+    fitted = n_points >= MIN_FIT_POINTS
+    count = len(y)
+
+    def model(params):
+        return hyperbolic_decline(t, params[:, :1], params[:, 1:2], params[:, 2:])
+
+    def weighted_cost(params):
+        residual = (y - model(params)) * weights
+        return residual, np.sum(residual ** 2, axis=1)
+
+    if initial_params is None:
+        initial_params = _batch_grid_initial_guess(t, y, valid)
+    params = clip_parameters(initial_params)
+    residual, cost = weighted_cost(params)
+    damping = np.full(count, 1e-3)
+    active = fitted.copy()
+    iterations = np.zeros(count, dtype=np.int64)
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        index = np.flatnonzero(active)
+        p = params[index]
+        jacobian = hyperbolic_jacobian(t[index], p[:, :1], p[:, 1:2], p[:, 2:]) * weights[index][..., None]
+        normal = np.einsum("mni,mnj->mij", jacobian, jacobian)
+        gradient = np.einsum("mni,mn->mi", jacobian, residual[index])
+
+        # 경계 밖을 향하는 파라미터는 단위 행렬/0 기울기로 바꿔 이동량을 0으로 고정
+        blocked = ((p <= PARAM_LOWER) & (gradient < 0)) | ((p >= PARAM_UPPER) & (gradient > 0))
+        diagonal = np.einsum("mii->mi", normal) + 1e-12
+        system = normal * ~(blocked[:, :, None] | blocked[:, None, :])
+        system = system + np.einsum("mi,ij->mij", np.where(blocked, 1.0, damping[index, None] * diagonal), np.eye(3))
+        step = np.linalg.solve(system, np.where(blocked, 0.0, gradient)[..., None])[..., 0]
+
+        candidate = clip_parameters(p + step)
+        candidate_residual = (y[index] - hyperbolic_decline(
+            t[index], candidate[:, :1], candidate[:, 1:2], candidate[:, 2:])) * weights[index]
+        candidate_cost = np.sum(candidate_residual ** 2, axis=1)
+
+        improved = candidate_cost < cost[index]
+        relative_decrease = (cost[index] - candidate_cost) / np.maximum(cost[index], 1e-12)
+        relative_move = np.max(np.abs(candidate - p) / (np.abs(p) + 1e-12), axis=1)
+        iterations[index] += 1
+
+        accepted = index[improved]
+        params[accepted] = candidate[improved]
+        residual[accepted] = candidate_residual[improved]
+        cost[accepted] = candidate_cost[improved]
+        damping[index] = np.where(improved, np.maximum(damping[index] / 10, 1e-12), damping[index] * 10)
+
+        # 수렴: 개선 폭이 작거나, 감쇠가 너무 커져 더 이상 개선할 수 없는 경우
+        done = (improved & ((relative_decrease < tolerance) | (relative_move < tolerance))) | \
+               (~improved & (damping[index] > 1e10))
+        active[index[done]] = False
+
+    mean = np.sum(weights * y, axis=1) / np.maximum(n_points, 1)
+    ss_tot = np.sum(weights * (y - mean[:, None]) ** 2, axis=1)
+    r2 = np.where(ss_tot > 0, 1 - cost / np.where(ss_tot > 0, ss_tot, 1), 0.0)
+    rmse = np.sqrt(cost / np.maximum(n_points, 1))
+
+    nan = np.full(count, np.nan)
+    return {
+        "params": np.where(fitted[:, None], params, np.nan),
+        "r_squared": np.where(fitted, r2, nan),
+        "rmse": np.where(fitted, rmse, nan),
+        "sse": np.where(fitted, cost, nan),
+        "iterations": iterations,
+        "converged": fitted & ~active,
+        "n_points": n_points,
+        "fitted": fitted
+    }
+
+
+def bootstrap_confidence_intervals(t: np.ndarray, y: np.ndarray, params: np.ndarray,
+                                  resamples: int = 1000, confidence: float = 0.95,
+                                  seed: Optional[int] = None) -> Dict:
+    """
+    잔차 부트스트랩 파라미터 신뢰구간
+
+    적합값에 (자유도 보정한) 잔차를 복원 추출로 더한 resamples개의 곡선을 만들고,
+    fit_hyperbolic_batch로 한 번에 피팅한 뒤(점추정값에서 warm start) 백분위수 구간을 계산합니다.
+
+    Args:
+        t: 시간 배열 (분)
+        y: 관측 SPM 배열
+        params: 점추정 파라미터 (spm0, di, b)
+        resamples: 부트스트랩 반복 수
+        confidence: 신뢰수준
+        seed: 난수 시드
+
+    Returns:
+        파라미터별 lower/upper, 반복 수, 수렴 비율, 소요 시간
+    """
+    started = time.perf_counter()
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    params = np.asarray(params, dtype=np.float64)
+
+    fitted = hyperbolic_decline(t, *params)
+    residuals = y - fitted
+    dof = max(len(y) - len(params), 1)
+    residuals = (residuals - residuals.mean()) * np.sqrt(len(y) / dof)
+
+    rng = np.random.default_rng(seed)
+    samples = fitted + residuals[rng.integers(0, len(y), size=(resamples, len(y)))]
+    batch = fit_hyperbolic_batch(t, samples, initial_params=params)
+
+    converged = batch["converged"]
+    estimates = batch["params"][converged]
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(estimates, [alpha, 1 - alpha], axis=0) if len(estimates) else (params, params)
+
+    intervals = {}
+    for index, (name, digits) in enumerate((("spm0", 2), ("decline_index", 4), ("shape_parameter", 2))):
+        intervals[name] = {
+            "lower": round(float(lower[index]), digits),
+            "upper": round(float(upper[index]), digits)
+        }
+
+    return {
+        "method": "residual_bootstrap",
+        "confidence": confidence,
+        "resamples": resamples,
+        "converged_ratio": round(float(converged.mean()), 3),
+        "intervals": intervals,
+        "wall_time_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def r_squared(y: np.ndarray, predicted: np.ndarray) -> float:
+    """결정계수 R²"""
+    ss_res = np.sum((y - predicted) ** 2)
+    ss_tot = np.sum((y - np.mean(y)) ** 2)
+    return float(1 - ss_res / ss_tot) if ss_tot > 0 else 0.0
+
+
+# ---------------------------------------------------------------------------
+# 통합 감소 모델 엔진
+# ---------------------------------------------------------------------------
+
+# 지원하는 감소 모델 (하이퍼볼릭: b 자유, 조화: b = 1, 지수: b → 0, 선형: a·t + c)
+DECLINE_MODELS = ("hyperbolic", "exponential", "harmonic", "linear")
+
+# 모델 선택 기준
+SELECTION_CRITERIA = ("aic", "bic")
+DEFAULT_SELECTION_CRITERION = "bic"
+
+# 2-파라미터 모델(지수, 조화)의 (spm0, di) 경계
+DECLINE_LOWER = PARAM_LOWER[:2]
+DECLINE_UPPER = PARAM_UPPER[:2]
+
+# 모델별 파라미터 이름 (응답 딕셔너리 키)
+MODEL_PARAMETER_NAMES = {
+    "hyperbolic": ("spm0", "decline_index", "shape_parameter"),
+    "exponential": ("spm0", "decline_index"),
+    "harmonic": ("spm0", "decline_index"),
+    "linear": ("slope", "intercept")
+}
+
+
+def exponential_decline(t: np.ndarray, spm0: float, di: float) -> np.ndarray:
+    """지수 감소 모델 SPM(t) = SPM₀·e^(-Di·t)"""
+    return spm0 * np.exp(-di * t)
+
+
+def exponential_jacobian(t: np.ndarray, spm0: float, di: float) -> np.ndarray:
+    """지수 모델의 해석적 야코비안 (t.shape + (2,))"""
+    base = np.exp(-di * t)
+    return np.stack(np.broadcast_arrays(base, -spm0 * t * base), axis=-1)
+
+
+def harmonic_decline(t: np.ndarray, spm0: float, di: float) -> np.ndarray:
+    """조화 감소 모델 SPM(t) = SPM₀ / (1 + Di·t)  (하이퍼볼릭 모델의 b = 1)"""
+    return spm0 / np.maximum(1 + di * t, 1e-10)
+
+
+def harmonic_jacobian(t: np.ndarray, spm0: float, di: float) -> np.ndarray:
+    """조화 모델의 해석적 야코비안 (t.shape + (2,))"""
+    u = np.maximum(1 + di * t, 1e-10)
+    return np.stack(np.broadcast_arrays(1 / u, -spm0 * t / u ** 2), axis=-1)
+
+
+def linear_decline(t: np.ndarray, slope: float, intercept: float) -> np.ndarray:
+    """선형 모델 SPM(t) = a·t + c"""
+    return slope * t + intercept
+
+
+def predict_decline(model_name: str, t: np.ndarray, params) -> np.ndarray:
+    """모델 이름과 파라미터로 예측 SPM 계산"""
+    model = {
+        "hyperbolic": hyperbolic_decline,
+        "exponential": exponential_decline,
+        "harmonic": harmonic_decline,
+        "linear": linear_decline
+    }[model_name]
+    return model(np.asarray(t, dtype=np.float64), *params)
+
+
+class DeclineSeries:
+    """
+    감소 모델 피팅용 사전 계산 데이터
+
+    시간/SPM 배열과 모든 모델이 공유하는 양(합계, 전체 제곱합, 하이퍼볼릭 격자 탐색 결과)을
+    한 번만 계산해 두고 모델별 피터가 재사용합니다.
+    조화 모델은 b = 1인 하이퍼볼릭 모델이므로 격자 탐색의 마지막 행(GRID_SHAPES[-1] = 1.0)을 초기값으로 씁니다.
+    """
+
+    def __init__(self, t: np.ndarray, y: np.ndarray):
+        self.t = np.asarray(t, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.n = len(self.y)
+
+        self.sum_t = float(self.t.sum())
+        self.sum_y = float(self.y.sum())
+        self.sum_tt = float(self.t @ self.t)
+        self.sum_ty = float(self.t @ self.y)
+        self.ss_tot = float(np.sum((self.y - self.sum_y / self.n) ** 2)) if self.n else 0.0
+
+        self._grid = None
+
+    @property
+    def grid(self):
+        """하이퍼볼릭 (b, Di) 격자 탐색 결과 (SPM₀, SSE), 처음 사용할 때 한 번만 계산"""
+        if self._grid is None:
+            self._grid = _grid_search(self.t, self.y)
+        return self._grid
+
+    def hyperbolic_initial_guess(self) -> np.ndarray:
+        spm0, sse = self.grid
+        b_index, di_index = np.unravel_index(np.argmin(sse), sse.shape)
+        return np.array([spm0[b_index, di_index], GRID_DECLINES[di_index], GRID_SHAPES[b_index]])
+
+    def harmonic_initial_guess(self) -> np.ndarray:
+        spm0, sse = self.grid
+        di_index = int(np.argmin(sse[-1]))
+        return np.array([spm0[-1, di_index], GRID_DECLINES[di_index]])
+
+    def exponential_initial_guess(self) -> np.ndarray:
+        """로그 SPM의 선형 회귀 기울기로 Di 추정 (사전 계산한 시간 합계 재사용)"""
+        log_y = np.log(np.maximum(self.y, 1e-10))
+        slope, intercept = self.linear_regression(log_y)
+        return np.clip([np.exp(intercept), -slope], DECLINE_LOWER, DECLINE_UPPER)
+
+    def linear_regression(self, values: Optional[np.ndarray] = None):
+        """최소제곱 직선 (기울기, 절편) - values를 생략하면 SPM 자체를 회귀"""
+        if values is None:
+            sum_v, sum_tv = self.sum_y, self.sum_ty
+        else:
+            sum_v, sum_tv = float(values.sum()), float(self.t @ values)
+        denominator = self.n * self.sum_tt - self.sum_t ** 2
+        if abs(denominator) < 1e-12:
+            return 0.0, sum_v / self.n
+        slope = (self.n * sum_tv - self.sum_t * sum_v) / denominator
+        return slope, (sum_v - slope * self.sum_t) / self.n
+
+    def information_criteria(self, sse: float, parameter_count: int):
+        """가우시안 오차 가정의 AIC, BIC"""
+        log_likelihood_term = self.n * np.log(max(sse, 1e-12) / self.n)
+        aic = log_likelihood_term + 2 * parameter_count
+        bic = log_likelihood_term + parameter_count * np.log(self.n)
+        return float(aic), float(bic)
+
+
+def _fit_single_model(series: DeclineSeries, model_name: str, max_iterations: int) -> Dict:
+    """사전 계산 데이터로 모델 하나를 피팅"""
+    if model_name == "linear":
+        params = np.array(series.linear_regression())
+        fit = {"params": params, "iterations": 0, "converged": True}
+    elif model_name == "hyperbolic":
+        fit = levenberg_marquardt(series.t, series.y, series.hyperbolic_initial_guess(),
+                                  max_iterations=max_iterations)
+    elif model_name == "harmonic":
+        fit = levenberg_marquardt(series.t, series.y, series.harmonic_initial_guess(),
+                                  max_iterations=max_iterations, model=harmonic_decline,
+                                  jacobian=harmonic_jacobian, lower=DECLINE_LOWER, upper=DECLINE_UPPER)
+    else:
+        fit = levenberg_marquardt(series.t, series.y, series.exponential_initial_guess(),
+                                  max_iterations=max_iterations, model=exponential_decline,
+                                  jacobian=exponential_jacobian, lower=DECLINE_LOWER, upper=DECLINE_UPPER)
+
+    predicted = predict_decline(model_name, series.t, fit["params"])
+    sse = float(np.sum((series.y - predicted) ** 2))
+    aic, bic = series.information_criteria(sse, len(fit["params"]))
+    return {
+        "params": fit["params"],
+        "predicted": predicted,
+        "sse": sse,
+        "rmse": float(np.sqrt(sse / series.n)),
+        "r_squared": float(1 - sse / series.ss_tot) if series.ss_tot > 0 else 0.0,
+        "aic": aic,
+        "bic": bic,
+        "parameter_count": len(fit["params"]),
+        "iterations": fit["iterations"],
+        "converged": fit["converged"]
+    }
+
+
+def fit_decline_models(t: np.ndarray, y: np.ndarray, models=DECLINE_MODELS,
+                       criterion: str = DEFAULT_SELECTION_CRITERION, max_iterations: int = 50) -> Dict:
+    """
+    여러 감소 모델을 같은 사전 계산 데이터로 한 번에 피팅하고 정보 기준으로 최적 모델 선택
+
+    Args:
+        t: 시간 배열 (분)
+        y: 관측 SPM 배열
+        models: 피팅할 모델 이름 목록 (DECLINE_MODELS 중)
+        criterion: 선택 기준 ("aic" 또는 "bic")
+        max_iterations: 비선형 모델의 LM 최대 반복 횟수
+
+    Returns:
+        selected (선택된 모델 이름), criterion, models (모델별 params/predicted/sse/rmse/r_squared/aic/bic...),
+        wall_time_ms
+    """
+    if criterion not in SELECTION_CRITERIA:
+        raise ValueError(f"지원하지 않는 모델 선택 기준입니다: {criterion}")
+    unknown = [name for name in models if name not in DECLINE_MODELS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 감소 모델입니다: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    series = DeclineSeries(t, y)
+    results = {name: _fit_single_model(series, name, max_iterations) for name in models}
+    selected = min(results, key=lambda name: results[name][criterion])
+
+    return {
+        "selected": selected,
+        "criterion": criterion,
+        "models": results,
+        "wall_time_ms": (time.perf_counter() - started) * 1000
+    }
+
+
+def named_parameters(model_name: str, params) -> Dict:
+    """모델 파라미터 배열을 이름이 붙은 딕셔너리로 변환"""
+    return {name: float(value) for name, value in zip(MODEL_PARAMETER_NAMES[model_name], params)}
+
+
+class OnlineHyperbolicEstimator:
+    """
+    실시간 세션용 하이퍼볼릭 모델 온라인 추정기
+
+    구간 SPM이 들어올 때마다 직전 해에서 시작하는(warm start) 몇 번의 LM 반복으로 파라미터를 갱신합니다.
+    직전 해가 이미 최적점 근처이므로 매 갱신은 보통 수 회 반복으로 끝나며,
+    모델로 예측한 초기 대비 감소율이 기준을 넘으면 조기 경고를 표시합니다.
+    """
+
+    def __init__(self, max_iterations: int = 10, decline_threshold: float = FATIGUE_DECLINE_THRESHOLD):
+        self.max_iterations = max_iterations
+        self.decline_threshold = decline_threshold
+        self.times: List[float] = []
+        self.spms: List[float] = []
+        self.params: Optional[np.ndarray] = None
+        self.damping = 1e-3
+        self.total_iterations = 0
+
+    def update(self, t_minutes: float, spm: float) -> Dict:
+        """
+        새 구간 SPM 추가 후 현재 추정 결과 반환
+
+        Args:
+            t_minutes: 구간 시작 시각 (분)
+            spm: 구간 SPM (0 이하는 유효하지 않은 구간으로 무시)
+        """
+        if spm > 0:
+            self.times.append(float(t_minutes))
+            self.spms.append(float(spm))
+
+        if len(self.spms) < MIN_FIT_POINTS:
+            return {
+                "model_fitted": False,
+                "points": len(self.spms),
+                "required_points": MIN_FIT_POINTS
+            }
+
+        t = np.array(self.times)
+        y = np.array(self.spms)
+        if self.params is None:
+            # 첫 피팅만 격자 탐색으로 초기화하고 이후에는 직전 해에서 시작
+            self.params = grid_initial_guess(t, y)
+
+        fit = levenberg_marquardt(t, y, self.params, max_iterations=self.max_iterations, damping=self.damping)
+        self.params = fit["params"]
+        self.damping = fit["damping"]
+        self.total_iterations += fit["iterations"]
+
+        spm0, di, b = self.params
+        predicted_now = float(hyperbolic_decline(np.array([t[-1]]), spm0, di, b)[0])
+        decline = (spm0 - predicted_now) / spm0 * 100 if spm0 > 0 else 0.0
+
+        return {
+            "model_fitted": True,
+            "points": len(self.spms),
+            "parameters": {
+                "spm0": round(float(spm0), 2),
+                "decline_index": round(float(di), 4),
+                "shape_parameter": round(float(b), 2)
+            },
+            "r_squared": round(r_squared(y, hyperbolic_decline(t, spm0, di, b)), 3),
+            "predicted_spm": round(predicted_now, 1),
+            "decline_percent": round(float(decline), 1),
+            "fatigue_warning": bool(decline > self.decline_threshold),
+            "iterations": fit["iterations"]
+        }
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+무거운 과학 계산/그래프 모듈(librosa, scipy, matplotlib 등)의 지연 임포트
+lazy_import()로 만든 모듈은 속성에 처음 접근할 때 임포트되며,
+모듈별 임포트 시간은 import_report()로 확인할 수 있습니다.
+인증이나 단어 목록만 처리하는 서버 프로세스가 분석용 모듈을 불러오지 않도록 하기 위해 사용합니다.
+"""
+
+import sys
+import time
+import types
+import logging
+import importlib
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# 모듈 이름 → {"import_ms", "loaded_at", "mode"} (mode: eager=timed_import, lazy=첫 사용 시 임포트)
+_import_times: Dict[str, Dict] = {}
+_import_lock = threading.RLock()
+
+
+def _record(name: str, elapsed: float, mode: str) -> None:
+    _import_times[name] = {
+        "import_ms": round(elapsed * 1000, 1),
+        "loaded_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": mode
+    }
+
+
+def timed_import(name: str, mode: str = "eager") -> types.ModuleType:
+    """
+    모듈을 임포트하고 소요 시간을 기록
+    이미 임포트된 모듈은 기록 없이 그대로 반환합니다. (다른 모듈이 먼저 불러온 비용은 그쪽에 포함)
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    with _import_lock:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        if name not in _import_times:
+            elapsed = time.perf_counter() - started
+            _record(name, elapsed, mode)
+            if mode == "lazy":
+                logger.info(f"지연 임포트: {name} ({elapsed * 1000:.1f} ms)")
+        return module
+
+
+class LazyModule(types.ModuleType):
+    """속성에 처음 접근할 때 실제 모듈을 임포트하는 대리 모듈"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = timed_import(self.__name__, mode="lazy")
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """첫 속성 접근 시 임포트되는 모듈 반환 (이미 임포트되어 있으면 실제 모듈 반환)"""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def import_report() -> Dict:
+    """모듈별 임포트 시간 (느린 순)"""
+    modules = sorted(
+        ({"module": name, **info} for name, info in _import_times.items()),
+        key=lambda item: item["import_ms"],
+        reverse=True
+    )
+    return {
+        "total_ms": round(sum(item["import_ms"] for item in modules), 1),
+        "modules": modules
+    }
@@ -1,10 +1,185 @@
 import openai
 import os
+import io
+import time
+import bisect
+import asyncio
 import logging
+from typing import Dict, Optional
+
+import httpx
+import numpy as np
+
+from services import transcript_cache
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("openai_stt")
 
+# 비동기 STT 클라이언트 설정
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+STT_MAX_CONCURRENCY = int(os.getenv("STT_MAX_CONCURRENCY", "8"))       # 동시에 보내는 Whisper 요청 수
+STT_MAX_CONNECTIONS = int(os.getenv("STT_MAX_CONNECTIONS", "16"))      # 공유 연결 풀 크기
+STT_TIMEOUT_SECONDS = float(os.getenv("STT_TIMEOUT_SECONDS", "60"))    # 요청 한 건의 전체 제한 시간
+
+# 지연 시간 히스토그램 구간 상한 (ms)
+STT_LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """고정 구간 지연 시간 히스토그램 (구간별 누적 없는 개수)"""
+
+    def __init__(self, buckets_ms=STT_LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """분위수 근사값 (해당 분위가 속한 구간의 상한, 마지막 구간이면 최댓값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return float(self.buckets_ms[index]) if index < len(self.buckets_ms) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def stats(self) -> Dict:
+        labels = [f"le_{bucket}" for bucket in self.buckets_ms] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+def _api_error_message(response: httpx.Response) -> str:
+    """OpenAI 오류 응답({"error": {"message": ...}})의 메시지 (형식이 다르면 본문 앞부분)"""
+    try:
+        return response.json()["error"]["message"]
+    except Exception:
+        return response.text[:200]
+
+
+class AsyncWhisperClient:
+    """
+    httpx.AsyncClient 기반 Whisper STT 클라이언트
+    이벤트 루프를 막지 않고 /v1/audio/transcriptions를 호출하며, 모든 요청이 하나의 연결 풀을 공유합니다.
+    동시 요청 수는 세마포어로 제한하고, 요청마다 전체 제한 시간을 적용합니다.
+    """
+
+    def __init__(self, api_key: str, api_base: str = OPENAI_API_BASE, max_concurrency: int = STT_MAX_CONCURRENCY,
+                 max_connections: int = STT_MAX_CONNECTIONS, timeout_seconds: float = STT_TIMEOUT_SECONDS):
+        self.api_key = api_key
+        self.api_base = api_base.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        # 클라이언트와 세마포어는 이벤트 루프에 묶이므로 첫 요청 때 생성
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.latency = LatencyHistogram()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout_seconds)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def transcribe(self, audio_data: bytes, filename: str = "audio.wav", model: str = "whisper-1") -> Dict:
+        """
+        음성 바이트를 Whisper로 변환 (OpenAISTTService.speech_to_text_bytes와 같은 결과 형태)
+        """
+        client = self._ensure_client()
+        # 대기 중 취소되어도(클라이언트 연결 종료, 상위 타임아웃) 대기 수가 어긋나지 않도록 finally에서 감소
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                client.post("/audio/transcriptions", data={"model": model}, files={"file": (filename, audio_data)}),
+                self.timeout_seconds
+            )
+            response.raise_for_status()
+            self.succeeded += 1
+            return {"status": "success", "text": response.json()["text"]}
+        except httpx.HTTPStatusError as e:
+            self.failed += 1
+            detail = _api_error_message(e.response)
+            logger.error("STT API 오류 (%s): %s", e.response.status_code, detail)
+            return {
+                "status": "error",
+                "error_message": f"음성을 텍스트로 변환하는 중 오류가 발생했습니다: {e.response.status_code} {detail}"
+            }
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            # 전체 제한 시간(wait_for)과 연결 풀의 연결/읽기/풀 대기 시간 초과를 함께 집계
+            self.timed_out += 1
+            logger.error("STT 요청 시간 초과 (%.0f초)", self.timeout_seconds)
+            return {"status": "error", "error_message": f"음성 변환 요청이 {self.timeout_seconds:.0f}초 안에 끝나지 않았습니다."}
+        except Exception as e:
+            self.failed += 1
+            logger.error("STT 처리 중 오류 발생: %s", e)
+            return {
+                "status": "error",
+                "error_message": f"음성을 텍스트로 변환하는 중 오류가 발생했습니다: {str(e)}"
+            }
+        finally:
+            self.in_flight -= 1
+            self.latency.observe((time.perf_counter() - started) * 1000)
+            self._semaphore.release()
+
+    async def warm_up(self) -> int:
+        """모델 목록 조회로 연결 풀에 연결을 미리 만들어 둠 (토큰 사용 없음), 모델 수 반환"""
+        response = await self._ensure_client().get("/models")
+        response.raise_for_status()
+        return len(response.json().get("data", []))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_connections": self.max_connections,
+            "timeout_seconds": self.timeout_seconds,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "latency": self.latency.stats()
+        }
+
 
 class OpenAISTTService:
     """OpenAI Whisper API를 사용하여 STT(Speech-to-Text) 기능을 제공하는 서비스 클래스"""
@@ -14,6 +189,28 @@ class OpenAISTTService:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
         openai.api_key = self.api_key  # ✅ 고전 방식에선 전역 설정
+        # async 핸들러용 비동기 클라이언트 (동기 메서드는 분석 워커 프로세스 등 이벤트 루프 밖에서 사용)
+        self.async_client = AsyncWhisperClient(self.api_key)
+
+    async def aspeech_to_text_bytes(self, audio_data: bytes, filename: str = "audio.wav",
+                                    pcm: Optional[np.ndarray] = None):
+        """
+        speech_to_text_bytes의 비동기 버전 (공유 연결 풀, 동시 요청 수 제한, 요청별 제한 시간)
+        같은 음성의 변환 결과는 캐시에서 반환하며, DB 캐시 조회/저장은 스레드에서 실행합니다.
+        """
+        key = transcript_cache.transcript_key(audio_data, pcm)
+        text = transcript_cache.transcript_cache.get(key)
+        if text is None and transcript_cache.STT_CACHE_PERSIST:
+            text = await asyncio.to_thread(transcript_cache.load_persisted_transcript, key)
+        if text is not None:
+            return {"status": "success", "text": text, "cached": True}
+
+        result = await self.async_client.transcribe(audio_data, filename)
+        if result["status"] == "success":
+            transcript_cache.transcript_cache.set(key, result["text"])
+            if transcript_cache.STT_CACHE_PERSIST:
+                await asyncio.to_thread(transcript_cache.persist_transcript, key, result["text"])
+        return result
 
     def speech_to_text(self, file_path: str):
         try:
@@ -31,6 +228,41 @@ class OpenAISTTService:
                 "error_message": f"음성을 텍스트로 변환하는 중 오류가 발생했습니다: {str(e)}"
             }
 
+    def speech_to_text_bytes(self, audio_data: bytes, filename: str = "audio.wav",
+                             pcm: Optional[np.ndarray] = None):
+        """
+        메모리에 있는 음성 바이트를 임시 파일 없이 바로 Whisper로 전송합니다.
+        같은 음성의 변환 결과는 캐시(services.transcript_cache)에서 반환합니다.
+
+        Args:
+            audio_data: 음성 파일 바이트
+            filename: 확장자로 포맷을 판별하기 위한 파일 이름
+            pcm: 디코딩된 샘플 (있으면 캐시 키로 사용, 없으면 audio_data로 키 생성)
+
+        Returns:
+            speech_to_text 와 같은 형태의 결과 딕셔너리
+        """
+        key = transcript_cache.transcript_key(audio_data, pcm)
+        text = transcript_cache.get_cached_transcript(key)
+        if text is not None:
+            return {"status": "success", "text": text, "cached": True}
+
+        try:
+            audio_file = io.BytesIO(audio_data)
+            audio_file.name = filename
+            transcript = openai.Audio.transcribe(
+                model="whisper-1",
+                file=audio_file
+            )
+            transcript_cache.cache_transcript(key, transcript["text"])
+            return {"status": "success", "text": transcript["text"]}
+        except Exception as e:
+            logger.error("STT 처리 중 오류 발생: %s", e)
+            return {
+                "status": "error",
+                "error_message": f"음성을 텍스트로 변환하는 중 오류가 발생했습니다: {str(e)}"
+            }
+
     def count_korean_syllables(self, text):
         """
         한글 텍스트의 음절 수 계산
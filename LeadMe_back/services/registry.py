@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+서비스 레지스트리
+Polly TTS, Whisper STT, 피로도 분석 서비스를 프로세스마다 한 번, 첫 사용 시 생성합니다.
+boto3 Polly 클라이언트는 AmazonPollyService와 StutteringTTSService가 함께 사용하며,
+테스트와 벤치마크에서는 override()로 가짜 서비스나 클라이언트를 주입할 수 있습니다.
+
+라우터에서는 get_*_service 함수를 FastAPI 의존성(Depends)으로 사용합니다.
+
+    with registry.overridden(stt=FakeSTTService()):
+        ...  # 이 블록 안의 요청은 가짜 STT 사용
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ServiceRegistry:
+    """
+    이름별 팩토리로 서비스를 지연 생성하는 레지스트리
+
+    팩토리는 레지스트리를 인자로 받아 다른 서비스(공유 클라이언트 등)를 get()으로 가져올 수 있습니다.
+    override()한 값은 생성된 인스턴스보다 우선하며, 이미 생성된 서비스가 가진 클라이언트까지
+    바꾸려면 reset()으로 인스턴스를 비운 뒤 다시 가져와야 합니다.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[["ServiceRegistry"], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[["ServiceRegistry"], Any]) -> None:
+        """팩토리 등록 (같은 이름이 있으면 교체하고 기존 인스턴스는 버림)"""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """서비스 조회 (없으면 생성)"""
+        if name in self._overrides:
+            return self._overrides[name]
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise KeyError(f"등록되지 않은 서비스입니다: {name}")
+                started = time.perf_counter()
+                self._instances[name] = factory(self)
+                logger.info(f"서비스 생성: {name} ({(time.perf_counter() - started) * 1000:.1f} ms)")
+            return self._instances[name]
+
+    def peek(self, name: str) -> Any:
+        """이미 생성되었거나 대체된 서비스만 반환 (없으면 생성하지 않고 None)"""
+        return self._overrides.get(name, self._instances.get(name))
+
+    def override(self, name: str, instance: Any) -> None:
+        """서비스를 지정한 객체로 대체 (테스트/벤치마크용 가짜 서비스)"""
+        with self._lock:
+            self._overrides[name] = instance
+
+    def clear_overrides(self) -> None:
+        with self._lock:
+            self._overrides.clear()
+
+    @contextmanager
+    def overridden(self, **instances):
+        """with 블록 안에서만 서비스 대체"""
+        with self._lock:
+            previous = {name: self._overrides.get(name, _MISSING) for name in instances}
+            self._overrides.update(instances)
+        try:
+            yield self
+        finally:
+            with self._lock:
+                for name, instance in previous.items():
+                    if instance is _MISSING:
+                        self._overrides.pop(name, None)
+                    else:
+                        self._overrides[name] = instance
+
+    def reset(self) -> None:
+        """생성된 인스턴스를 모두 버림 (다음 get()에서 다시 생성)"""
+        with self._lock:
+            self._instances.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "registered": sorted(self._factories),
+            "created": sorted(self._instances),
+            "overridden": sorted(self._overrides)
+        }
+
+
+def _create_polly_client(_registry: ServiceRegistry):
+    import boto3
+
+    return boto3.client(
+        'polly',
+        region_name=os.getenv("AWS_REGION", "ap-northeast-2"),
+        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
+    )
+
+
+def _create_polly_service(registry: ServiceRegistry):
+    from services.amazon_polly import AmazonPollyService
+
+    return AmazonPollyService(polly_client=registry.get("polly_client"))
+
+
+def _create_stuttering_tts_service(registry: ServiceRegistry):
+    from services.stuttering_tts_service import StutteringTTSService
+
+    return StutteringTTSService(polly_client=registry.get("polly_client"))
+
+
+def _create_stt_service(_registry: ServiceRegistry):
+    from services.openai_stt import OpenAISTTService
+
+    return OpenAISTTService()
+
+
+def _create_vocal_fatigue_service(registry: ServiceRegistry):
+    from services.vocal_fatigue_service import VocalFatigueAnalysisService
+
+    return VocalFatigueAnalysisService(stt_service=registry.get("stt"))
+
+
+# 프로세스별 레지스트리 (분석 워커 프로세스는 각자의 인스턴스를 가짐)
+registry = ServiceRegistry()
+registry.register("polly_client", _create_polly_client)
+registry.register("polly", _create_polly_service)
+registry.register("stuttering_tts", _create_stuttering_tts_service)
+registry.register("stt", _create_stt_service)
+registry.register("vocal_fatigue", _create_vocal_fatigue_service)
+
+
+def get_polly_service():
+    """AmazonPollyService (연령대별 속도 TTS)"""
+    return registry.get("polly")
+
+
+def get_stuttering_tts_service():
+    """StutteringTTSService (말더듬증 훈련용 고정 속도 TTS)"""
+    return registry.get("stuttering_tts")
+
+
+def get_stt_service():
+    """OpenAISTTService (Whisper STT)"""
+    return registry.get("stt")
+
+
+def get_vocal_fatigue_service():
+    """VocalFatigueAnalysisService (구간별 피로도 분석)"""
+    return registry.get("vocal_fatigue")
@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+음성 특징 계산 모듈
+녹음 전체의 프레임 에너지를 한 번만 계산하고 누적 합(prefix sum)으로 저장하여,
+임의 구간의 음성(voiced) 길이를 O(1)로 조회합니다.
+STT 없이 음절 수를 세기 위한 음절 핵(syllable nucleus) 검출기도 제공합니다.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from services.lazy_imports import lazy_import
+
+# scipy.signal은 임포트 비용이 크므로 첫 사용 시 로드
+signal = lazy_import("scipy.signal")
+
+# librosa.effects.split 기본값과 동일한 프레임 설정
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+TOP_DB = 20
+
+# 음절 핵 검출 설정
+NUCLEUS_BAND_HZ = (250.0, 2500.0)    # 모음 에너지가 집중된 대역
+NUCLEUS_FRAME_SECONDS = 0.025        # 포락선 프레임 길이
+NUCLEUS_HOP_SECONDS = 0.010          # 포락선 프레임 간격
+NUCLEUS_SMOOTH_FRAMES = 5            # 포락선 이동 평균 길이 (50ms)
+NUCLEUS_MIN_DISTANCE_SECONDS = 0.1   # 음절 핵 사이 최소 간격 (초당 최대 10음절)
+NUCLEUS_MIN_PROMINENCE_DB = 2.0      # 주변 골짜기 대비 최소 돌출 정도
+NUCLEUS_FLOOR_DB = 25.0              # 상위 99% 에너지 대비 이 값보다 작은 피크는 무시
+
+
+class VoicedEnergyIndex:
+    """
+    프레임 RMS 에너지 기반 음성 구간 누적 인덱스
+
+    librosa.effects.split(top_db=20)과 같은 방식(중앙 정렬 프레임, 최대 에너지 대비 top_db 기준)으로
+    음성 프레임을 판정하되, 기준 에너지는 구간별 최대값이 아니라 녹음 전체의 최대값을 사용합니다.
+    """
+
+    def __init__(self, y: np.ndarray, sr: int, top_db: float = TOP_DB,
+                 frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH):
+        self.sr = sr
+        self.top_db = top_db
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.sample_count = len(y)
+
+        self.frame_energy = self._frame_mean_square(y)
+        self.voiced_frames = self._voiced_mask(self.frame_energy)
+
+        # voiced_cumsum[i] = 0 ~ i-1 프레임 중 음성 프레임 수
+        self.voiced_cumsum = np.concatenate(([0], np.cumsum(self.voiced_frames, dtype=np.int64)))
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.voiced_frames)
+
+    @property
+    def total_duration(self) -> float:
+        return self.sample_count / self.sr
+
+    @property
+    def frame_seconds(self) -> float:
+        return self.hop_length / self.sr
+
+    def _frame_mean_square(self, y: np.ndarray) -> np.ndarray:
+        """제곱 누적 합으로 프레임별 평균 제곱 에너지를 계산 (프레임 배열을 만들지 않음)"""
+        pad = self.frame_length // 2
+        padded = np.pad(y.astype(np.float64), (pad, pad))
+        power_cumsum = np.concatenate(([0.0], np.cumsum(padded ** 2)))
+
+        frame_count = 1 + max(0, len(padded) - self.frame_length) // self.hop_length
+        starts = np.arange(frame_count) * self.hop_length
+        return (power_cumsum[starts + self.frame_length] - power_cumsum[starts]) / self.frame_length
+
+    def _voiced_mask(self, frame_energy: np.ndarray) -> np.ndarray:
+        peak = frame_energy.max() if len(frame_energy) else 0.0
+        if peak <= 0:
+            return np.zeros(len(frame_energy), dtype=bool)
+        return frame_energy > peak * 10 ** (-self.top_db / 10)
+
+    def _time_to_frame(self, seconds) -> np.ndarray:
+        frames = np.floor(np.asarray(seconds, dtype=np.float64) * self.sr / self.hop_length).astype(np.int64)
+        return np.clip(frames, 0, self.frame_count)
+
+    def voiced_durations(self, start_times, end_times) -> np.ndarray:
+        """여러 구간의 음성 길이(초)를 한 번에 조회 (벡터화)"""
+        start_frames = self._time_to_frame(start_times)
+        end_frames = self._time_to_frame(end_times)
+        voiced = self.voiced_cumsum[end_frames] - self.voiced_cumsum[start_frames]
+        durations = voiced * self.frame_seconds
+        # 마지막 프레임이 녹음 끝을 넘지 않도록 실제 구간 길이로 제한
+        return np.minimum(durations, np.maximum(np.asarray(end_times) - np.asarray(start_times), 0))
+
+    def voiced_duration(self, start_time: float, end_time: float) -> float:
+        """단일 구간의 음성 길이(초)"""
+        return float(self.voiced_durations(start_time, end_time))
+
+    def segment_bounds(self, segment_count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """녹음 전체를 segment_count개로 균등 분할한 (시작 시각, 종료 시각) 배열"""
+        edges = np.linspace(0.0, self.total_duration, segment_count + 1)
+        return edges[:-1], edges[1:]
+
+    def sliding_window_bounds(self, window_seconds: float, step_seconds: float) -> Tuple[np.ndarray, np.ndarray]:
+        """window_seconds 길이의 창을 step_seconds 간격으로 이동한 (시작 시각, 종료 시각) 배열"""
+        last_start = max(self.total_duration - window_seconds, 0.0)
+        starts = np.arange(0.0, last_start + 1e-9, step_seconds)
+        ends = np.minimum(starts + window_seconds, self.total_duration)
+        return starts, ends
+
+
+def _nucleus_band_filter(sr: int) -> np.ndarray:
+    """모음 대역 통과 필터 계수 (SOS)"""
+    low, high = NUCLEUS_BAND_HZ
+    return signal.butter(2, [low, min(high, sr / 2 * 0.95)], btype="bandpass", fs=sr, output="sos")
+
+
+def detect_syllable_nuclei(y: np.ndarray, sr: int, energy_index: Optional[VoicedEnergyIndex] = None) -> np.ndarray:
+    """
+    에너지 포락선 피크로 음절 핵(모음 중심) 시각을 검출
+
+    1. 모음 대역(250~2500Hz) 통과 필터 후 25ms/10ms 프레임 에너지(dB) 포락선 계산
+    2. 50ms 이동 평균으로 평활화
+    3. 최소 간격 100ms, 최소 돌출 2dB, 상위 에너지 대비 -25dB 이상인 피크 선택
+    4. VoicedEnergyIndex 기준 음성 프레임 안에 있는 피크만 유지
+
+    Args:
+        y: 모노 PCM 배열
+        sr: 샘플링 레이트
+        energy_index: 같은 신호로 만든 음성 인덱스 (없으면 새로 계산)
+
+    Returns:
+        음절 핵 시각(초) 배열 (오름차순)
+    """
+    if len(y) == 0:
+        return np.zeros(0)
+    if energy_index is None:
+        energy_index = VoicedEnergyIndex(y, sr)
+
+    band = signal.sosfilt(_nucleus_band_filter(sr), y.astype(np.float64))
+
+    # 제곱 누적 합으로 프레임 에너지 계산 (VoicedEnergyIndex와 같은 방식)
+    frame_length = max(1, int(NUCLEUS_FRAME_SECONDS * sr))
+    hop_length = max(1, int(NUCLEUS_HOP_SECONDS * sr))
+    power_cumsum = np.concatenate(([0.0], np.cumsum(band ** 2)))
+    frame_count = 1 + max(0, len(band) - frame_length) // hop_length
+    starts = np.arange(frame_count) * hop_length
+    ends = np.minimum(starts + frame_length, len(band))
+    energy = (power_cumsum[ends] - power_cumsum[starts]) / frame_length
+
+    envelope_db = 10 * np.log10(energy + 1e-12)
+    kernel = np.ones(NUCLEUS_SMOOTH_FRAMES) / NUCLEUS_SMOOTH_FRAMES
+    envelope_db = np.convolve(envelope_db, kernel, mode="same")
+
+    floor_db = np.percentile(envelope_db, 99) - NUCLEUS_FLOOR_DB
+    peaks, _ = signal.find_peaks(
+        envelope_db,
+        height=floor_db,
+        prominence=NUCLEUS_MIN_PROMINENCE_DB,
+        distance=max(1, int(round(NUCLEUS_MIN_DISTANCE_SECONDS / NUCLEUS_HOP_SECONDS)))
+    )
+
+    # 피크 중심 샘플이 속한 음성 프레임 확인
+    centers = starts[peaks] + frame_length // 2
+    voiced_frames = np.clip(centers // energy_index.hop_length, 0, energy_index.frame_count - 1)
+    peaks = peaks[energy_index.voiced_frames[voiced_frames]]
+
+    return (starts[peaks] + frame_length // 2) / sr
+
+
+def count_syllables(nucleus_times: np.ndarray, start_times, end_times) -> np.ndarray:
+    """구간별 음절 핵 개수 (정렬된 시각 배열에서 이진 탐색, 벡터화)"""
+    left = np.searchsorted(nucleus_times, np.asarray(start_times, dtype=np.float64), side="left")
+    right = np.searchsorted(nucleus_times, np.asarray(end_times, dtype=np.float64), side="left")
+    return right - left
+
+
+def spm_timeline(energy_index: VoicedEnergyIndex, window_seconds: float, step_seconds: float,
+                 nucleus_times: np.ndarray) -> Dict:
+    """
+    슬라이딩 윈도우 SPM 타임라인 계산
+    모든 창의 음성 길이와 음절 수를 누적 합/이진 탐색으로 한 번에 조회하므로
+    창 개수와 무관하게 프레임 에너지는 한 번만 계산됩니다.
+
+    Returns:
+        창별 시작/종료/중심 시각, 음성 비율, 음절 수, SPM 배열
+    """
+    starts, ends = energy_index.sliding_window_bounds(window_seconds, step_seconds)
+    durations = ends - starts
+    voiced = energy_index.voiced_durations(starts, ends)
+    syllables = count_syllables(nucleus_times, starts, ends)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        voiced_percentage = np.where(durations > 0, voiced / durations * 100, 0.0)
+        spm = np.where(durations > 0, syllables / durations * 60, 0.0)
+
+    return {
+        "start_times": starts,
+        "end_times": ends,
+        "center_times": (starts + ends) / 2,
+        "voiced_percentage": voiced_percentage,
+        "syllables": syllables,
+        "spm": spm
+    }
+
+
+class StreamingSpmMeter:
+    """
+    실시간 SPM 측정기 (WebSocket 스트리밍용)
+
+    PCM 청크를 받을 때마다 새로 들어온 10ms 프레임만 처리하는 증분 방식으로,
+    청크당 O(청크 길이)의 연산만 수행하며 프레임 단위 파이썬 반복 없이 NumPy 배열 연산으로 처리합니다.
+    - 포락선: detect_syllable_nuclei와 같은 모음 대역 필터 (필터 상태를 청크 간에 유지)
+    - 음성 판정: 천천히 감쇠하는 최대 에너지 대비 top_db 이내이고 절대 하한 이상인 프레임
+    - 음절 핵: 평활화된 dB 포락선에서 앞뒤 골짜기 대비 2dB 이상 돌출하고 100ms 이상 떨어진 피크
+    - 통계: 최근 window_seconds 초의 1초 단위 버킷(음성 프레임 수, 음절 수)
+    - 구간: segment_seconds 초마다 구간 SPM을 completed_segments에 추가 (피로 모델 온라인 추정용)
+    """
+
+    # 최대 에너지 감쇠 계수 (프레임당, 약 10초에 -20dB)
+    PEAK_DECAY = 10 ** (-20 / 10 / 1000)
+    # 절대 에너지 하한 (dBFS) - 무음 구간의 잡음을 음성으로 판정하지 않도록 함
+    ABSOLUTE_FLOOR_DB = -55.0
+
+    def __init__(self, sr: int = 16000, window_seconds: float = 10.0, top_db: float = TOP_DB,
+                 segment_seconds: float = 30.0):
+        self.sr = sr
+        self.top_db = top_db
+        self.hop_length = max(1, int(NUCLEUS_HOP_SECONDS * sr))
+        self.frames_per_second = int(round(1.0 / NUCLEUS_HOP_SECONDS))
+        self.window_buckets = max(1, int(round(window_seconds)))
+        self.min_peak_gap = max(1, int(round(NUCLEUS_MIN_DISTANCE_SECONDS / NUCLEUS_HOP_SECONDS)))
+
+        self._pending = np.zeros(0, dtype=np.float64)
+        self._sos = _nucleus_band_filter(sr)
+        self._filter_state = signal.sosfilt_zi(self._sos) * 0.0
+        self._peak_energy = 0.0
+        self._smooth_history = np.full(NUCLEUS_SMOOTH_FRAMES - 1, -120.0)
+
+        # 온라인 피크 검출 상태
+        self._valley_db = np.inf
+        self._candidate_db = -np.inf
+        self._candidate_frame = -1
+        self._candidate_voiced = False
+        self._last_nucleus_frame = -self.min_peak_gap
+
+        # 1초 버킷 (음성 프레임 수, 음절 수)
+        self._bucket_voiced = 0
+        self._bucket_syllables = 0
+        self._bucket_frames = 0
+        self._buckets = []
+
+        # 피로 모델용 구간 집계
+        self.segment_buckets = max(1, int(round(segment_seconds)))
+        self._segment_syllables = 0
+        self._segment_bucket_count = 0
+        self.completed_segments = []
+
+        self.frame_index = 0
+        self.total_voiced_frames = 0
+        self.total_syllables = 0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self.frame_index / self.frames_per_second
+
+    def feed(self, samples: np.ndarray) -> int:
+        """
+        PCM 청크를 처리하고 이번 청크로 완성된 1초 버킷 수를 반환
+
+        Args:
+            samples: -1.0 ~ 1.0 범위의 float 모노 PCM
+        """
+        # 필터 상태를 이어받아 청크 경계와 무관하게 연속 신호처럼 필터링
+        filtered, self._filter_state = signal.sosfilt(self._sos, samples.astype(np.float64), zi=self._filter_state)
+        data = np.concatenate((self._pending, filtered))
+        frame_count = len(data) // self.hop_length
+        self._pending = data[frame_count * self.hop_length:]
+        if frame_count == 0:
+            return 0
+
+        frames = data[:frame_count * self.hop_length].reshape(frame_count, self.hop_length)
+        energy = np.mean(frames ** 2, axis=1)
+        energy_db = 10 * np.log10(energy + 1e-12)
+
+        # 감쇠 최대 에너지 peak[i] = max(peak[i-1] * d, e[i])를 로그 영역의 누적 최댓값으로 계산
+        # (log peak[i] = i·log d + max(log peak[-1] + log d, max_{j<=i}(log e[j] - j·log d)))
+        log_decay = np.log(self.PEAK_DECAY)
+        steps = np.arange(frame_count)
+        with np.errstate(divide="ignore"):
+            log_energy = np.log(energy)
+            log_initial = np.log(self._peak_energy) + log_decay
+        log_peaks = np.maximum.accumulate(log_energy - steps * log_decay)
+        log_peaks = np.maximum(log_peaks, log_initial) + steps * log_decay
+        peaks = np.exp(log_peaks)
+        self._peak_energy = float(peaks[-1])
+        voiced = (energy > peaks * 10 ** (-self.top_db / 10)) & (energy_db > self.ABSOLUTE_FLOOR_DB)
+
+        # 이전 청크의 마지막 프레임을 이어붙여 이동 평균 포락선 계산
+        history = np.concatenate((self._smooth_history, energy_db))
+        kernel = np.ones(NUCLEUS_SMOOTH_FRAMES) / NUCLEUS_SMOOTH_FRAMES
+        envelope = np.convolve(history, kernel, mode="valid")
+        self._smooth_history = history[-(NUCLEUS_SMOOTH_FRAMES - 1):]
+
+        nuclei = self._track_peaks(envelope, voiced)
+
+        # 1초 버킷 단위로 음성 프레임 수와 음절 수 집계 (반복 횟수는 청크에 걸친 버킷 수)
+        completed = 0
+        position = 0
+        while position < frame_count:
+            take = min(self.frames_per_second - self._bucket_frames, frame_count - position)
+            self._bucket_voiced += int(voiced[position:position + take].sum())
+            self._bucket_syllables += int(np.count_nonzero((nuclei >= position) & (nuclei < position + take)))
+            self._bucket_frames += take
+            position += take
+            if self._bucket_frames == self.frames_per_second:
+                self._close_bucket()
+                completed += 1
+
+        self.frame_index += frame_count
+        self.total_voiced_frames += int(voiced.sum())
+        return completed
+
+    def _track_peaks(self, envelope: np.ndarray, voiced: np.ndarray) -> np.ndarray:
+        """
+        골짜기 → 피크 후보 → 하강 확인 순서의 온라인 돌출 피크 검출
+        후보가 NUCLEUS_MIN_PROMINENCE_DB 이상 하강한 프레임(확정 시점)만 찾아가며 처리하므로
+        반복 횟수는 프레임 수가 아니라 확정 시점 수(초당 수 회)에 비례합니다.
+
+        Returns:
+            음절 핵이 확정된 프레임의 청크 내 인덱스 배열
+        """
+        nuclei = []
+        start = 0
+        frame_count = len(envelope)
+        while start < frame_count:
+            values = envelope[start:]
+            # 각 프레임을 처리하기 직전의 후보 값 (이전 후보와 그 뒤 프레임들의 누적 최댓값)
+            running_max = np.maximum.accumulate(np.concatenate(([self._candidate_db], values)))
+            drops = np.flatnonzero(running_max[:-1] - values >= NUCLEUS_MIN_PROMINENCE_DB)
+            end = int(drops[0]) if len(drops) else len(values)
+
+            # 확정 시점 직전까지 후보/골짜기 갱신 (후보는 처음으로 최댓값에 도달한 프레임)
+            if end > 0:
+                best = int(np.argmax(values[:end]))
+                if values[best] > self._candidate_db:
+                    self._candidate_db = float(values[best])
+                    self._candidate_frame = self.frame_index + start + best
+                    self._candidate_voiced = bool(voiced[start + best])
+                self._valley_db = min(self._valley_db, float(values[:end].min()))
+            if not len(drops):
+                break
+
+            # 후보가 양쪽 골짜기보다 충분히 높으면 음절 핵으로 확정
+            frame = start + end
+            if (self._candidate_db - self._valley_db >= NUCLEUS_MIN_PROMINENCE_DB
+                    and self._candidate_voiced
+                    and self._candidate_frame - self._last_nucleus_frame >= self.min_peak_gap):
+                self._last_nucleus_frame = self._candidate_frame
+                self.total_syllables += 1
+                nuclei.append(frame)
+            value = float(envelope[frame])
+            self._valley_db = value
+            self._candidate_db = value
+            self._candidate_frame = self.frame_index + frame
+            self._candidate_voiced = bool(voiced[frame])
+            start = frame + 1
+        return np.asarray(nuclei, dtype=np.int64)
+
+    def _close_bucket(self):
+        self._buckets.append((self._bucket_voiced, self._bucket_syllables))
+        if len(self._buckets) > self.window_buckets:
+            self._buckets.pop(0)
+
+        self._segment_syllables += self._bucket_syllables
+        self._segment_bucket_count += 1
+        if self._segment_bucket_count == self.segment_buckets:
+            segment_index = len(self.completed_segments)
+            self.completed_segments.append({
+                "segment_num": segment_index + 1,
+                "start_minutes": segment_index * self.segment_buckets / 60,
+                "spm": int(self._segment_syllables / self.segment_buckets * 60)
+            })
+            self._segment_syllables = 0
+            self._segment_bucket_count = 0
+        self._bucket_voiced = 0
+        self._bucket_syllables = 0
+        self._bucket_frames = 0
+
+    def snapshot(self) -> Dict:
+        """최근 창의 SPM, 음성 비율과 누적 통계"""
+        window_seconds = len(self._buckets)
+        if window_seconds == 0:
+            return {"elapsed": round(self.elapsed_seconds, 2), "spm": 0, "voiced_ratio": 0.0,
+                    "window_seconds": 0, "total_syllables": self.total_syllables, "overall_spm": 0}
+
+        voiced_frames = sum(bucket[0] for bucket in self._buckets)
+        syllables = sum(bucket[1] for bucket in self._buckets)
+        elapsed = self.elapsed_seconds
+        return {
+            "elapsed": round(elapsed, 2),
+            "spm": int(syllables / window_seconds * 60),
+            "voiced_ratio": round(voiced_frames / (window_seconds * self.frames_per_second), 3),
+            "window_seconds": window_seconds,
+            "total_syllables": self.total_syllables,
+            "overall_spm": int(self.total_syllables / elapsed * 60) if elapsed > 0 else 0
+        }
@@ -15,9 +15,13 @@ load_dotenv()
 class StutteringTTSService:
     """말더듬증 훈련용 TTS(Text-to-Speech)서비스 (항상 중간 속도)"""
 
-    def __init__(self):
+    def __init__(self, polly_client=None):
+        """
+        Args:
+            polly_client: 공유할 boto3 Polly 클라이언트 (생략하면 새로 생성, 보통 services.registry에서 주입)
+        """
         # Amazon Polly 클라이언트 생성
-        self.polly_client = boto3.client(
+        self.polly_client = polly_client or boto3.client(
             'polly',
             region_name=os.getenv("AWS_REGION", "ap-northeast-2"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Whisper 변환 결과 캐시
+같은 녹음을 다시 올리는 경우(시간 초과 후 재시도, 기록에서 재분석 등) Whisper를 다시 호출하지 않도록
+디코딩된 PCM(없으면 파일 바이트)의 해시를 키로 변환 텍스트를 보관합니다.
+
+메모리 캐시(TTLCache)는 프로세스마다 있으며, STT_CACHE_PERSIST=true이면 transcript_cache 테이블에도 저장하여
+서버 재시작이나 다른 워커 프로세스에서도 재사용합니다.
+"""
+
+import os
+import logging
+import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from services.ttl_cache import TTLCache, array_digest
+
+logger = logging.getLogger(__name__)
+
+STT_CACHE_SIZE = int(os.getenv("STT_CACHE_SIZE", "1024"))
+STT_CACHE_TTL_SECONDS = float(os.getenv("STT_CACHE_TTL_SECONDS", "86400"))
+STT_CACHE_PERSIST = os.getenv("STT_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+# 키 → 변환 텍스트 (성공한 결과만 저장)
+transcript_cache = TTLCache(maxsize=STT_CACHE_SIZE, ttl_seconds=STT_CACHE_TTL_SECONDS)
+
+# DB 캐시 조회/저장 횟수
+db_cache_counts = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def transcript_key(audio_data: bytes, pcm: Optional[np.ndarray] = None, model: str = "whisper-1") -> str:
+    """
+    캐시 키 (BLAKE2b)
+    pcm이 있으면 디코딩된 샘플로 해시하여 같은 녹음을 다른 형식으로 올려도 같은 키가 됩니다.
+    """
+    if pcm is not None:
+        return array_digest("pcm", model, np.asarray(pcm, dtype=np.float32))
+    return array_digest("bytes", model, audio_data)
+
+
+def load_persisted_transcript(key: str) -> Optional[str]:
+    """DB 캐시 조회 (TTL이 지난 항목은 무시, 찾으면 메모리 캐시에도 저장)"""
+    from database import SessionLocal
+    import models
+
+    db = SessionLocal()
+    try:
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=STT_CACHE_TTL_SECONDS)
+        record = db.query(models.TranscriptCache).filter(
+            models.TranscriptCache.audio_hash == key,
+            models.TranscriptCache.created_at >= cutoff
+        ).first()
+    except Exception as e:
+        db_cache_counts["errors"] += 1
+        logger.warning(f"변환 결과 캐시 조회 실패: {e}")
+        return None
+    finally:
+        db.close()
+
+    if record is None:
+        db_cache_counts["misses"] += 1
+        return None
+    db_cache_counts["hits"] += 1
+    transcript_cache.set(key, record.text)
+    return record.text
+
+
+def persist_transcript(key: str, text: str, model: str = "whisper-1") -> None:
+    """DB 캐시 저장 (같은 키가 있으면 텍스트와 저장 시각 갱신)"""
+    from database import SessionLocal
+    import models
+
+    db = SessionLocal()
+    try:
+        db.merge(models.TranscriptCache(
+            audio_hash=key, model=model, text=text, created_at=datetime.datetime.utcnow()
+        ))
+        db.commit()
+        db_cache_counts["writes"] += 1
+    except Exception as e:
+        db.rollback()
+        db_cache_counts["errors"] += 1
+        logger.warning(f"변환 결과 캐시 저장 실패: {e}")
+    finally:
+        db.close()
+
+
+def get_cached_transcript(key: str) -> Optional[str]:
+    """메모리 → DB(STT_CACHE_PERSIST) 순서로 조회 (동기, 이벤트 루프 밖에서 사용)"""
+    text = transcript_cache.get(key)
+    if text is None and STT_CACHE_PERSIST:
+        text = load_persisted_transcript(key)
+    return text
+
+
+def cache_transcript(key: str, text: str, model: str = "whisper-1") -> None:
+    """메모리와 DB(STT_CACHE_PERSIST)에 저장 (동기, 이벤트 루프 밖에서 사용)"""
+    transcript_cache.set(key, text)
+    if STT_CACHE_PERSIST:
+        persist_transcript(key, text, model)
+
+
+def stats() -> Dict:
+    """메모리 캐시(현재 프로세스)와 DB 캐시 적중률"""
+    db_lookups = db_cache_counts["hits"] + db_cache_counts["misses"]
+    return {
+        "memory": transcript_cache.stats(),
+        "persist": STT_CACHE_PERSIST,
+        "database": {
+            **db_cache_counts,
+            "hit_ratio": round(db_cache_counts["hits"] / db_lookups, 3) if db_lookups else 0.0
+        }
+    }
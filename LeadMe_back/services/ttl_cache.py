@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+크기 제한(LRU)과 만료 시간(TTL)이 있는 메모리 캐시
+스레드 안전하며 적중/미스/만료/축출 횟수를 stats()로 제공합니다.
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def array_digest(*parts) -> str:
+    """
+    NumPy 배열과 스칼라/문자열을 이어 붙인 BLAKE2b 해시 (캐시 키용)
+    배열은 dtype과 shape까지 포함하여 값이 같아도 형태가 다르면 다른 키가 됩니다.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            array = np.ascontiguousarray(part)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+        elif isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """
+    LRU + TTL 캐시
+
+    maxsize를 넘으면 가장 오래 사용하지 않은 항목을 축출하고,
+    ttl_seconds가 지난 항목은 조회 시점에 만료 처리합니다.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            maxsize: 최대 항목 수 (0이면 캐시 비활성화)
+            ttl_seconds: 항목 유효 시간(초)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (크기 초과 시 LRU 축출)"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict:
+        """적중률 메트릭"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -4,41 +4,58 @@
 """
 
 import os
+import copy
 import logging
 import numpy as np
-from scipy.optimize import curve_fit
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
-import librosa
-import pandas as pd
-import base64
 import warnings
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import io
-import soundfile as sf
 
 # 기존 LeadMe 모듈 임포트
 from services.openai_stt import OpenAISTTService
+from services.audio_decoder import decode_audio_bytes, encode_wav_bytes, AudioDecodeError
+from services.speech_features import VoicedEnergyIndex, detect_syllable_nuclei, count_syllables
+from services.fatigue_model import (
+    hyperbolic_decline, fit_decline_models, named_parameters, bootstrap_confidence_intervals,
+    MIN_FIT_POINTS, DEFAULT_SELECTION_CRITERION
+)
+from services.ttl_cache import TTLCache, array_digest
+from services.fatigue_chart import build_chart_data, render_chart, DEFAULT_CHART_FORMAT, DEFAULT_CHART_DPI
+from services.lazy_imports import lazy_import
+
+# librosa는 첫 사용 시 로드 (pandas는 사용하지 않으므로 임포트 제거)
+librosa = lazy_import("librosa")
 
 warnings.filterwarnings('ignore')
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# 한글 폰트 경로 등록
-font_path = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
-font_prop = fm.FontProperties(fname=font_path)
-plt.rcParams['font.family'] = font_prop.get_name()
-plt.rcParams['axes.unicode_minus'] = False
+# 피로도 분석 최소 음성 길이 (초)
+FATIGUE_MIN_DURATION_SECONDS = 60
+
+# 기본 분할 구간 수
+DEFAULT_SEGMENT_COUNT = 12
+
+# 모델 피팅 결과 캐시 (같은 녹음의 재분석, 재업로드, 리포트 재생성 시 재피팅 생략)
+FIT_CACHE_SIZE = int(os.getenv("FATIGUE_FIT_CACHE_SIZE", "256"))
+FIT_CACHE_TTL_SECONDS = float(os.getenv("FATIGUE_FIT_CACHE_TTL_SECONDS", "3600"))
+
+# 프로세스(분석 워커)마다 하나씩 생성되는 피팅 캐시
+fit_cache = TTLCache(maxsize=FIT_CACHE_SIZE, ttl_seconds=FIT_CACHE_TTL_SECONDS)
 
 
 class VocalFatigueAnalysisService:
     """하이퍼볼릭 모델을 사용한 음성 피로 분석 서비스"""
 
-    def __init__(self):
-        """분석 서비스 초기화"""
-        self.stt_service = OpenAISTTService()
+    def __init__(self, stt_service: Optional[OpenAISTTService] = None):
+        """
+        분석 서비스 초기화
+
+        Args:
+            stt_service: 사용할 STT 서비스 (생략하면 새로 생성, 보통 services.registry에서 주입)
+        """
+        self.stt_service = stt_service or OpenAISTTService()
         self.analysis_results = []
 
     def hyperbolic_decline_model(self, t: np.ndarray, spm0: float, di: float, b: float) -> np.ndarray:
@@ -46,44 +63,62 @@ class VocalFatigueAnalysisService:
         하이퍼볼릭 감소 모델
         SPM(t) = SPM₀ / (1 + b·Di·t)^(1/b)
         """
-        denominator = 1 + b * di * t
-        denominator = np.maximum(denominator, 1e-10)
-        return spm0 / (denominator ** (1 / b))
-
-    def calculate_initial_decline_rate(self, spm0: float, spm1: float, dt: float) -> float:
-        """초기 감소율 계산"""
-        if spm0 == 0 or dt == 0:
-            return 0.01
-        return abs(spm0 - spm1) / (spm0 * dt)
+        return hyperbolic_decline(t, spm0, di, b)
 
     def analyze_audio_file_12segments(self, audio_data: bytes, user_id: str = None,
-                                      save_to_db: bool = False) -> Dict:
+                                      save_to_db: bool = False, segment_count: int = DEFAULT_SEGMENT_COUNT,
+                                      use_stt: bool = False, bootstrap_resamples: int = 0) -> Dict:
         """
-        업로드된 음성 데이터를 12구간으로 분할하여 분석
+        업로드된 음성 데이터를 균등 구간(기본 12구간)으로 분할하여 분석
 
         Args:
             audio_data: 음성 파일 바이트 데이터
             user_id: 사용자 ID
             save_to_db: 데이터베이스 저장 여부
+            segment_count: 분할 구간 수
+            use_stt: 구간별 음절 수를 STT로 계산할지 여부 (기본값: 음절 핵 검출기 사용)
+            bootstrap_resamples: 0보다 크면 이 횟수만큼 잔차 부트스트랩으로 파라미터 신뢰구간 계산
+
+        Returns:
+            전체 분석 결과
+        """
+        try:
+            y, sr = decode_audio_bytes(audio_data)
+        except AudioDecodeError as e:
+            logger.error(f"음성 디코딩 실패: {e}")
+            return {"status": "error", "error": "오디오 파일을 읽을 수 없습니다."}
+
+        return self.analyze_samples_12segments(y, sr, user_id=user_id, save_to_db=save_to_db,
+                                               segment_count=segment_count, use_stt=use_stt,
+                                               bootstrap_resamples=bootstrap_resamples)
+
+    def analyze_samples_12segments(self, y: np.ndarray, sr: int, user_id: str = None,
+                                   save_to_db: bool = False, segment_count: int = DEFAULT_SEGMENT_COUNT,
+                                   use_stt: bool = False, bootstrap_resamples: int = 0) -> Dict:
+        """
+        이미 디코딩된 PCM 배열을 균등 구간(기본 12구간)으로 분할하여 분석
+
+        Args:
+            y: 모노 PCM 배열
+            sr: 샘플링 레이트
+            user_id: 사용자 ID
+            save_to_db: 데이터베이스 저장 여부
+            segment_count: 분할 구간 수 (3 이상)
+            use_stt: 구간별 음절 수를 STT로 계산할지 여부 (기본값: 음절 핵 검출기 사용)
+            bootstrap_resamples: 0보다 크면 이 횟수만큼 잔차 부트스트랩으로 파라미터 신뢰구간 계산
 
         Returns:
             전체 분석 결과
         """
-        logger.info("=== 12구간 분할 음성 피로 분석 시작 ===")
+        logger.info(f"=== {segment_count}구간 분할 음성 피로 분석 시작 ===")
 
-        temp_file_path = None
         try:
-            # 1. 바이트 데이터를 임시 파일로 저장
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-
-            # 2. 임시 파일에서 음성 로드
-            y, sr = librosa.load(temp_file_path, sr=None)
+            if segment_count < 3:
+                return {"status": "error", "error": "구간 수는 3 이상이어야 합니다."}
+
             total_duration = librosa.get_duration(y=y, sr=sr)
 
-            if total_duration < 60:
+            if total_duration < FATIGUE_MIN_DURATION_SECONDS:
                 return {
                     "status": "error",
                     "error": "분석을 위해서는 최소 1분 이상의 음성이 필요합니다."
@@ -91,13 +126,18 @@ class VocalFatigueAnalysisService:
 
             logger.info(f"총 길이: {total_duration:.2f}초")
 
-            # 3. 12구간으로 균등 분할
-            segment_duration = total_duration / 12
+            # 1. 전체 녹음의 프레임 에너지를 한 번만 계산하고 구간별 음성 길이는 누적 합으로 조회
+            energy_index = VoicedEnergyIndex(y, sr)
+            start_times, end_times = energy_index.segment_bounds(segment_count)
+            voiced_durations = energy_index.voiced_durations(start_times, end_times)
+            # 음절 핵도 전체 신호에서 한 번만 검출하여 구간별로 개수만 조회
+            nucleus_counts = count_syllables(detect_syllable_nuclei(y, sr, energy_index), start_times, end_times)
+            segment_duration = total_duration / segment_count
             segments = []
 
-            for i in range(12):
-                start_time = i * segment_duration
-                end_time = (i + 1) * segment_duration
+            for i in range(segment_count):
+                start_time = float(start_times[i])
+                end_time = float(end_times[i])
 
                 # 해당 구간의 오디오 추출
                 start_sample = int(start_time * sr)
@@ -106,37 +146,35 @@ class VocalFatigueAnalysisService:
 
                 # 구간별 SPM 계산
                 segment_result = self.analyze_audio_segment(
-                    segment_audio, sr, start_time, end_time, i + 1
+                    segment_audio, sr, start_time, end_time, i + 1, float(voiced_durations[i]),
+                    int(nucleus_counts[i]), use_stt
                 )
                 segments.append(segment_result)
 
-                logger.info(f"구간 {i + 1}/12: {start_time:.1f}-{end_time:.1f}초, SPM: {segment_result['spm']}")
+                logger.info(f"구간 {i + 1}/{segment_count}: {start_time:.1f}-{end_time:.1f}초, SPM: {segment_result['spm']}")
 
-            # 4. 전기/중기/말기 SPM 계산 (4구간씩)
-            early_segments = segments[0:4]  # 1-4구간
-            middle_segments = segments[4:8]  # 5-8구간
-            late_segments = segments[8:12]  # 9-12구간
+            # 2. 전기/중기/말기 SPM 계산 (구간을 3등분)
+            early_segments, middle_segments, late_segments = self._split_phases(segments)
 
             early_spm = self._calculate_average_spm(early_segments)
             middle_spm = self._calculate_average_spm(middle_segments)
             late_spm = self._calculate_average_spm(late_segments)
             overall_spm = self._calculate_average_spm(segments)
 
-            # 5. 하이퍼볼릭 모델 피팅
-            model_result = self.fit_hyperbolic_model(segments)
+            # 3. 하이퍼볼릭 모델 피팅
+            model_result = self.fit_hyperbolic_model(segments, bootstrap_resamples=bootstrap_resamples)
 
-            # 6. 그래프 생성 (Base64)
-            graph_result = self.create_analysis_graph(segments, model_result,
-                                                      early_spm, middle_spm, late_spm, overall_spm)
+            # 4. 그래프 데이터 계열 생성 (이미지 렌더링은 응답 후 별도로 수행)
+            chart_data = build_chart_data(segments, model_result, early_spm, middle_spm, late_spm, overall_spm)
 
-            # 7. 최종 결과 구성
+            # 5. 최종 결과 구성
             final_result = {
                 "status": "success",
-                "analysis_type": "12_segment_vocal_fatigue",
+                "analysis_type": f"{segment_count}_segment_vocal_fatigue",
                 "timestamp": datetime.now().isoformat(),
                 "audio_info": {
                     "total_duration": total_duration,
-                    "segment_count": 12,
+                    "segment_count": segment_count,
                     "segment_duration": segment_duration,
                     "valid_segments": len([s for s in segments if s["is_valid"]])
                 },
@@ -149,15 +187,19 @@ class VocalFatigueAnalysisService:
                                                    1) if early_spm > 0 else 0
                 },
                 "segments": segments,
-                "graph_image": graph_result.get("image_base64"),
-                "graph_available": graph_result.get("status") == "success"
+                "chart_data": chart_data,
+                "graph_available": bool(chart_data["segment_numbers"])
             }
 
             # 모델 결과가 있으면 추가
             if model_result:
                 final_result.update(model_result)
 
-            # 8. 최종 결과 반환
+            # 6. 데이터베이스 저장 (선택사항)
+            if save_to_db and user_id:
+                self.save_analysis_to_database(user_id, final_result)
+
+            # 7. 최종 결과 반환
             logger.info("=== 분석 완료 ===")
             logger.info(f"전기 SPM: {early_spm}, 중기 SPM: {middle_spm}, 말기 SPM: {late_spm}")
             logger.info(f"전체 SPM: {overall_spm}")
@@ -168,44 +210,50 @@ class VocalFatigueAnalysisService:
             logger.error(f"분석 실패: {e}")
             return {"status": "error", "error": str(e)}
 
+    def save_analysis_to_database(self, user_id: str, result: Dict) -> Optional[int]:
+        """분석 결과를 vocal_fatigue_analysis 테이블에 저장 (자체 세션 사용, 실패해도 분석 결과는 유지)"""
+        from database import SessionLocal
+        from services.fatigue_history import save_fatigue_analysis
+
+        db = SessionLocal()
+        try:
+            record = save_fatigue_analysis(db, user_id, result)
+            result["db_analysis_id"] = record.analysis_id
+            return record.analysis_id
+        except Exception as e:
+            db.rollback()
+            logger.error(f"피로도 분석 결과 저장 실패: {e}")
+            return None
         finally:
-            # 임시 파일 정리
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                    logger.info("임시 파일 삭제 완료")
-                except Exception as cleanup_error:
-                    logger.warning(f"임시 파일 정리 중 오류: {cleanup_error}")
+            db.close()
 
     def analyze_audio_segment(self, segment_audio: np.ndarray, sr: int,
-                              start_time: float, end_time: float, segment_num: int) -> Dict:
-        """개별 구간 SPM 분석"""
+                              start_time: float, end_time: float, segment_num: int,
+                              voiced_duration: float, nucleus_count: int, use_stt: bool = False) -> Dict:
+        """
+        개별 구간 SPM 분석
+        음성 길이는 VoicedEnergyIndex, 음절 수는 음절 핵 검출 결과를 사용하며
+        use_stt=True이면 STT 음절 수를 우선 사용합니다. (실패 시 음절 핵 개수)
+        """
         try:
             duration = end_time - start_time
-
-            # 음성 구간 검출
-            frames = librosa.effects.split(segment_audio, top_db=20)
-            voiced_duration = sum(f[1] - f[0] for f in frames) / sr if len(frames) > 0 else 0
             voiced_percentage = (voiced_duration / duration) * 100 if duration > 0 else 0
 
-            # STT를 통한 음절 수 계산
-            temp_audio_path = f"temp_segment_{segment_num}.wav"
-            try:
-                sf.write(temp_audio_path, segment_audio, sr)
-                stt_result = self.stt_service.speech_to_text(temp_audio_path)
+            syllables_count = nucleus_count
+            syllable_source = "nucleus"
 
-                if stt_result["status"] == "success":
-                    text = stt_result["text"]
-                    syllables_count = self.stt_service.count_korean_syllables(text)
-                else:
-                    # STT 실패 시 추정값 사용
-                    syllables_count = int(voiced_duration * 4.5)
+            # STT를 통한 음절 수 계산 (구간 오디오를 메모리에서 wav로 인코딩하여 전송)
+            if use_stt:
+                try:
+                    stt_result = self.stt_service.speech_to_text_bytes(
+                        encode_wav_bytes(segment_audio, sr), f"segment_{segment_num}.wav", pcm=segment_audio
+                    )
 
-                os.remove(temp_audio_path)
-            except Exception as e:
-                # 예외 발생 시 추정값 사용
-                syllables_count = int(voiced_duration * 4.5)
-                logger.warning(f"구간 {segment_num} STT 처리 중 오류: {e}")
+                    if stt_result["status"] == "success":
+                        syllables_count = self.stt_service.count_korean_syllables(stt_result["text"])
+                        syllable_source = "stt"
+                except Exception as e:
+                    logger.warning(f"구간 {segment_num} STT 처리 중 오류: {e}")
 
             # SPM 계산
             spm = int(syllables_count / duration * 60) if duration > 0 else 0
@@ -218,6 +266,7 @@ class VocalFatigueAnalysisService:
                 "voiced_duration": voiced_duration,
                 "voiced_percentage": voiced_percentage,
                 "syllables_count": syllables_count,
+                "syllable_source": syllable_source,
                 "spm": spm,
                 "is_valid": spm > 0 and voiced_percentage > 10
             }
@@ -237,60 +286,90 @@ class VocalFatigueAnalysisService:
                 "error": str(e)
             }
 
+    def _split_phases(self, segments: List) -> Tuple[List, List, List]:
+        """구간 목록을 전기/중기/말기로 3등분 (12구간이면 1-4, 5-8, 9-12)"""
+        early, middle, late = np.array_split(np.arange(len(segments)), 3)
+        return ([segments[i] for i in early], [segments[i] for i in middle], [segments[i] for i in late])
+
     def _calculate_average_spm(self, segments: List[Dict]) -> float:
         """유효한 구간들의 평균 SPM 계산"""
         valid_spms = [s["spm"] for s in segments if s["is_valid"] and s["spm"] > 0]
         return round(sum(valid_spms) / len(valid_spms), 1) if valid_spms else 0
 
-    def fit_hyperbolic_model(self, segments: List[Dict]) -> Optional[Dict]:
-        """하이퍼볼릭 모델 피팅"""
+    def fit_hyperbolic_model(self, segments: List[Dict], bootstrap_resamples: int = 0,
+                             criterion: str = DEFAULT_SELECTION_CRITERION) -> Optional[Dict]:
+        """
+        감소 모델 피팅 (services.fatigue_model.fit_decline_models)
+
+        하이퍼볼릭/지수/조화/선형 모델을 한 번에 피팅하여 정보 기준(criterion)으로 선택한 결과를
+        model_selection에 담고, parameters/model_quality는 기존과 같이 하이퍼볼릭 모델 값을 반환합니다.
+        bootstrap_resamples > 0 이면 잔차 부트스트랩 신뢰구간(parameter_intervals)을 함께 반환합니다.
+
+        결과는 (유효 구간 시작 시각, SPM 값, 옵션)의 해시를 키로 fit_cache에 보관하며,
+        적중 여부는 model_quality.cache_hit으로 표시합니다.
+        """
         try:
             # 유효한 데이터만 추출
             valid_segments = [s for s in segments if s["is_valid"]]
-            if len(valid_segments) < 4:
+            if len(valid_segments) < MIN_FIT_POINTS:
                 return None
 
             # 시간 및 SPM 데이터 준비
             times = np.array([s["start_time"] / 60 for s in valid_segments])  # 분 단위로 변환
-            spms = np.array([s["spm"] for s in valid_segments])
+            spms = np.array([s["spm"] for s in valid_segments], dtype=np.float64)
 
-            # 초기 파라미터 추정
-            spm0_init = spms[0] if len(spms) > 0 else 200
-            di_init = self.calculate_initial_decline_rate(spms[0], spms[1], times[1] - times[0]) if len(
-                spms) > 1 else 0.01
-            b_init = 1.0
+            cache_key = array_digest(times, spms, criterion, bootstrap_resamples)
+            cached = fit_cache.get(cache_key)
+            if cached is not None:
+                model_result = copy.deepcopy(cached)
+                model_result["model_quality"]["cache_hit"] = True
+                return model_result
 
             # 모델 피팅
             try:
-                popt, pcov = curve_fit(
-                    self.hyperbolic_decline_model,
-                    times, spms,
-                    p0=[spm0_init, di_init, b_init],
-                    bounds=([50, 0.001, 0.1], [500, 1.0, 5.0]),
-                    maxfev=2000
-                )
-
-                spm0_fitted, di_fitted, b_fitted = popt
+                selection = fit_decline_models(times, spms, criterion=criterion)
+                fit = selection["models"]["hyperbolic"]
+                spm0_fitted, di_fitted, b_fitted = fit["params"]
 
-                # R² 계산
-                y_pred = self.hyperbolic_decline_model(times, *popt)
-                ss_res = np.sum((spms - y_pred) ** 2)
-                ss_tot = np.sum((spms - np.mean(spms)) ** 2)
-                r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
-
-                return {
+                model_result = {
                     "model_fitted": True,
                     "parameters": {
-                        "spm0": round(spm0_fitted, 2),
-                        "decline_index": round(di_fitted, 4),
-                        "shape_parameter": round(b_fitted, 2)
+                        "spm0": round(float(spm0_fitted), 2),
+                        "decline_index": round(float(di_fitted), 4),
+                        "shape_parameter": round(float(b_fitted), 2)
                     },
                     "model_quality": {
-                        "r_squared": round(r_squared, 3),
-                        "fitting_status": "success"
+                        "r_squared": round(fit["r_squared"], 3),
+                        "fitting_status": "success" if fit["converged"] else "max_iterations",
+                        "iterations": fit["iterations"],
+                        "fit_time_ms": round(selection["wall_time_ms"], 3)
+                    },
+                    "model_selection": {
+                        "criterion": selection["criterion"],
+                        "selected_model": selection["selected"],
+                        "candidates": {
+                            name: {
+                                "parameters": {key: round(value, 4)
+                                               for key, value in named_parameters(name, result["params"]).items()},
+                                "r_squared": round(result["r_squared"], 3),
+                                "rmse": round(result["rmse"], 2),
+                                "aic": round(result["aic"], 2),
+                                "bic": round(result["bic"], 2)
+                            }
+                            for name, result in selection["models"].items()
+                        }
                     }
                 }
 
+                if bootstrap_resamples > 0:
+                    model_result["parameter_intervals"] = bootstrap_confidence_intervals(
+                        times, spms, fit["params"], resamples=bootstrap_resamples
+                    )
+
+                fit_cache.set(cache_key, copy.deepcopy(model_result))
+                model_result["model_quality"]["cache_hit"] = False
+                return model_result
+
             except Exception as e:
                 logger.warning(f"모델 피팅 실패: {e}")
                 return {
@@ -304,134 +383,15 @@ class VocalFatigueAnalysisService:
             return None
 
     def create_analysis_graph(self, segments: List[Dict], model_result: Optional[Dict],
-                              early_spm: float, middle_spm: float, late_spm: float, overall_spm: float) -> Dict:
-        """개선된 음성 피로도 분석 그래프 생성 (Base64 인코딩)"""
+                              early_spm: float, middle_spm: float, late_spm: float, overall_spm: float,
+                              fmt: str = DEFAULT_CHART_FORMAT, dpi: int = DEFAULT_CHART_DPI) -> Dict:
+        """음성 피로도 분석 그래프 이미지 생성 (이미지 바이트 반환, services.fatigue_chart)"""
         try:
-            # 그래프 생성 (큰 단일 그래프)
-            plt.figure(figsize=(14, 8))
-
-            # 유효한 구간 데이터 추출 (키 이름 호환성 확보)
-            valid_segments = []
-            for s in segments:
-                if s.get("is_valid", False):
-                    # segment_number 또는 segment_num 키 확인
-                    segment_num = s.get("segment_number") or s.get("segment_num")
-                    if segment_num is not None:
-                        valid_segments.append({
-                            "segment_number": segment_num,
-                            "spm": s.get("spm", 0),
-                            "is_valid": s.get("is_valid", False)
-                        })
-
-            if not valid_segments:
-                logger.warning("유효한 구간이 없습니다.")
-                return {"status": "error", "error": "유효한 구간이 없습니다."}
-
-            # 구간 번호와 SPM 값 추출
-            segment_nums = [s["segment_number"] for s in valid_segments]
-            all_spms = [s["spm"] for s in valid_segments]
-
-            # 메인 그래프 생성
-            ax = plt.gca()
-
-            # 전기/중기/말기 구간 배경색으로 표시
-            ax.axvspan(0.5, 4.5, alpha=0.15, color='lightblue', label='전기 구간 (1-4)')
-            ax.axvspan(4.5, 8.5, alpha=0.15, color='lightgreen', label='중기 구간 (5-8)')
-            ax.axvspan(8.5, 12.5, alpha=0.15, color='lightcoral', label='말기 구간 (9-12)')
-
-            # SPM 데이터 플롯
-            ax.plot(segment_nums, all_spms, 'bo-', markersize=8, linewidth=3,
-                    label='관측된 SPM', markerfacecolor='lightblue', markeredgecolor='blue')
-
-            # 하이퍼볼릭 모델 라인 추가 (있는 경우)
-            if model_result and model_result.get("model_fitted"):
-                try:
-                    # 모델 예측값 계산
-                    times = np.array(segment_nums)
-                    params = model_result["parameters"]
-                    spm0 = params["spm0"]
-                    di = params["decline_index"]
-                    b = params["shape_parameter"]
-
-                    # 더 부드러운 곡선을 위해 세밀한 시간 포인트 생성
-                    smooth_times = np.linspace(min(segment_nums), max(segment_nums), 100)
-                    model_spms = self.hyperbolic_decline_model(smooth_times, spm0, di, b)
-
-                    ax.plot(smooth_times, model_spms, 'r--', linewidth=2, alpha=0.7,
-                            label='하이퍼볼릭 모델')
-                except Exception as e:
-                    logger.warning(f"모델 곡선 그리기 실패: {e}")
-
-            # 그래프 제목 및 라벨 (한글)
-            plt.title('12구간별 SPM 변화 분석', fontsize=18, fontweight='bold', pad=20, fontproperties=font_prop)
-            plt.xlabel('구간 번호', fontsize=14, fontproperties=font_prop)
-            plt.ylabel('SPM (음절/분)', fontsize=14, fontproperties=font_prop)
-
-
-            # 축 설정
-            plt.xlim(0.5, 12.5)
-            plt.xticks(range(1, 13))
-
-            # Y축 범위를 데이터에 맞게 조정
-            if all_spms:
-                y_min = max(0, min(all_spms) - 10)
-                y_max = max(all_spms) + 10
-                plt.ylim(y_min, y_max)
-
-            # 격자 추가
-            plt.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-
-            # 범례 추가
-            plt.legend(loc='upper right', fontsize=10)
-
-            # 분석 결과 텍스트 박스 추가 (한글)
-            decline_rate = ((early_spm - late_spm) / early_spm * 100) if early_spm > 0 else 0
-            fatigue_status = "피로 감지됨" if decline_rate > 5 else "안정적 발화"
-
-            textstr = f'''분석 결과
-    - 전기 평균: {early_spm:.1f} SPM
-    - 중기 평균: {middle_spm:.1f} SPM  
-    - 말기 평균: {late_spm:.1f} SPM
-    - 전체 평균: {overall_spm:.1f} SPM
-    - 변화율: {decline_rate:.1f}%
-    - 유효 구간: {len(valid_segments)}/12개
-    - 결과: {fatigue_status}'''
-
-            # 텍스트 박스 위치 (좌상단)
-            props = dict(boxstyle='round,pad=0.8', facecolor='wheat', alpha=0.9, edgecolor='gray')
-            plt.text(0.02, 0.98, textstr, transform=ax.transAxes, fontsize=11,
-                     verticalalignment='top', bbox=props, fontproperties=font_prop)
-
-            # 모델 정보 추가 (우하단)
-            if model_result and model_result.get("model_fitted"):
-                model_params = model_result["parameters"]
-                model_quality = model_result["model_quality"]
-
-                model_textstr = f'''모델 정보
-    - 초기 SPM: {model_params["spm0"]:.1f}
-    - 감소 지수: {model_params["decline_index"]:.4f}
-    - 형태 매개변수: {model_params["shape_parameter"]:.2f}
-    - R² 값: {model_quality["r_squared"]:.3f}'''
-
-                model_props = dict(boxstyle='round,pad=0.5', facecolor='lightblue', alpha=0.8)
-                plt.text(0.98, 0.02, model_textstr, transform=ax.transAxes, fontsize=9,
-                         verticalalignment='bottom', horizontalalignment='right', bbox=model_props, fontproperties=font_prop)
-
-            # 레이아웃 조정
-            plt.tight_layout()
-
-            # Base64 인코딩
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight',
-                        facecolor='white', edgecolor='none')
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            plt.close()
-
+            chart_data = build_chart_data(segments, model_result, early_spm, middle_spm, late_spm, overall_spm)
             return {
                 "status": "success",
-                "image_base64": image_base64,
-                "format": "png"
+                "image_bytes": render_chart(chart_data, fmt=fmt, dpi=dpi),
+                "format": fmt
             }
 
         except Exception as e:
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+서버 시작 워밍업
+합성 음성을 디코딩 → 음성 구간/음절 검출 → 감소 모델 피팅 경로로 한 번 흘려보내고,
+렌더링 워커, DB 커넥션 풀, OpenAI/Polly HTTP 연결을 미리 준비합니다.
+OpenAI는 토큰을 쓰지 않는 모델 목록 조회, Polly는 음성 목록 조회만 사용합니다.
+
+/health/ready는 모든 단계가 끝나고 필수 단계(analysis, render, database)가 모두 성공해야 200을 반환합니다.
+외부 API 연결 확인(openai, polly)은 선택 단계로, 실패해도 기록만 남기고 준비 완료로 판단합니다.
+
+환경 변수:
+    WARMUP_ENABLED: 워밍업 실행 여부 (기본값 true, false면 즉시 준비 완료)
+    WARMUP_STEPS: 실행할 단계 (쉼표 구분, 기본값 analysis,render,database,openai,polly)
+    WARMUP_OPTIONAL_STEPS: 실패해도 준비 완료로 판단하는 단계 (쉼표 구분, 기본값 openai,polly)
+    WARMUP_STEP_TIMEOUT_SECONDS: 단계별 최대 대기 시간 (기본값 60)
+    WARMUP_CLIP_SECONDS: 합성 음성 길이 (기본값 3)
+    WARMUP_DB_CONNECTIONS: 미리 열어 둘 DB 연결 수 (기본값 2)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+WARMUP_STEPS = tuple(
+    step.strip() for step in os.getenv("WARMUP_STEPS", "analysis,render,database,openai,polly").split(",") if step.strip()
+)
+WARMUP_OPTIONAL_STEPS = frozenset(
+    step.strip() for step in os.getenv("WARMUP_OPTIONAL_STEPS", "openai,polly").split(",") if step.strip()
+)
+WARMUP_STEP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_STEP_TIMEOUT_SECONDS", "60"))
+WARMUP_CLIP_SECONDS = float(os.getenv("WARMUP_CLIP_SECONDS", "3"))
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", "2"))
+
+
+def synthetic_speech(seconds: float, sr: int, syllable_rate: float = 4.0) -> np.ndarray:
+    """초당 syllable_rate개의 모음형 버스트(180Hz 기본음 + 배음)와 사이 무음으로 된 합성 음성"""
+    t = np.arange(int(seconds * sr)) / sr
+    envelope = np.clip(np.sin(2 * np.pi * syllable_rate * t), 0, None) ** 2
+    carrier = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 360 * t) + 0.25 * np.sin(2 * np.pi * 720 * t)
+    return (0.3 * envelope * carrier).astype(np.float32)
+
+
+class WarmupState:
+    """단계별 워밍업 진행 상태"""
+
+    def __init__(self):
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.steps: Dict[str, Dict] = {}
+        self.failed_steps: List[str] = []  # 실패한 필수 단계
+        self.ready = not WARMUP_ENABLED
+
+    @property
+    def finished(self) -> bool:
+        return not WARMUP_ENABLED or self.finished_at is not None
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": WARMUP_ENABLED,
+            "ready": self.ready,
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "failed_steps": self.failed_steps,
+            "optional_steps": sorted(WARMUP_OPTIONAL_STEPS),
+            "steps": self.steps
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable], timeout_seconds: float) -> None:
+    record = warmup_state.steps[name]
+    record["status"] = "running"
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(step(), timeout_seconds)
+        record["status"] = "ok"
+        if detail is not None:
+            record["detail"] = detail
+    except asyncio.TimeoutError:
+        record["status"] = "failed"
+        record["error"] = f"{timeout_seconds}초 시간 초과"
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = str(e)
+    finally:
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        level = logging.INFO if record["status"] == "ok" else logging.WARNING
+        logger.log(level, f"워밍업 {name}: {record['status']} ({record['elapsed_ms']} ms)"
+                          + (f" - {record['error']}" if "error" in record else ""))
+
+
+async def run_warmup(steps: Dict[str, Callable[[], Awaitable]],
+                     timeout_seconds: float = WARMUP_STEP_TIMEOUT_SECONDS) -> Dict:
+    """
+    워밍업 단계를 동시에 실행하고 모두 끝나면 필수 단계가 모두 성공한 경우에만 준비 완료로 표시
+
+    Args:
+        steps: 단계 이름 → 인자 없는 코루틴 함수 (반환값은 상태의 detail로 기록)
+        timeout_seconds: 단계별 최대 대기 시간
+
+    Returns:
+        warmup_state.stats()
+    """
+    if not WARMUP_ENABLED:
+        warmup_state.ready = True
+        return warmup_state.stats()
+
+    warmup_state.ready = False
+    warmup_state.started_at = datetime.now()
+    warmup_state.finished_at = None
+    warmup_state.failed_steps = []
+    warmup_state.steps = {name: {"status": "pending"} for name in steps}
+    try:
+        await asyncio.gather(*(_run_step(name, step, timeout_seconds) for name, step in steps.items()))
+    finally:
+        # 선택 단계(외부 API 확인)의 실패는 기록만 남기고, 필수 단계가 실패하면 준비되지 않은 상태로 유지
+        warmup_state.failed_steps = [
+            name for name, record in warmup_state.steps.items()
+            if record["status"] != "ok" and name not in WARMUP_OPTIONAL_STEPS
+        ]
+        warmup_state.finished_at = datetime.now()
+        warmup_state.ready = not warmup_state.failed_steps
+    elapsed = (warmup_state.finished_at - warmup_state.started_at).total_seconds()
+    if warmup_state.ready:
+        logger.info(f"워밍업 완료: {elapsed:.1f}초")
+    else:
+        logger.error(f"워밍업 필수 단계 실패: {', '.join(warmup_state.failed_steps)} ({elapsed:.1f}초)")
+    return warmup_state.stats()
+
+
+def default_steps(analysis_executor, render_executor, audio_decoder, engine) -> Dict[str, Callable[[], Awaitable]]:
+    """WARMUP_STEPS에 지정된 기본 워밍업 단계 구성"""
+
+    async def analysis():
+        # 실제 요청과 같은 경로: WAV 바이트 디코딩 → 분석 워커에서 음성 구간/음절 검출과 모델 피팅
+        from services import analysis_tasks
+        from services.audio_decoder import encode_wav_bytes, TARGET_SAMPLE_RATE
+
+        clip = encode_wav_bytes(synthetic_speech(WARMUP_CLIP_SECONDS, TARGET_SAMPLE_RATE), TARGET_SAMPLE_RATE)
+        y, sr, _ = await audio_decoder.decode(clip, min_duration=0)
+        await analysis_executor.warm_up()
+        # 워커 수만큼 동시에 제출하여 가능한 한 모든 워커가 한 번씩 실행하도록 함
+        results = await asyncio.gather(*(
+            analysis_executor.run(analysis_tasks.warm_up_analysis, y, sr) for _ in range(analysis_executor.max_workers)
+        ))
+        return {"workers": len({result["pid"] for result in results}),
+                "max_elapsed_ms": max(result["elapsed_ms"] for result in results)}
+
+    async def render():
+        return {"workers": len(await render_executor.warm_up())}
+
+    async def database():
+        # 연결을 동시에 열었다가 반납하여 커넥션 풀에 남겨 둠
+        from sqlalchemy import text
+
+        def open_connections():
+            connections = [engine.connect() for _ in range(WARMUP_DB_CONNECTIONS)]
+            try:
+                for connection in connections:
+                    connection.execute(text("SELECT 1"))
+            finally:
+                for connection in connections:
+                    connection.close()
+            return {"connections": len(connections)}
+
+        return await asyncio.to_thread(open_connections)
+
+    async def openai_api():
+        # 모델 목록 조회는 토큰을 사용하지 않음 (STT 클라이언트 연결 풀에 연결을 만들고 API 키 확인)
+        from services.registry import get_stt_service
+
+        return {"models": await get_stt_service().async_client.warm_up()}
+
+    async def polly():
+        from services.registry import registry
+
+        client = registry.get("polly_client")
+        voices = await asyncio.to_thread(client.describe_voices, LanguageCode="ko-KR")
+        return {"voices": len(voices.get("Voices", []))}
+
+    available = {
+        "analysis": analysis,
+        "render": render,
+        "database": database,
+        "openai": openai_api,
+        "polly": polly
+    }
+    unknown = [step for step in WARMUP_STEPS if step not in available]
+    if unknown:
+        logger.warning(f"알 수 없는 워밍업 단계 무시: {', '.join(unknown)}")
+    return {step: available[step] for step in WARMUP_STEPS if step in available}